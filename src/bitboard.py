@@ -0,0 +1,473 @@
+"""
+Bitboard board representation and move generation.
+Alternative backend to board.Board + moves.generate_legal_moves: twelve piece
+bitboards stored as Python ints, precomputed knight/king/pawn attack tables
+and hyperbola quintessence slider attacks.
+
+Squares and packed moves use the same encoding as board.py (row * 8 + col,
+a8 = 0), so bit i of a bitboard is square i and Zobrist hashes match Board.
+"""
+
+from board import START_FEN, FLAG_CAPTURE, FLAG_EN_PASSANT, FLAG_CASTLE, FLAG_DOUBLE_PUSH
+from board import PROMO_SHIFT, PIECE_CODES, PIECE_CHARS, EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, BLACK
+from board import ZOBRIST_BY_CODE, ZOBRIST_WHITE, ZOBRIST_BLACK, ZOBRIST_CASTLING, ZOBRIST_EP
+from board import coord_to_sq, sq_to_coord
+
+FULL = (1 << 64) - 1
+SQ_BIT = [1 << sq for sq in range(64)]
+
+ROW_2 = 0xFF << 16  # Rank 6, black double push passes through here
+ROW_5 = 0xFF << 40  # Rank 3, white double push passes through here
+
+
+def _step_attacks(sq: int, deltas) -> int:
+    r, c = sq >> 3, sq & 7
+    attacks = 0
+    for dr, dc in deltas:
+        rr, cc = r + dr, c + dc
+        if 0 <= rr < 8 and 0 <= cc < 8:
+            attacks |= SQ_BIT[rr * 8 + cc]
+    return attacks
+
+
+def _line_mask(sq: int, dr: int, dc: int) -> int:
+    """Squares on the line through sq in direction (dr, dc), excluding sq."""
+    mask = 0
+    for sign in (1, -1):
+        rr, cc = (sq >> 3) + sign * dr, (sq & 7) + sign * dc
+        while 0 <= rr < 8 and 0 <= cc < 8:
+            mask |= SQ_BIT[rr * 8 + cc]
+            rr += sign * dr
+            cc += sign * dc
+    return mask
+
+
+KNIGHT_ATTACKS = [_step_attacks(sq, [(2, 1), (2, -1), (-2, 1), (-2, -1), (1, 2), (1, -2), (-1, 2), (-1, -2)])
+                  for sq in range(64)]
+KING_ATTACKS = [_step_attacks(sq, [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc])
+                for sq in range(64)]
+# PAWN_ATTACKS[side][sq]: squares attacked by a pawn of side (0 white, 1 black) on sq
+PAWN_ATTACKS = [
+    [_step_attacks(sq, [(-1, -1), (-1, 1)]) for sq in range(64)],
+    [_step_attacks(sq, [(1, -1), (1, 1)]) for sq in range(64)],
+]
+
+FILE_MASKS = [_line_mask(sq, 1, 0) for sq in range(64)]
+DIAGONAL_MASKS = [_line_mask(sq, 1, 1) for sq in range(64)]
+ANTI_DIAGONAL_MASKS = [_line_mask(sq, 1, -1) for sq in range(64)]
+
+
+def _rank_attack_table():
+    """RANK_ATTACKS[col][inner occupancy] for a slider on a single rank."""
+    table = []
+    for col in range(8):
+        row = []
+        for inner in range(64):
+            occ = inner << 1
+            attacks = 0
+            for step in (1, -1):
+                c = col + step
+                while 0 <= c < 8:
+                    attacks |= 1 << c
+                    if occ & (1 << c):
+                        break
+                    c += step
+            row.append(attacks)
+        table.append(row)
+    return table
+
+
+RANK_ATTACKS = _rank_attack_table()
+
+
+def _bswap(bb: int) -> int:
+    """Mirror a bitboard vertically (byte swap): square s maps to s ^ 56."""
+    return int.from_bytes(bb.to_bytes(8, 'little'), 'big')
+
+
+def _line_attacks(occ: int, sq: int, mask: int) -> int:
+    """Hyperbola quintessence: slider attacks along one file or diagonal."""
+    forward = occ & mask
+    reverse = _bswap(forward)
+    forward = (forward - SQ_BIT[sq]) & FULL
+    reverse = (reverse - SQ_BIT[sq ^ 56]) & FULL
+    return (forward ^ _bswap(reverse)) & mask
+
+
+def bishop_attacks(sq: int, occ: int) -> int:
+    return _line_attacks(occ, sq, DIAGONAL_MASKS[sq]) | _line_attacks(occ, sq, ANTI_DIAGONAL_MASKS[sq])
+
+
+def rook_attacks(sq: int, occ: int) -> int:
+    shift = sq & 56
+    rank = RANK_ATTACKS[sq & 7][(occ >> (shift + 1)) & 63] << shift
+    return rank | _line_attacks(occ, sq, FILE_MASKS[sq])
+
+
+def _bits(bb: int):
+    """Yield square indices of the set bits."""
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
+class BitBoard:
+    def __init__(self, fen: str = None):
+        """Initialize board from FEN string or default start position."""
+        self.pieces = [0] * ((BLACK | KING) + 1)  # pieces[code] = bitboard
+        self.colors = [0, 0]  # Occupancy of white and black
+        self.mailbox = [EMPTY] * 64  # Piece code per square, for capture lookups
+        self.turn = 'w'
+        self.castling = 'KQkq'
+        self.en_passant = None
+        self.halfmove = 0
+        self.fullmove = 1
+        self.hash = 0
+        self.set_fen(fen if fen and fen != "startpos_fen" else START_FEN)
+
+    def set_fen(self, fen: str):
+        """Parse FEN string into bitboards and compute initial hash."""
+        parts = fen.split()
+        self.pieces = [0] * ((BLACK | KING) + 1)
+        self.colors = [0, 0]
+        self.mailbox = [EMPTY] * 64
+        for r, row in enumerate(parts[0].split('/')):
+            c = 0
+            for ch in row:
+                if ch.isdigit():
+                    c += int(ch)
+                    continue
+                code = PIECE_CODES[ch]
+                sq = r * 8 + c
+                self.pieces[code] |= SQ_BIT[sq]
+                self.colors[code >> 3] |= SQ_BIT[sq]
+                self.mailbox[sq] = code
+                c += 1
+        self.turn = parts[1]
+        self.castling = parts[2]
+        if parts[3] != '-':
+            ep_row, ep_col = coord_to_sq(parts[3])
+            self.en_passant = ep_row * 8 + ep_col
+        else:
+            self.en_passant = None
+        self.halfmove = int(parts[4])
+        self.fullmove = int(parts[5])
+        self.hash = self._compute_hash()
+
+    def _compute_hash(self):
+        """Compute Zobrist hash (identical to Board._compute_hash for the same position)."""
+        h = 0
+        for sq, code in enumerate(self.mailbox):
+            if code != EMPTY:
+                h ^= ZOBRIST_BY_CODE[code][sq]
+        h ^= ZOBRIST_WHITE if self.turn == 'w' else ZOBRIST_BLACK
+        if self.castling != '-':
+            for right in self.castling:
+                h ^= ZOBRIST_CASTLING[right]
+        if self.en_passant is not None:
+            h ^= ZOBRIST_EP[self.en_passant & 7]
+        return h
+
+    def to_fen(self) -> str:
+        """Convert bitboards back to FEN string."""
+        rows = []
+        for r in range(8):
+            comp = ''
+            empty = 0
+            for code in self.mailbox[r * 8:r * 8 + 8]:
+                if code == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    comp += str(empty)
+                    empty = 0
+                comp += PIECE_CHARS[code]
+            if empty:
+                comp += str(empty)
+            rows.append(comp)
+        ep = sq_to_coord(self.en_passant >> 3, self.en_passant & 7) if self.en_passant is not None else '-'
+        return f"{'/'.join(rows)} {self.turn} {self.castling} {ep} {self.halfmove} {self.fullmove}"
+
+    def _toggle(self, code: int, sq: int):
+        """Add or remove a piece on a square (XOR), including the hash."""
+        bit = SQ_BIT[sq]
+        self.pieces[code] ^= bit
+        self.colors[code >> 3] ^= bit
+        self.hash ^= ZOBRIST_BY_CODE[code][sq]
+
+    def make_move(self, move: int):
+        """
+        Apply a packed move in place.
+
+        Returns:
+            Undo record that restores the previous position via unmake_move()
+        """
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        mailbox = self.mailbox
+        code = mailbox[from_sq]
+        if code == EMPTY:
+            raise ValueError("No piece on from-square")
+
+        captured_sq = (from_sq & 56) | (to_sq & 7) if move & FLAG_EN_PASSANT else to_sq
+        captured = mailbox[captured_sq]
+        undo = (move, code, captured, captured_sq, self.castling, self.en_passant, self.halfmove, self.hash)
+
+        if self.en_passant is not None:
+            self.hash ^= ZOBRIST_EP[self.en_passant & 7]
+        if self.castling != '-':
+            for right in self.castling:
+                self.hash ^= ZOBRIST_CASTLING[right]
+
+        if captured != EMPTY:
+            self._toggle(captured, captured_sq)
+            mailbox[captured_sq] = EMPTY
+
+        promo = (move >> PROMO_SHIFT) & 7
+        new_code = (code & BLACK) | (promo + 1) if promo else code  # Promotion index n, b, r, q -> piece type
+        self._toggle(code, from_sq)
+        self._toggle(new_code, to_sq)
+        mailbox[from_sq] = EMPTY
+        mailbox[to_sq] = new_code
+
+        if move & FLAG_CASTLE:
+            rook_from, rook_to = (from_sq + 3, from_sq + 1) if to_sq > from_sq else (from_sq - 4, from_sq - 1)
+            rook = mailbox[rook_from]
+            self._toggle(rook, rook_from)
+            self._toggle(rook, rook_to)
+            mailbox[rook_from] = EMPTY
+            mailbox[rook_to] = rook
+
+        if self.castling != '-':
+            rights = self.castling
+            if code == KING:
+                rights = rights.replace('K', '').replace('Q', '')
+            elif code == BLACK | KING:
+                rights = rights.replace('k', '').replace('q', '')
+            for corner, right in ((63, 'K'), (56, 'Q'), (7, 'k'), (0, 'q')):
+                if corner in (from_sq, to_sq):
+                    rights = rights.replace(right, '')
+            self.castling = rights or '-'
+            if self.castling != '-':
+                for right in self.castling:
+                    self.hash ^= ZOBRIST_CASTLING[right]
+
+        if move & FLAG_DOUBLE_PUSH:
+            self.en_passant = (from_sq + to_sq) >> 1
+            self.hash ^= ZOBRIST_EP[to_sq & 7]
+        else:
+            self.en_passant = None
+
+        if code & 7 == PAWN or captured != EMPTY:
+            self.halfmove = 0
+        else:
+            self.halfmove += 1
+        if self.turn == 'b':
+            self.fullmove += 1
+        self.hash ^= ZOBRIST_WHITE ^ ZOBRIST_BLACK
+        self.turn = 'b' if self.turn == 'w' else 'w'
+        return undo
+
+    def unmake_move(self, undo):
+        """Take back a move played with make_move()."""
+        move, code, captured, captured_sq, castling, en_passant, halfmove, old_hash = undo
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        mailbox = self.mailbox
+
+        self._toggle(mailbox[to_sq], to_sq)
+        self._toggle(code, from_sq)
+        mailbox[to_sq] = EMPTY
+        mailbox[from_sq] = code
+        if captured != EMPTY:
+            self._toggle(captured, captured_sq)
+            mailbox[captured_sq] = captured
+
+        if move & FLAG_CASTLE:
+            rook_from, rook_to = (from_sq + 3, from_sq + 1) if to_sq > from_sq else (from_sq - 4, from_sq - 1)
+            rook = mailbox[rook_to]
+            self._toggle(rook, rook_to)
+            self._toggle(rook, rook_from)
+            mailbox[rook_to] = EMPTY
+            mailbox[rook_from] = rook
+
+        self.turn = 'b' if self.turn == 'w' else 'w'
+        if self.turn == 'b':
+            self.fullmove -= 1
+        self.castling = castling
+        self.en_passant = en_passant
+        self.halfmove = halfmove
+        self.hash = old_hash
+
+    def copy(self):
+        """Create a copy of the board."""
+        new_board = BitBoard.__new__(BitBoard)
+        new_board.pieces = self.pieces[:]
+        new_board.colors = self.colors[:]
+        new_board.mailbox = self.mailbox[:]
+        new_board.turn = self.turn
+        new_board.castling = self.castling
+        new_board.en_passant = self.en_passant
+        new_board.halfmove = self.halfmove
+        new_board.fullmove = self.fullmove
+        new_board.hash = self.hash
+        return new_board
+
+
+def attackers_to(board: BitBoard, sq: int, by_side: int, occ: int = None) -> int:
+    """Bitboard of pieces of by_side (0 white, 1 black) attacking square sq."""
+    if occ is None:
+        occ = board.colors[0] | board.colors[1]
+    pieces = board.pieces
+    color = by_side << 3
+    queens = pieces[color | QUEEN]
+    return ((PAWN_ATTACKS[by_side ^ 1][sq] & pieces[color | PAWN])
+            | (KNIGHT_ATTACKS[sq] & pieces[color | KNIGHT])
+            | (KING_ATTACKS[sq] & pieces[color | KING])
+            | (bishop_attacks(sq, occ) & (pieces[color | BISHOP] | queens))
+            | (rook_attacks(sq, occ) & (pieces[color | ROOK] | queens)))
+
+
+def is_attacked(board: BitBoard, sq: int, by_side: int) -> bool:
+    """Check if square sq is attacked by by_side (0 white, 1 black)."""
+    pieces = board.pieces
+    color = by_side << 3
+    if KNIGHT_ATTACKS[sq] & pieces[color | KNIGHT]:
+        return True
+    if PAWN_ATTACKS[by_side ^ 1][sq] & pieces[color | PAWN]:
+        return True
+    if KING_ATTACKS[sq] & pieces[color | KING]:
+        return True
+    # Slider attack sets are only computed when such pieces exist
+    occ = board.colors[0] | board.colors[1]
+    queens = pieces[color | QUEEN]
+    rooks = pieces[color | ROOK] | queens
+    if rooks and rook_attacks(sq, occ) & rooks:
+        return True
+    bishops = pieces[color | BISHOP] | queens
+    return bool(bishops and bishop_attacks(sq, occ) & bishops)
+
+
+def generate_legal_moves(board: BitBoard):
+    """
+    Generate all legal moves for the side to move.
+    Same contract as moves.generate_legal_moves: list of packed integer moves,
+    empty when the side to move has no king.
+    """
+    side = 0 if board.turn == 'w' else 1
+    color = side << 3
+    pieces = board.pieces
+    king_bb = pieces[color | KING]
+    if not king_bb:
+        return []
+    own = board.colors[side]
+    them = board.colors[side ^ 1]
+    occ = own | them
+    empty = ~occ & FULL
+    targets = ~own & FULL
+    pseudo = []
+    add = pseudo.append
+
+    def add_targets(frm: int, attacks: int):
+        captures = attacks & them
+        while captures:
+            lsb = captures & -captures
+            captures ^= lsb
+            add(frm | ((lsb.bit_length() - 1) << 6) | FLAG_CAPTURE)
+        quiets = attacks & empty
+        while quiets:
+            lsb = quiets & -quiets
+            quiets ^= lsb
+            add(frm | ((lsb.bit_length() - 1) << 6))
+
+    def add_pawn(base: int, to: int):
+        if to < 8 or to > 55:
+            for promo in (4, 3, 2, 1):  # q, r, b, n
+                add(base | (promo << PROMO_SHIFT))
+        else:
+            add(base)
+
+    # Pawn pushes, set-wise
+    pawns = pieces[color | PAWN]
+    if side == 0:
+        single = (pawns >> 8) & empty
+        double = ((single & ROW_5) >> 8) & empty
+        back = 8
+    else:
+        single = (pawns << 8) & empty
+        double = ((single & ROW_2) << 8) & empty
+        back = -8
+    for to in _bits(single):
+        add_pawn((to + back) | (to << 6), to)
+    for to in _bits(double):
+        add((to + 2 * back) | (to << 6) | FLAG_DOUBLE_PUSH)
+
+    # Pawn captures and en passant
+    ep_bit = SQ_BIT[board.en_passant] if board.en_passant is not None else 0
+    for frm in _bits(pawns):
+        attacks = PAWN_ATTACKS[side][frm]
+        for to in _bits(attacks & them):
+            add_pawn(frm | (to << 6) | FLAG_CAPTURE, to)
+        if attacks & ep_bit:
+            add(frm | (board.en_passant << 6) | FLAG_CAPTURE | FLAG_EN_PASSANT)
+
+    for frm in _bits(pieces[color | KNIGHT]):
+        add_targets(frm, KNIGHT_ATTACKS[frm] & targets)
+    for frm in _bits(pieces[color | BISHOP] | pieces[color | QUEEN]):
+        add_targets(frm, bishop_attacks(frm, occ) & targets)
+    for frm in _bits(pieces[color | ROOK] | pieces[color | QUEEN]):
+        add_targets(frm, rook_attacks(frm, occ) & targets)
+
+    king_sq = king_bb.bit_length() - 1
+    add_targets(king_sq, KING_ATTACKS[king_sq] & targets)
+
+    # Castling: path must be empty and king may not start, pass or land in check
+    enemy = side ^ 1
+    rights = board.castling
+    home = 60 if side == 0 else 4
+    kingside, queenside = ('K', 'Q') if side == 0 else ('k', 'q')
+    if king_sq == home and rights != '-':
+        if (kingside in rights and not occ & (SQ_BIT[home + 1] | SQ_BIT[home + 2])
+                and not any(is_attacked(board, s, enemy) for s in (home, home + 1, home + 2))):
+            add(home | ((home + 2) << 6) | FLAG_CASTLE)
+        if (queenside in rights and not occ & (SQ_BIT[home - 1] | SQ_BIT[home - 2] | SQ_BIT[home - 3])
+                and not any(is_attacked(board, s, enemy) for s in (home, home - 1, home - 2))):
+            add(home | ((home - 2) << 6) | FLAG_CASTLE)
+
+    # Filter out moves that leave own king in check. Castling safety was checked above;
+    # everything else is tested on the post-move occupancy without making the move.
+    legal = []
+    for m in pseudo:
+        if m & FLAG_CASTLE or not _exposes_king(board, m, side, king_sq, occ):
+            legal.append(m)
+    return legal
+
+
+def _exposes_king(board: BitBoard, move: int, side: int, king_sq: int, occ: int) -> bool:
+    """Check if move would leave side's king attacked, using occupancy only."""
+    frm = move & 63
+    to = (move >> 6) & 63
+    removed = SQ_BIT[to]
+    if move & FLAG_EN_PASSANT:
+        removed |= SQ_BIT[(frm & 56) | (to & 7)]
+    occ = (occ & ~SQ_BIT[frm] & ~removed) | SQ_BIT[to]
+    if frm == king_sq:
+        king_sq = to
+
+    pieces = board.pieces
+    enemy = side ^ 1
+    color = enemy << 3
+    alive = ~removed
+    if KNIGHT_ATTACKS[king_sq] & pieces[color | KNIGHT] & alive:
+        return True
+    if PAWN_ATTACKS[side][king_sq] & pieces[color | PAWN] & alive:
+        return True
+    if KING_ATTACKS[king_sq] & pieces[color | KING]:
+        return True
+    queens = pieces[color | QUEEN]
+    rooks = (pieces[color | ROOK] | queens) & alive
+    if rooks and rook_attacks(king_sq, occ) & rooks:
+        return True
+    bishops = (pieces[color | BISHOP] | queens) & alive
+    return bool(bishops and bishop_attacks(king_sq, occ) & bishops)
@@ -1,4 +1,5 @@
 import random
+from evaluation import MG_PIECE_SQUARE, EG_PIECE_SQUARE, NON_PAWN_VALUES
 
 FILES = "abcdefgh"
 RANKS = "12345678"
@@ -34,11 +35,95 @@ def sq_to_coord(row: int, col: int):
     """Convert (row, col) indices back to algebraic notation like 'e4'."""
     return f"{FILES[col]}{8 - row}"
 
+
+# Packed integer move encoding. Squares are indexed row * 8 + col (a8 = 0, h1 = 63).
+#   bits 0-5   from square
+#   bits 6-11  to square
+#   bits 12-14 promotion piece (index into PROMO_PIECES, 0 = none)
+#   bits 15-18 flags
+PROMO_SHIFT = 12
+PROMO_PIECES = ' nbrq'
+FLAG_CAPTURE = 1 << 15
+FLAG_EN_PASSANT = 1 << 16
+FLAG_CASTLE = 1 << 17
+FLAG_DOUBLE_PUSH = 1 << 18
+
+
+def encode_move(from_sq: int, to_sq: int, promo: int = 0, flags: int = 0) -> int:
+    """Pack a move into an integer."""
+    return from_sq | (to_sq << 6) | (promo << PROMO_SHIFT) | flags
+
+
+def move_to_uci(move: int) -> str:
+    """Convert a packed move to UCI notation like 'e2e4' or 'e7e8q'."""
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    promo = (move >> PROMO_SHIFT) & 7
+    uci = sq_to_coord(from_sq >> 3, from_sq & 7) + sq_to_coord(to_sq >> 3, to_sq & 7)
+    if promo:
+        uci += PROMO_PIECES[promo]
+    return uci
+
+
+def uci_to_move(board, uci: str) -> int:
+    """
+    Convert a UCI move string to a packed move for the given position.
+    Flags (capture, en passant, castling, double push) are derived from the board.
+    """
+    fr, fc = coord_to_sq(uci[:2])
+    tr, tc = coord_to_sq(uci[2:4])
+    promo = PROMO_PIECES.index(uci[4].lower()) if len(uci) == 5 else 0
+    piece = board.grid[fr][fc].lower()
+    to_sq = tr * 8 + tc
+
+    flags = 0
+    if board.grid[tr][tc] != '.':
+        flags |= FLAG_CAPTURE
+    if piece == 'p':
+        if fc != tc and board.grid[tr][tc] == '.' and board.en_passant == to_sq:
+            flags |= FLAG_CAPTURE | FLAG_EN_PASSANT
+        if abs(tr - fr) == 2:
+            flags |= FLAG_DOUBLE_PUSH
+    if piece == 'k' and abs(tc - fc) == 2:
+        flags |= FLAG_CASTLE
+    return encode_move(fr * 8 + fc, to_sq, promo, flags)
+
+
+# 10x12 mailbox: the 8x8 board padded with two sentinel ranks above and below
+# and one sentinel file on each side, so knight jumps and slider rays run into
+# OFFBOARD instead of needing bounds checks. Pieces are small integers:
+# piece type in the low 3 bits, BLACK bit for black pieces.
+EMPTY = 0
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = 1, 2, 3, 4, 5, 6
+WHITE, BLACK = 0, 8
+OFFBOARD = 16
+
+PIECE_CODES = {
+    'P': PAWN, 'N': KNIGHT, 'B': BISHOP, 'R': ROOK, 'Q': QUEEN, 'K': KING,
+    'p': BLACK | PAWN, 'n': BLACK | KNIGHT, 'b': BLACK | BISHOP,
+    'r': BLACK | ROOK, 'q': BLACK | QUEEN, 'k': BLACK | KING
+}
+
+PIECE_CHARS = {code: ch for ch, code in PIECE_CODES.items()}
+ZOBRIST_BY_CODE = {code: ZOBRIST_TABLE[ch] for ch, code in PIECE_CODES.items()}
+
+SQ64_TO_120 = [21 + (sq >> 3) * 10 + (sq & 7) for sq in range(64)]
+SQ120_TO_64 = [-1] * 120
+for _sq in range(64):
+    SQ120_TO_64[SQ64_TO_120[_sq]] = _sq
+
+
 class Board:
     def __init__(self, fen: str = None):
         """Initialize board from FEN string or default start position."""
         # Initialize all attributes with default values
-        self.grid = []
+        self._grid = None  # Cached 8x8 view of the mailbox, see grid
+        self.squares = []  # 10x12 mailbox of piece codes
+        self.piece_lists = []  # piece_lists[code] = mailbox squares holding that piece
+        self.king_squares = {'w': None, 'b': None}  # King square (row * 8 + col) per color
+        self.mg_score = 0  # Material + middlegame piece-square sum, white's perspective
+        self.eg_score = 0  # Material + endgame piece-square sum, white's perspective
+        self.non_pawn_material = 0  # Knights, bishops, rooks and queens of both sides
         self.turn = 'w'
         self.castling = 'KQkq'
         self.en_passant = None
@@ -59,7 +144,7 @@ class Board:
             fen = START_FEN
         parts = fen.split()
         rows = parts[0].split('/')
-        self.grid = []
+        grid = []
         for r in rows:
             row = []
             for ch in r:
@@ -67,27 +152,67 @@ class Board:
                     row += ['.'] * int(ch)
                 else:
                     row.append(ch)
-            self.grid.append(row)
+            grid.append(row)
         self.turn = parts[1]
         self.castling = parts[2]
-        self.en_passant = parts[3] if parts[3] != '-' else None
+        if parts[3] != '-':
+            ep_row, ep_col = coord_to_sq(parts[3])
+            self.en_passant = ep_row * 8 + ep_col
+        else:
+            self.en_passant = None
         self.halfmove = int(parts[4])
         self.fullmove = int(parts[5])
 
+        self._init_mailbox(grid)
+
         # Compute initial Zobrist hash
         self.hash = self._compute_hash()
 
+    @property
+    def grid(self):
+        """
+        8x8 view of the board: grid[row][col] is a FEN piece letter or '.'.
+        Built from the mailbox on first use after a move; treat it as read-only.
+        """
+        if self._grid is None:
+            squares = self.squares
+            self._grid = [[PIECE_CHARS.get(squares[SQ64_TO_120[r * 8 + c]], '.') for c in range(8)]
+                          for r in range(8)]
+        return self._grid
+
+    def _init_mailbox(self, grid):
+        """Build the 10x12 mailbox, piece lists and evaluation sums from an 8x8 grid."""
+        self._grid = grid
+        self.squares = [OFFBOARD] * 120
+        self.piece_lists = [[] for _ in range((BLACK | KING) + 1)]
+        self.king_squares = {'w': None, 'b': None}
+        self.mg_score = self.eg_score = self.non_pawn_material = 0
+        for sq in range(64):
+            piece = grid[sq >> 3][sq & 7]
+            sq120 = SQ64_TO_120[sq]
+            if piece == '.':
+                self.squares[sq120] = EMPTY
+            else:
+                code = PIECE_CODES[piece]
+                self.squares[sq120] = code
+                self.piece_lists[code].append(sq120)
+                self.mg_score += MG_PIECE_SQUARE[code][sq]
+                self.eg_score += EG_PIECE_SQUARE[code][sq]
+                self.non_pawn_material += NON_PAWN_VALUES[code]
+                if piece == 'K':
+                    self.king_squares['w'] = sq
+                elif piece == 'k':
+                    self.king_squares['b'] = sq
+
     def _compute_hash(self):
         """Compute Zobrist hash for the current board position."""
         h = 0
 
         # Hash pieces
-        for r in range(8):
-            for c in range(8):
-                piece = self.grid[r][c]
-                if piece != '.':
-                    square_index = r * 8 + c
-                    h ^= ZOBRIST_TABLE[piece][square_index]
+        for sq in range(64):
+            code = self.squares[SQ64_TO_120[sq]]
+            if code != EMPTY:
+                h ^= ZOBRIST_BY_CODE[code][sq]
 
         # Hash turn
         if self.turn == 'w':
@@ -102,9 +227,8 @@ class Board:
                     h ^= ZOBRIST_CASTLING[right]
 
         # Hash en passant
-        if self.en_passant:
-            ep_file = ord(self.en_passant[0]) - ord('a')
-            h ^= ZOBRIST_EP[ep_file]
+        if self.en_passant is not None:
+            h ^= ZOBRIST_EP[self.en_passant & 7]
 
         return h
 
@@ -125,32 +249,44 @@ class Board:
             if empty:
                 comp.append(str(empty))
             rows.append(''.join(comp))
-        ep = self.en_passant if self.en_passant else '-'
+        ep = sq_to_coord(self.en_passant >> 3, self.en_passant & 7) if self.en_passant is not None else '-'
         castling = self.castling if self.castling else '-'
         return f"{'/'.join(rows)} {self.turn} {castling} {ep} {self.halfmove} {self.fullmove}"
 
-    def make_move(self, move_uci: str):
+    def make_move(self, move: int):
         """
-        Apply a move in UCI format to the board.
+        Apply a packed move to the board in place.
         Handles castling, en passant, promotion, and updates board state.
         Updates Zobrist hash incrementally for performance.
+        Only the mailbox and piece lists are updated; the grid view is rebuilt on demand.
+
+        Returns:
+            Undo record that restores the previous position via unmake_move()
         """
-        from_sq = move_uci[:2]
-        to_sq = move_uci[2:4]
-        promo = move_uci[4:].lower() if len(move_uci) == 5 else None
-        fr, fc = coord_to_sq(from_sq)
-        tr, tc = coord_to_sq(to_sq)
-        piece = self.grid[fr][fc]
-        if piece == '.':
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        squares = self.squares
+        piece_lists = self.piece_lists
+        from_120 = SQ64_TO_120[from_sq]
+        to_120 = SQ64_TO_120[to_sq]
+        code = squares[from_120]
+        if code == EMPTY:
             raise ValueError("No piece on from-square")
+        self._grid = None
 
-        direction = -1 if piece.isupper() else 1
-        capture = self.grid[tr][tc] != '.'
+        captured_sq = (from_sq & 56) | (to_sq & 7) if move & FLAG_EN_PASSANT else to_sq
+        captured_120 = SQ64_TO_120[captured_sq]
+        captured = squares[captured_120]
+
+        # Everything needed to restore the position in unmake_move()
+        undo = (move, code, captured, captured_120, self.castling, self.en_passant, self.halfmove, self.hash,
+                self.mg_score, self.eg_score, self.non_pawn_material)
+        mg = self.mg_score - MG_PIECE_SQUARE[code][from_sq]
+        eg = self.eg_score - EG_PIECE_SQUARE[code][from_sq]
 
         # Remove old en passant from hash
-        if self.en_passant:
-            ep_file = ord(self.en_passant[0]) - ord('a')
-            self.hash ^= ZOBRIST_EP[ep_file]
+        if self.en_passant is not None:
+            self.hash ^= ZOBRIST_EP[self.en_passant & 7]
 
         # Remove old castling rights from hash
         if self.castling != '-':
@@ -159,114 +295,100 @@ class Board:
                     self.hash ^= ZOBRIST_CASTLING[right]
 
         # Remove piece from source square
-        from_index = fr * 8 + fc
-        self.hash ^= ZOBRIST_TABLE[piece][from_index]
-
-        # En passant capture
-        ep_capture = False
-        if piece.lower() == 'p' and fc != tc and self.grid[tr][tc] == '.' and self.en_passant == to_sq:
-            # Remove captured pawn from hash
-            captured_pawn_row = tr - direction
-            captured_pawn = self.grid[captured_pawn_row][tc]
-            captured_index = captured_pawn_row * 8 + tc
-            self.hash ^= ZOBRIST_TABLE[captured_pawn][captured_index]
-
-            self.grid[captured_pawn_row][tc] = '.'
-            capture = True
-            ep_capture = True
-
-        # Remove captured piece from hash (if not en passant)
-        if capture and not ep_capture and self.grid[tr][tc] != '.':
-            captured_piece = self.grid[tr][tc]
-            to_index = tr * 8 + tc
-            self.hash ^= ZOBRIST_TABLE[captured_piece][to_index]
+        self.hash ^= ZOBRIST_BY_CODE[code][from_sq]
+
+        # Remove captured piece (or en passant pawn) from board and hash
+        if captured != EMPTY:
+            self.hash ^= ZOBRIST_BY_CODE[captured][captured_sq]
+            piece_lists[captured].remove(captured_120)
+            squares[captured_120] = EMPTY
+            mg -= MG_PIECE_SQUARE[captured][captured_sq]
+            eg -= EG_PIECE_SQUARE[captured][captured_sq]
+            self.non_pawn_material -= NON_PAWN_VALUES[captured]
 
         # Move piece
-        self.grid[fr][fc] = '.'
+        squares[from_120] = EMPTY
+        promo = (move >> PROMO_SHIFT) & 7
         if promo:
-            promoted_piece = promo.upper() if piece.isupper() else promo.lower()
-            self.grid[tr][tc] = promoted_piece
+            promo_code = (code & BLACK) | (promo + 1)  # Promotion index n, b, r, q -> piece type
+            squares[to_120] = promo_code
+            piece_lists[code].remove(from_120)
+            piece_lists[promo_code].append(to_120)
+            mg += MG_PIECE_SQUARE[promo_code][to_sq]
+            eg += EG_PIECE_SQUARE[promo_code][to_sq]
+            self.non_pawn_material += NON_PAWN_VALUES[promo_code]
             # Add promoted piece to hash
-            to_index = tr * 8 + tc
-            self.hash ^= ZOBRIST_TABLE[promoted_piece][to_index]
+            self.hash ^= ZOBRIST_BY_CODE[promo_code][to_sq]
         else:
-            self.grid[tr][tc] = piece
+            squares[to_120] = code
+            plist = piece_lists[code]
+            plist[plist.index(from_120)] = to_120
+            mg += MG_PIECE_SQUARE[code][to_sq]
+            eg += EG_PIECE_SQUARE[code][to_sq]
             # Add piece to destination square
-            to_index = tr * 8 + tc
-            self.hash ^= ZOBRIST_TABLE[piece][to_index]
+            self.hash ^= ZOBRIST_BY_CODE[code][to_sq]
+
+        if code == KING:
+            self.king_squares['w'] = to_sq
+        elif code == BLACK | KING:
+            self.king_squares['b'] = to_sq
 
         # Castling: move the rook and update hash
-        if piece.lower() == 'k' and abs(tc - fc) == 2:
-            if tc > fc:  # Kingside
-                rook_from = (fr, 7)
-                rook_to = (fr, 5)
+        if move & FLAG_CASTLE:
+            if to_sq > from_sq:  # Kingside
+                rook_from = from_sq + 3
+                rook_to = from_sq + 1
             else:  # Queenside
-                rook_from = (fr, 0)
-                rook_to = (fr, 3)
-
-            rook_piece = self.grid[rook_from[0]][rook_from[1]]
-
-            # Remove rook from old position in hash
-            rook_from_index = rook_from[0] * 8 + rook_from[1]
-            self.hash ^= ZOBRIST_TABLE[rook_piece][rook_from_index]
-
-            # Move rook
-            self.grid[rook_from[0]][rook_from[1]] = '.'
-            self.grid[rook_to[0]][rook_to[1]] = rook_piece
-
-            # Add rook to new position in hash
-            rook_to_index = rook_to[0] * 8 + rook_to[1]
-            self.hash ^= ZOBRIST_TABLE[rook_piece][rook_to_index]
+                rook_from = from_sq - 4
+                rook_to = from_sq - 1
+
+            rook_code = squares[SQ64_TO_120[rook_from]]
+            self._move_mailbox_piece(SQ64_TO_120[rook_from], SQ64_TO_120[rook_to])
+            self.hash ^= ZOBRIST_BY_CODE[rook_code][rook_from]
+            self.hash ^= ZOBRIST_BY_CODE[rook_code][rook_to]
+            mg += MG_PIECE_SQUARE[rook_code][rook_to] - MG_PIECE_SQUARE[rook_code][rook_from]
+            eg += EG_PIECE_SQUARE[rook_code][rook_to] - EG_PIECE_SQUARE[rook_code][rook_from]
+        self.mg_score = mg
+        self.eg_score = eg
 
         # Update castling rights
-        def remove_castling(right: str):
-            if right in self.castling:
-                self.castling = self.castling.replace(right, '')
-
-        if piece == 'K':
-            remove_castling('K')
-            remove_castling('Q')
-        if piece == 'k':
-            remove_castling('k')
-            remove_castling('q')
-        if fr == 7 and fc == 0:
-            remove_castling('Q')
-        if fr == 7 and fc == 7:
-            remove_castling('K')
-        if fr == 0 and fc == 0:
-            remove_castling('q')
-        if fr == 0 and fc == 7:
-            remove_castling('k')
-        if tr == 7 and tc == 0:
-            remove_castling('Q')
-        if tr == 7 and tc == 7:
-            remove_castling('K')
-        if tr == 0 and tc == 0:
-            remove_castling('q')
-        if tr == 0 and tc == 7:
-            remove_castling('k')
-
-        if not self.castling:
-            self.castling = '-'
-
-        # Add new castling rights to hash
         if self.castling != '-':
+            def remove_castling(right: str):
+                if right in self.castling:
+                    self.castling = self.castling.replace(right, '')
+
+            if code == KING:
+                remove_castling('K')
+                remove_castling('Q')
+            if code == BLACK | KING:
+                remove_castling('k')
+                remove_castling('q')
+            if from_sq == 56 or to_sq == 56:
+                remove_castling('Q')
+            if from_sq == 63 or to_sq == 63:
+                remove_castling('K')
+            if from_sq == 0 or to_sq == 0:
+                remove_castling('q')
+            if from_sq == 7 or to_sq == 7:
+                remove_castling('k')
+
+            if not self.castling:
+                self.castling = '-'
+
+            # Add new castling rights to hash
             for right in self.castling:
                 if right in ZOBRIST_CASTLING:
                     self.hash ^= ZOBRIST_CASTLING[right]
 
         # Set en passant target after double pawn push
-        if piece.lower() == 'p' and abs(tr - fr) == 2:
-            mid_row = (tr + fr) // 2
-            self.en_passant = sq_to_coord(mid_row, fc)
-            # Add new en passant to hash
-            ep_file = ord(self.en_passant[0]) - ord('a')
-            self.hash ^= ZOBRIST_EP[ep_file]
+        if move & FLAG_DOUBLE_PUSH:
+            self.en_passant = (from_sq + to_sq) >> 1
+            self.hash ^= ZOBRIST_EP[from_sq & 7]
         else:
             self.en_passant = None
 
         # Update halfmove clock (50-move rule)
-        if piece.lower() == 'p' or capture:
+        if code & 7 == PAWN or captured != EMPTY:
             self.halfmove = 0
         else:
             self.halfmove += 1
@@ -279,12 +401,105 @@ class Board:
         self.hash ^= ZOBRIST_BLACK
 
         self.turn = 'b' if self.turn == 'w' else 'w'
+        return undo
+
+    def unmake_move(self, undo):
+        """
+        Take back a move played with make_move().
+        Restores the mailbox, castling rights, en passant, clocks and hash exactly.
+        """
+        move, code, captured, captured_120, castling, en_passant, halfmove, old_hash, mg, eg, npm = undo
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        squares = self.squares
+        piece_lists = self.piece_lists
+        from_120 = SQ64_TO_120[from_sq]
+        to_120 = SQ64_TO_120[to_sq]
+        self._grid = None
+
+        moved_code = squares[to_120]
+        if moved_code != code:  # Promotion
+            piece_lists[moved_code].remove(to_120)
+            piece_lists[code].append(from_120)
+        else:
+            plist = piece_lists[code]
+            plist[plist.index(to_120)] = from_120
+        squares[to_120] = EMPTY
+        squares[from_120] = code
+        if code == KING:
+            self.king_squares['w'] = from_sq
+        elif code == BLACK | KING:
+            self.king_squares['b'] = from_sq
+
+        if captured != EMPTY:
+            squares[captured_120] = captured
+            piece_lists[captured].append(captured_120)
+
+        # Castling: put the rook back to its corner
+        if move & FLAG_CASTLE:
+            if to_sq > from_sq:
+                self._move_mailbox_piece(from_120 + 1, from_120 + 3)
+            else:
+                self._move_mailbox_piece(from_120 - 1, from_120 - 4)
+
+        self.turn = 'b' if self.turn == 'w' else 'w'
+        if self.turn == 'b':
+            self.fullmove -= 1
+        self.castling = castling
+        self.en_passant = en_passant
+        self.halfmove = halfmove
+        self.hash = old_hash
+        self.mg_score = mg
+        self.eg_score = eg
+        self.non_pawn_material = npm
+
+    def make_null_move(self):
+        """
+        Pass the turn without moving (for null-move pruning).
+        Clears en passant and flips the side to move, hash included.
+
+        Returns:
+            Undo record for unmake_null_move()
+        """
+        undo = (self.en_passant, self.halfmove, self.hash)
+        if self.en_passant is not None:
+            self.hash ^= ZOBRIST_EP[self.en_passant & 7]
+            self.en_passant = None
+        self.halfmove += 1
+        self.hash ^= ZOBRIST_WHITE
+        self.hash ^= ZOBRIST_BLACK
+        self.turn = 'b' if self.turn == 'w' else 'w'
+        return undo
+
+    def unmake_null_move(self, undo):
+        """Take back a null move played with make_null_move()."""
+        self.en_passant, self.halfmove, self.hash = undo
+        self.turn = 'b' if self.turn == 'w' else 'w'
+
+    def has_non_pawn_material(self, color: str) -> bool:
+        """Check if color ('w' or 'b') has a knight, bishop, rook or queen."""
+        side = WHITE if color == 'w' else BLACK
+        piece_lists = self.piece_lists
+        return any(piece_lists[side | code] for code in (KNIGHT, BISHOP, ROOK, QUEEN))
 
+    def _move_mailbox_piece(self, from_120: int, to_120: int):
+        """Relocate a piece in the mailbox and its piece list (castling rook)."""
+        code = self.squares[from_120]
+        self.squares[from_120] = EMPTY
+        self.squares[to_120] = code
+        plist = self.piece_lists[code]
+        plist[plist.index(from_120)] = to_120
 
     def copy(self):
         """Create a shallow copy of the board for search calculations."""
         new_board = Board.__new__(Board)  # Create without calling __init__
-        new_board.grid = [row[:] for row in self.grid]  # Shallow copy of lists
+        new_board._grid = None
+        new_board.squares = self.squares[:]
+        new_board.piece_lists = [plist[:] for plist in self.piece_lists]
+        new_board.king_squares = self.king_squares.copy()
+        new_board.mg_score = self.mg_score
+        new_board.eg_score = self.eg_score
+        new_board.non_pawn_material = self.non_pawn_material
         new_board.turn = self.turn
         new_board.castling = self.castling
         new_board.en_passant = self.en_passant
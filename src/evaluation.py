@@ -105,51 +105,51 @@ PIECE_SQUARE_TABLES = {
 
 MAX_NON_PAWN_MATERIAL = 6400  # Both sides combined (Q+2R+2B+2N per side)
 
-def _non_pawn_material(board):
-    total = 0
-    for r in range(8):
-        for c in range(8):
-            piece = board.grid[r][c]
-            if piece == '.':
-                continue
-            p = piece.lower()
-            if p in {'n', 'b', 'r', 'q'}:
-                total += PIECE_VALUES[p]
-    return total
+# Material + piece-square values indexed by mailbox piece code and square (row * 8 + col),
+# signed from white's perspective. Board keeps running sums of these in make_move.
+# Only the king uses different middlegame and endgame tables.
+PIECE_TYPES = ' pnbrqk'  # Index matches the piece type in board piece codes
+BLACK_CODE = 8  # board.BLACK
+MG_PIECE_SQUARE = [[0] * 64 for _ in range(15)]
+EG_PIECE_SQUARE = [[0] * 64 for _ in range(15)]
+NON_PAWN_VALUES = [0] * 15
+for _type in range(1, 7):
+    _p = PIECE_TYPES[_type]
+    _mg_table = KING_MIDDLE_TABLE if _p == 'k' else PIECE_SQUARE_TABLES[_p]
+    _eg_table = KING_END_TABLE if _p == 'k' else PIECE_SQUARE_TABLES[_p]
+    for _sq in range(64):
+        _flipped = (7 - (_sq >> 3)) * 8 + (_sq & 7)
+        MG_PIECE_SQUARE[_type][_sq] = PIECE_VALUES[_p] + _mg_table[_sq]
+        EG_PIECE_SQUARE[_type][_sq] = PIECE_VALUES[_p] + _eg_table[_sq]
+        MG_PIECE_SQUARE[BLACK_CODE | _type][_sq] = -(PIECE_VALUES[_p] + _mg_table[_flipped])
+        EG_PIECE_SQUARE[BLACK_CODE | _type][_sq] = -(PIECE_VALUES[_p] + _eg_table[_flipped])
+    if _p in 'nbrq':
+        NON_PAWN_VALUES[_type] = NON_PAWN_VALUES[BLACK_CODE | _type] = PIECE_VALUES[_p]
 
 
 def _game_phase(board) -> float:
     """Return middlegame weight in range [0, 1]."""
-    npm = _non_pawn_material(board)
-    return min(1.0, npm / MAX_NON_PAWN_MATERIAL)
+    return min(1.0, board.non_pawn_material / MAX_NON_PAWN_MATERIAL)
+
+
+def _phase_material(board) -> int:
+    """Middlegame weight in integer units: MAX_NON_PAWN_MATERIAL in the opening, 0 with only kings and pawns."""
+    return min(board.non_pawn_material, MAX_NON_PAWN_MATERIAL)
 
 
 def _king_positions(board):
-    white_king = None
-    black_king = None
-    for r in range(8):
-        for c in range(8):
-            piece = board.grid[r][c]
-            if piece == 'K':
-                white_king = (r, c)
-            elif piece == 'k':
-                black_king = (r, c)
+    white_sq = board.king_squares['w']
+    black_sq = board.king_squares['b']
+    white_king = divmod(white_sq, 8) if white_sq is not None else None
+    black_king = divmod(black_sq, 8) if black_sq is not None else None
     return white_king, black_king
 
 
 def _side_piece_counts(board):
-    white = {'p': 0, 'n': 0, 'b': 0, 'r': 0, 'q': 0, 'k': 0}
-    black = {'p': 0, 'n': 0, 'b': 0, 'r': 0, 'q': 0, 'k': 0}
-    for r in range(8):
-        for c in range(8):
-            piece = board.grid[r][c]
-            if piece == '.':
-                continue
-            p = piece.lower()
-            if piece.isupper():
-                white[p] += 1
-            else:
-                black[p] += 1
+    """Piece counts per side, read from the board's piece lists."""
+    piece_lists = board.piece_lists
+    white = {PIECE_TYPES[t]: len(piece_lists[t]) for t in range(1, 7)}
+    black = {PIECE_TYPES[t]: len(piece_lists[BLACK_CODE | t]) for t in range(1, 7)}
     return white, black
 
 
@@ -160,6 +160,10 @@ def _has_basic_mating_material(counts):
 
 def _mop_up_bonus(board) -> int:
     """Endgame conversion bonus when one side has only a king left."""
+    piece_lists = board.piece_lists
+    if (any(piece_lists[t] for t in range(1, 6))
+            and any(piece_lists[BLACK_CODE | t] for t in range(1, 6))):
+        return 0
     white_counts, black_counts = _side_piece_counts(board)
 
     # Apply only to basic endgames where defender has lone king.
@@ -195,51 +199,13 @@ def evaluate(board):
     Evaluate the current board position.
     Returns score in centipawns from white's perspective.
     Positive = white advantage, negative = black advantage.
+    Material and piece-square sums are kept up to date by Board.make_move,
+    so this only blends the middlegame and endgame scores by game phase.
     """
-    score = 0
-    mg_weight = _game_phase(board) # 1.0 in opening, 0.0 in endgame
-    eg_weight = 1.0 - mg_weight # 0.0 in opening, 1.0 in endgame
-
-    for r in range(8):
-        for c in range(8):
-            piece = board.grid[r][c]
-            if piece == '.':
-                continue
-
-            piece_type = piece.lower()
-            piece_value = PIECE_VALUES.get(piece_type, 0)
-
-            # Get piece-square table bonus
-            if piece_type == 'k':
-                if piece.islower():  # Black piece
-                    index = (7 - r) * 8 + c
-                    mg_bonus = -KING_MIDDLE_TABLE[index]
-                    eg_bonus = -KING_END_TABLE[index]
-                else:  # White piece
-                    index = r * 8 + c
-                    mg_bonus = KING_MIDDLE_TABLE[index]
-                    eg_bonus = KING_END_TABLE[index]
-                bonus = int(round(mg_weight * mg_bonus + eg_weight * eg_bonus)) # Blend middle and endgame tables based on game phase for better endgame evaluation
-            elif piece_type in PIECE_SQUARE_TABLES:
-                table = PIECE_SQUARE_TABLES[piece_type]
-                # For black pieces, flip the table vertically
-                if piece.islower():  # Black piece
-                    index = (7 - r) * 8 + c
-                    bonus = -table[index]
-                else:  # White piece
-                    index = r * 8 + c
-                    bonus = table[index]
-            else:  # pragma : no cover
-                bonus = 0
-
-            # Add material + positional value
-            if piece.isupper():  # White
-                score += piece_value + bonus
-            else:  # Black
-                score -= piece_value + bonus
-
-    score += _mop_up_bonus(board)
-    return score
+    phase = _phase_material(board)
+    score = (board.mg_score * phase + board.eg_score * (MAX_NON_PAWN_MATERIAL - phase)
+             + MAX_NON_PAWN_MATERIAL // 2) // MAX_NON_PAWN_MATERIAL
+    return score + _mop_up_bonus(board)
 
 
 def evaluate_from_perspective(board):
@@ -1,4 +1,16 @@
-from board import coord_to_sq, sq_to_coord
+from board import FLAG_CAPTURE, FLAG_EN_PASSANT, FLAG_CASTLE, FLAG_DOUBLE_PUSH, PROMO_SHIFT
+from board import EMPTY, OFFBOARD, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, BLACK
+from board import SQ64_TO_120, SQ120_TO_64
+
+# Move generator backend: 10x12 mailbox with piece lists (default) or the 8x8 grid
+ENABLE_MAILBOX_MOVEGEN = True
+
+# Mailbox direction offsets
+KNIGHT_OFFSETS = (-21, -19, -12, -8, 8, 12, 19, 21)
+KING_OFFSETS = (-11, -10, -9, -1, 1, 9, 10, 11)
+BISHOP_OFFSETS = (-11, -9, 9, 11)
+ROOK_OFFSETS = (-10, -1, 1, 10)
+QUEEN_OFFSETS = BISHOP_OFFSETS + ROOK_OFFSETS
 
 def is_attacked(r: int, c: int, by_color: str, grid, _board=None) -> bool:
     """Check if square (r, c) is attacked by side 'by_color'."""
@@ -61,14 +73,482 @@ def is_attacked(r: int, c: int, by_color: str, grid, _board=None) -> bool:
     return False
 
 
+def square_attacked(squares, sq: int, by_side: int) -> bool:
+    """Check if mailbox square sq is attacked by side by_side (WHITE or BLACK)."""
+    # Pawn attacks
+    if by_side == WHITE:
+        if squares[sq + 9] == PAWN or squares[sq + 11] == PAWN:
+            return True
+    elif squares[sq - 9] == BLACK | PAWN or squares[sq - 11] == BLACK | PAWN:
+        return True
+
+    # Knight and king attacks
+    knight = by_side | KNIGHT
+    for offset in KNIGHT_OFFSETS:
+        if squares[sq + offset] == knight:
+            return True
+    king = by_side | KING
+    for offset in KING_OFFSETS:
+        if squares[sq + offset] == king:
+            return True
+
+    # Sliding pieces: walk each ray to the first occupied square
+    queen = by_side | QUEEN
+    bishop = by_side | BISHOP
+    for offset in BISHOP_OFFSETS:
+        t = sq + offset
+        p = squares[t]
+        while p == EMPTY:
+            t += offset
+            p = squares[t]
+        if p == bishop or p == queen:
+            return True
+    rook = by_side | ROOK
+    for offset in ROOK_OFFSETS:
+        t = sq + offset
+        p = squares[t]
+        while p == EMPTY:
+            t += offset
+            p = squares[t]
+        if p == rook or p == queen:
+            return True
+    return False
+
+
+def square_attackers(squares, sq: int, by_side: int) -> list:
+    """
+    Mailbox squares of all by_side pieces attacking mailbox square sq.
+    Same scan as square_attacked(), but every attacker is collected
+    (used by static exchange evaluation).
+    """
+    attackers = []
+    add = attackers.append
+    pawn = by_side | PAWN
+    for t in (sq + 9, sq + 11) if by_side == WHITE else (sq - 9, sq - 11):
+        if squares[t] == pawn:
+            add(t)
+    knight = by_side | KNIGHT
+    for offset in KNIGHT_OFFSETS:
+        if squares[sq + offset] == knight:
+            add(sq + offset)
+    king = by_side | KING
+    for offset in KING_OFFSETS:
+        if squares[sq + offset] == king:
+            add(sq + offset)
+
+    queen = by_side | QUEEN
+    for offsets, slider in ((BISHOP_OFFSETS, by_side | BISHOP), (ROOK_OFFSETS, by_side | ROOK)):
+        for offset in offsets:
+            t = sq + offset
+            p = squares[t]
+            while p == EMPTY:
+                t += offset
+                p = squares[t]
+            if p == slider or p == queen:
+                add(t)
+    return attackers
+
+
 def generate_legal_moves(board):
     """
     Generate all legal moves for the current side to move.
     Filters pseudo-legal moves to exclude those leaving king in check.
-    
+    Uses the mailbox generator unless ENABLE_MAILBOX_MOVEGEN is off.
+
+    Returns:
+        List of packed integer moves (see board.encode_move)
+    """
+    if ENABLE_MAILBOX_MOVEGEN:
+        return _generate_mailbox_moves(board)
+    return _generate_grid_moves(board)
+
+
+def generate_captures(board):
+    """
+    Generate legal tactical moves only: captures (including en passant) and promotions.
+    Used by quiescence search, which never needs the quiet moves.
+
+    Returns:
+        List of packed integer moves (see board.encode_move)
+    """
+    if ENABLE_MAILBOX_MOVEGEN:
+        return _generate_mailbox_moves(board, captures_only=True)
+    return [m for m in _generate_grid_moves(board) if m & FLAG_CAPTURE or (m >> PROMO_SHIFT) & 7]
+
+
+def generate_quiets(board):
+    """
+    Generate legal quiet moves only: no captures and no promotions
+    (the complement of generate_captures). Used by the quiet stage of the move picker.
+
+    Returns:
+        List of packed integer moves (see board.encode_move)
+    """
+    if ENABLE_MAILBOX_MOVEGEN:
+        return _generate_mailbox_moves(board, quiets_only=True)
+    return [m for m in _generate_grid_moves(board) if not (m & FLAG_CAPTURE or (m >> PROMO_SHIFT) & 7)]
+
+
+def _checks_and_pins(squares, king_sq: int, side: int):
+    """
+    Find enemy pieces checking side's king and side's pieces pinned to it.
+
     Returns:
-        List of moves in UCI format (e.g., 'e2e4', 'e7e8q')
+        (checkers, block_squares, pins): number of checkers, the mailbox squares
+        that resolve a single check (checker + squares between) and a dict from
+        pinned piece square to the direction of its pin ray.
+    """
+    enemy = BLACK - side
+    checkers = 0
+    block = None
+    pins = {}
+
+    pawn = enemy | PAWN
+    pawn_sources = (king_sq - 9, king_sq - 11) if side == WHITE else (king_sq + 9, king_sq + 11)
+    for sq in pawn_sources:
+        if squares[sq] == pawn:
+            checkers += 1
+            block = {sq}
+    knight = enemy | KNIGHT
+    for offset in KNIGHT_OFFSETS:
+        if squares[king_sq + offset] == knight:
+            checkers += 1
+            block = {king_sq + offset}
+
+    queen = enemy | QUEEN
+    for offsets, slider in ((ROOK_OFFSETS, enemy | ROOK), (BISHOP_OFFSETS, enemy | BISHOP)):
+        for offset in offsets:
+            t = king_sq + offset
+            p = squares[t]
+            while p == EMPTY:
+                t += offset
+                p = squares[t]
+            if p == slider or p == queen:
+                checkers += 1
+                block = set(range(king_sq + offset, t + offset, offset))
+            elif p != OFFBOARD and p & BLACK == side:
+                # Own piece: pinned if the next piece on the ray is a matching enemy slider
+                pinned = t
+                t += offset
+                p = squares[t]
+                while p == EMPTY:
+                    t += offset
+                    p = squares[t]
+                if p == slider or p == queen:
+                    pins[pinned] = offset
+    return checkers, block, pins
+
+
+def _add_pawn_move(add, base: int, promote: bool):
+    """Add a pawn move, or one move per promotion piece when it reaches the last rank."""
+    if promote:
+        for promo in (4, 3, 2, 1):  # q, r, b, n
+            add(base | (promo << PROMO_SHIFT))
+    else:
+        add(base)
+
+
+def _add_king_moves(add, squares, king_sq: int, side: int, quiets: bool = True, captures: bool = True):
+    """
+    Add the legal king steps from mailbox square king_sq (castling excluded).
+    The king is lifted off the board so sliders see through its square.
+    """
+    enemy = BLACK - side
+    to64 = SQ120_TO_64
+    frm = to64[king_sq]
+    squares[king_sq] = EMPTY
+    for offset in KING_OFFSETS:
+        t = king_sq + offset
+        p = squares[t]
+        if p == EMPTY:
+            if quiets and not square_attacked(squares, t, enemy):
+                add(frm | (to64[t] << 6))
+        elif captures and p != OFFBOARD and p & BLACK == enemy and not square_attacked(squares, t, enemy):
+            add(frm | (to64[t] << 6) | FLAG_CAPTURE)
+    squares[king_sq] = side | KING
+
+
+def _generate_mailbox_moves(board, captures_only=False, quiets_only=False):
+    """
+    Generate legal moves from the 10x12 mailbox and piece lists.
+    Checkers and pins are computed once, so only en passant needs a make/unmake test.
+    Like the grid generator, a side without a king has no legal moves.
+    In check, the moves come from _generate_evasions().
+    With captures_only, quiet moves other than promotions are skipped;
+    with quiets_only, only non-capturing, non-promoting moves are generated.
+    """
+    side = WHITE if board.turn == 'w' else BLACK
+    enemy = BLACK - side
+    squares = board.squares
+    piece_lists = board.piece_lists
+    to64 = SQ120_TO_64
+    if board.king_squares[board.turn] is None:
+        return []
+    king_sq = SQ64_TO_120[board.king_squares[board.turn]]
+    checkers, block, pins = _checks_and_pins(squares, king_sq, side)
+    if checkers:
+        evasions = _generate_evasions(board, king_sq, side, checkers, block, pins)
+        if captures_only:
+            return [m for m in evasions if m & FLAG_CAPTURE or (m >> PROMO_SHIFT) & 7]
+        if quiets_only:
+            return [m for m in evasions if not (m & FLAG_CAPTURE or (m >> PROMO_SHIFT) & 7)]
+        return evasions
+    legal = []
+    add = legal.append
+
+    def add_targets(sq: int, offsets, slide: bool):
+        frm = to64[sq]
+        for offset in offsets:
+            t = sq + offset
+            p = squares[t]
+            while p == EMPTY:
+                add(frm | (to64[t] << 6))
+                if not slide:
+                    break
+                t += offset
+                p = squares[t]
+            if p != EMPTY and p != OFFBOARD and p & BLACK == enemy:
+                add(frm | (to64[t] << 6) | FLAG_CAPTURE)
+
+    def add_captures(sq: int, offsets, slide: bool):
+        frm = to64[sq]
+        for offset in offsets:
+            t = sq + offset
+            p = squares[t]
+            if slide:
+                while p == EMPTY:
+                    t += offset
+                    p = squares[t]
+            if p != EMPTY and p != OFFBOARD and p & BLACK == enemy:
+                add(frm | (to64[t] << 6) | FLAG_CAPTURE)
+
+    def add_quiets(sq: int, offsets, slide: bool):
+        frm = to64[sq]
+        for offset in offsets:
+            t = sq + offset
+            while squares[t] == EMPTY:
+                add(frm | (to64[t] << 6))
+                if not slide:
+                    break
+                t += offset
+
+    targets = add_captures if captures_only else add_quiets if quiets_only else add_targets
+
+    # Pawns
+    ep_moves = []
+    push = -10 if side == WHITE else 10
+    ep = SQ64_TO_120[board.en_passant] if board.en_passant is not None else -1
+    for sq in piece_lists[side | PAWN]:
+        frm = to64[sq]
+        pin = pins.get(sq) if pins else None
+        t = sq + push
+        promote = t < 29 or t > 90
+        if squares[t] == EMPTY and (pin is None or pin == push or pin == -push):
+            if promote:
+                if not quiets_only:
+                    _add_pawn_move(add, frm | (to64[t] << 6), True)
+            elif not captures_only:
+                add(frm | (to64[t] << 6))
+                start_rank = 80 < sq < 89 if side == WHITE else 30 < sq < 39
+                if start_rank and squares[t + push] == EMPTY:
+                    add(frm | (to64[t + push] << 6) | FLAG_DOUBLE_PUSH)
+        for step in () if quiets_only else (push - 1, push + 1):
+            if pin is not None and pin != step and pin != -step:
+                continue
+            t = sq + step
+            p = squares[t]
+            if p != EMPTY and p != OFFBOARD and p & BLACK == enemy:
+                _add_pawn_move(add, frm | (to64[t] << 6) | FLAG_CAPTURE, promote)
+            elif t == ep:
+                ep_moves.append(frm | (to64[t] << 6) | FLAG_CAPTURE | FLAG_EN_PASSANT)
+
+    # Pieces; a pinned piece may only slide along its pin ray
+    for sq in piece_lists[side | KNIGHT]:
+        if not pins or sq not in pins:
+            targets(sq, KNIGHT_OFFSETS, False)
+    for piece, offsets in ((BISHOP, BISHOP_OFFSETS), (ROOK, ROOK_OFFSETS), (QUEEN, QUEEN_OFFSETS)):
+        for sq in piece_lists[side | piece]:
+            if pins and sq in pins:
+                pin = pins[sq]
+                targets(sq, [o for o in offsets if o == pin or o == -pin], True)
+            else:
+                targets(sq, offsets, True)
+
+    # En passant can uncover a check along the rank, so test it by playing it
+    for m in ep_moves:
+        undo = board.make_move(m)
+        if not square_attacked(squares, king_sq, enemy):
+            add(m)
+        board.unmake_move(undo)
+
+    _add_king_moves(add, squares, king_sq, side, quiets=not captures_only, captures=not quiets_only)
+
+    # Castling: path must be empty and king may not pass or land in check (never in check here)
+    rights = board.castling
+    if rights == '-' or captures_only:
+        return legal
+    if side == WHITE and king_sq == 95:
+        if ('K' in rights and squares[96] == EMPTY and squares[97] == EMPTY
+                and not square_attacked(squares, 96, enemy) and not square_attacked(squares, 97, enemy)):
+            add(60 | (62 << 6) | FLAG_CASTLE)
+        if ('Q' in rights and squares[94] == EMPTY and squares[93] == EMPTY and squares[92] == EMPTY
+                and not square_attacked(squares, 94, enemy) and not square_attacked(squares, 93, enemy)):
+            add(60 | (58 << 6) | FLAG_CASTLE)
+    elif side == BLACK and king_sq == 25:
+        if ('k' in rights and squares[26] == EMPTY and squares[27] == EMPTY
+                and not square_attacked(squares, 26, enemy) and not square_attacked(squares, 27, enemy)):
+            add(4 | (6 << 6) | FLAG_CASTLE)
+        if ('q' in rights and squares[24] == EMPTY and squares[23] == EMPTY and squares[22] == EMPTY
+                and not square_attacked(squares, 24, enemy) and not square_attacked(squares, 23, enemy)):
+            add(4 | (2 << 6) | FLAG_CASTLE)
+    return legal
+
+
+def _generate_evasions(board, king_sq: int, side: int, checkers: int, block, pins):
+    """
+    Legal moves for a side in check, from the _checks_and_pins() result.
+    With a single checker, the block squares are searched backwards for
+    unpinned pieces that can reach them (a pinned piece can never resolve
+    a check), instead of generating every move and filtering.
+    """
+    enemy = BLACK - side
+    squares = board.squares
+    to64 = SQ120_TO_64
+    legal = []
+    add = legal.append
+
+    if checkers == 1:
+        pawn = side | PAWN
+        knight = side | KNIGHT
+        queen = side | QUEEN
+        push = -10 if side == WHITE else 10
+        for t in block:
+            to = to64[t] << 6
+            flag = FLAG_CAPTURE if squares[t] != EMPTY else 0
+            promote = t < 29 or t > 90
+            # Pawns: capture the checker diagonally or push onto an empty square of the ray
+            if flag:
+                for sq in (t - push - 1, t - push + 1):
+                    if squares[sq] == pawn and sq not in pins:
+                        _add_pawn_move(add, to64[sq] | to | FLAG_CAPTURE, promote)
+            else:
+                sq = t - push
+                if squares[sq] == pawn:
+                    if sq not in pins:
+                        _add_pawn_move(add, to64[sq] | to, promote)
+                elif squares[sq] == EMPTY:
+                    sq -= push
+                    start_rank = 80 < sq < 89 if side == WHITE else 30 < sq < 39
+                    if start_rank and squares[sq] == pawn and sq not in pins:
+                        add(to64[sq] | to | FLAG_DOUBLE_PUSH)
+            for offset in KNIGHT_OFFSETS:
+                sq = t + offset
+                if squares[sq] == knight and sq not in pins:
+                    add(to64[sq] | to | flag)
+            for offsets, slider in ((BISHOP_OFFSETS, side | BISHOP), (ROOK_OFFSETS, side | ROOK)):
+                for offset in offsets:
+                    sq = t + offset
+                    p = squares[sq]
+                    while p == EMPTY:
+                        sq += offset
+                        p = squares[sq]
+                    if (p == slider or p == queen) and sq not in pins:
+                        add(to64[sq] | to | flag)
+
+        # En passant may capture a pawn checker; test it by playing it
+        if board.en_passant is not None:
+            ep = SQ64_TO_120[board.en_passant]
+            for sq in (ep - push - 1, ep - push + 1):
+                if squares[sq] == pawn:
+                    m = to64[sq] | (to64[ep] << 6) | FLAG_CAPTURE | FLAG_EN_PASSANT
+                    undo = board.make_move(m)
+                    if not square_attacked(squares, king_sq, enemy):
+                        add(m)
+                    board.unmake_move(undo)
+
+    _add_king_moves(add, squares, king_sq, side)
+    return legal
+
+
+def is_legal_move(board, move: int) -> bool:
+    """
+    Check that a move from outside the generator (TT move, killer) is legal
+    in this position, without generating the full move list.
     """
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    side = WHITE if board.turn == 'w' else BLACK
+    enemy = BLACK - side
+    squares = board.squares
+    frm = SQ64_TO_120[from_sq]
+    to = SQ64_TO_120[to_sq]
+    piece = squares[frm]
+    if piece == EMPTY or piece & BLACK != side:
+        return False
+    if move & FLAG_CASTLE:
+        return move in generate_legal_moves(board)
+
+    # Capture flag must match the target square
+    target = squares[to]
+    if move & FLAG_EN_PASSANT:
+        if piece & 7 != PAWN or board.en_passant != to_sq:
+            return False
+    elif target == EMPTY:
+        if move & FLAG_CAPTURE:
+            return False
+    elif target & BLACK != enemy or not move & FLAG_CAPTURE:
+        return False
+
+    # Piece geometry
+    kind = piece & 7
+    delta = to - frm
+    promote = to < 29 or to > 90
+    if kind == PAWN:
+        push = -10 if side == WHITE else 10
+        if ((move >> PROMO_SHIFT) & 7 != 0) != promote:
+            return False
+        if move & FLAG_DOUBLE_PUSH:
+            start_rank = 80 < frm < 89 if side == WHITE else 30 < frm < 39
+            if delta != 2 * push or not start_rank or squares[frm + push] != EMPTY or target != EMPTY:
+                return False
+        elif delta == push:
+            if target != EMPTY:
+                return False
+        elif delta not in (push - 1, push + 1) or not move & FLAG_CAPTURE:
+            return False
+    elif move & (FLAG_EN_PASSANT | FLAG_DOUBLE_PUSH) or (move >> PROMO_SHIFT) & 7:
+        return False
+    elif kind == KNIGHT:
+        if delta not in KNIGHT_OFFSETS:
+            return False
+    elif kind == KING:
+        if delta not in KING_OFFSETS:
+            return False
+    else:
+        dr = (to_sq >> 3) - (from_sq >> 3)
+        dc = (to_sq & 7) - (from_sq & 7)
+        diagonal = abs(dr) == abs(dc)
+        if not (diagonal or dr == 0 or dc == 0):
+            return False
+        if (kind == BISHOP and not diagonal) or (kind == ROOK and diagonal):
+            return False
+        step = (dr > 0) * 10 - (dr < 0) * 10 + (dc > 0) - (dc < 0)
+        t = frm + step
+        while t != to:
+            if squares[t] != EMPTY:
+                return False
+            t += step
+
+    # King safety
+    undo = board.make_move(move)
+    king_sq = SQ64_TO_120[board.king_squares['w' if side == WHITE else 'b']]
+    safe = not square_attacked(squares, king_sq, enemy)
+    board.unmake_move(undo)
+    return safe
+
+
+def _generate_grid_moves(board):
+    """Generate legal moves by scanning the 8x8 grid."""
     color = board.turn
     grid = board.grid
     pseudo = []
@@ -86,11 +566,13 @@ def generate_legal_moves(board):
             return False
         return (piece.isupper() and color == 'b') or (piece.islower() and color == 'w')
 
-    def add_pseudo(fr: int, fc: int, tr: int, tc: int, promote: bool = False):
-        base = sq_to_coord(fr, fc) + sq_to_coord(tr, tc)
+    def add_pseudo(fr: int, fc: int, tr: int, tc: int, promote: bool = False, flags: int = 0):
+        base = (fr * 8 + fc) | ((tr * 8 + tc) << 6) | flags
+        if grid[tr][tc] != '.':
+            base |= FLAG_CAPTURE
         if promote:
-            for p in ['q', 'r', 'b', 'n']:
-                pseudo.append(base + p)
+            for p in (4, 3, 2, 1):  # q, r, b, n
+                pseudo.append(base | (p << PROMO_SHIFT))
         else:
             pseudo.append(base)
 
@@ -107,7 +589,7 @@ def generate_legal_moves(board):
             add_pseudo(r, c, one_r, c, promote=one_r == promo_row)
             two_r = r + 2 * direction
             if r == start_row and in_bounds(two_r, c) and grid[two_r][c] == '.':
-                add_pseudo(r, c, two_r, c)
+                add_pseudo(r, c, two_r, c, flags=FLAG_DOUBLE_PUSH)
 
         for dc in (-1, 1):
             cc = c + dc
@@ -116,10 +598,8 @@ def generate_legal_moves(board):
             target = grid[one_r][cc]
             if opponent(target):
                 add_pseudo(r, c, one_r, cc, promote=one_r == promo_row)
-            if board.en_passant:
-                ep_r, ep_c = coord_to_sq(board.en_passant)
-                if ep_r == one_r and ep_c == cc:
-                    add_pseudo(r, c, one_r, cc)
+            if board.en_passant == one_r * 8 + cc:
+                add_pseudo(r, c, one_r, cc, flags=FLAG_CAPTURE | FLAG_EN_PASSANT)
 
     def gen_knight(r: int, c: int, _piece: str):
         deltas = [(2, 1), (2, -1), (-2, 1), (-2, -1), (1, 2), (1, -2), (-1, 2), (-1, -2)]
@@ -158,14 +638,14 @@ def generate_legal_moves(board):
 
         if color == 'w' and r == 7 and c == 4:
             if 'K' in board.castling and grid[7][5] == '.' and grid[7][6] == '.' and squares_safe([(7, 4), (7, 5), (7, 6)]):
-                add_pseudo(r, c, 7, 6)
+                add_pseudo(r, c, 7, 6, flags=FLAG_CASTLE)
             if 'Q' in board.castling and grid[7][3] == '.' and grid[7][2] == '.' and grid[7][1] == '.' and squares_safe([(7, 4), (7, 3), (7, 2)]):
-                add_pseudo(r, c, 7, 2)
+                add_pseudo(r, c, 7, 2, flags=FLAG_CASTLE)
         if color == 'b' and r == 0 and c == 4:
             if 'k' in board.castling and grid[0][5] == '.' and grid[0][6] == '.' and squares_safe([(0, 4), (0, 5), (0, 6)]):
-                add_pseudo(r, c, 0, 6)
+                add_pseudo(r, c, 0, 6, flags=FLAG_CASTLE)
             if 'q' in board.castling and grid[0][3] == '.' and grid[0][2] == '.' and grid[0][1] == '.' and squares_safe([(0, 4), (0, 3), (0, 2)]):
-                add_pseudo(r, c, 0, 2)
+                add_pseudo(r, c, 0, 2, flags=FLAG_CASTLE)
 
     # Generate pseudo-legal moves for all pieces
     for r in range(8):
@@ -196,26 +676,14 @@ def generate_legal_moves(board):
     for m in pseudo:
         mover = color
 
-        # Copy board and make move
-        temp = board.copy()
-        _ = temp.make_move(m)
-
-        # Find king position after move
-        king_pos = None
-        for r in range(8):
-            for c in range(8):
-                p = temp.grid[r][c]
-                if p != '.' and ((mover == 'w' and p == 'K') or (mover == 'b' and p == 'k')):
-                    king_pos = (r, c)
-                    break
-            if king_pos:
-                break
+        # Make move in place, test king safety, then take it back
+        undo = board.make_move(m)
 
         # Check if king is safe
-        is_legal = False
-        if king_pos:
-            if not is_attacked(king_pos[0], king_pos[1], temp.turn, temp.grid):
-                is_legal = True
+        king_sq = board.king_squares[mover]
+        is_legal = king_sq is not None and not is_attacked(king_sq >> 3, king_sq & 7, board.turn, board.grid)
+
+        board.unmake_move(undo)
 
         if is_legal:
             legal.append(m)
@@ -223,26 +691,19 @@ def generate_legal_moves(board):
     return legal
 
 
+def is_in_check(board) -> bool:
+    """Check if the king of the side to move is attacked."""
+    king_sq = board.king_squares[board.turn]
+    if king_sq is None:
+        return False
+    enemy = BLACK if board.turn == 'w' else WHITE
+    return square_attacked(board.squares, SQ64_TO_120[king_sq], enemy)
+
+
 def is_checkmate(board):
     """Check if the current side to move is checkmated."""
     moves = generate_legal_moves(board)
-    if not moves:
-        color = board.turn
-        king_pos = None
-        for r in range(8):
-            for c in range(8):
-                p = board.grid[r][c]
-                if p != '.' and ((color == 'w' and p == 'K') or (color == 'b' and p == 'k')):
-                    king_pos = (r, c)
-                    break
-            if king_pos:
-                break
-        if king_pos:
-            # Check if king is actually under attack (in check)
-            opponent_color = 'b' if color == 'w' else 'w'
-            if is_attacked(king_pos[0], king_pos[1], opponent_color, board.grid):
-                return True
-    return False
+    return not moves and is_in_check(board)
 
 
 def is_stalemate(board):
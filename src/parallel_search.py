@@ -0,0 +1,268 @@
+"""
+Parallel search across worker processes.
+
+Lazy SMP: every worker runs the normal iterative deepening search on the same
+root and they cooperate only through a transposition table in shared memory.
+Helpers with odd ids skip depth 1 so the workers drift apart and fill the
+table with different parts of the tree.
+
+Root split: the first (PV) root move is searched in the main process to set
+alpha, the other root moves get null-window searches in a worker pool and the
+ones that fail high are re-searched in the main process in move order.
+This gives far more reproducible results than Lazy SMP.
+"""
+
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from board import Board
+import search
+from transposition import TranspositionTable
+
+# Number of search processes including the main process (1 = single-threaded search)
+SMP_WORKERS = 1
+
+# Worker processes for root-split search (1 = off); takes precedence over SMP_WORKERS
+ROOT_SPLIT_WORKERS = 1
+
+# Running worker pool and shared table: (pool, table, workers)
+_smp_state = None
+
+# Running root-split worker pool: (pool, workers)
+_split_state = None
+
+
+def find_best_move(board, depth, time_limit, soft_limit=None):
+    """Search with the configured parallel mode, or serially if none is enabled."""
+    if ROOT_SPLIT_WORKERS > 1:
+        return root_split_search(board, depth, time_limit, ROOT_SPLIT_WORKERS, soft_limit)
+    return lazy_smp_search(board, depth, time_limit, SMP_WORKERS, soft_limit)
+
+
+def _init_smp_worker(table_name, size_mb):
+    """Pool initializer: point this process's search at the shared table."""
+    search.transposition_table = TranspositionTable.attach(table_name, size_mb)
+
+
+def _smp_worker(fen, depth, time_limit, worker_id, generation, soft_limit=None):
+    """
+    Search one root in a helper process.
+
+    Returns:
+        (completed_depth, score, move, nodes) tuple
+    """
+    board = Board(fen)
+    search.transposition_table.generation = generation
+    search.search_stats['nodes_searched'] = 0
+    move, score, completed = search.iterative_deepening(board, depth, time_limit, start_depth=1 + (worker_id & 1),
+                                                        soft_limit=soft_limit)
+    return completed, score, move, search.search_stats['nodes_searched']
+
+
+def start_smp(workers=None):
+    """
+    Start helper processes and move the search onto a shared transposition table.
+    Kept running between searches; stopped by shutdown_smp() or at exit.
+    """
+    global _smp_state
+    workers = workers or SMP_WORKERS
+    if _smp_state is not None:
+        if _smp_state[2] == workers:
+            return _smp_state
+        shutdown_smp()
+    table = TranspositionTable.create_shared(search.TT_SIZE_MB)
+    pool = ProcessPoolExecutor(max_workers=workers - 1, initializer=_init_smp_worker,
+                               initargs=(table.shm.name, search.TT_SIZE_MB))
+    search.transposition_table = table
+    _smp_state = (pool, table, workers)
+    return _smp_state
+
+
+def shutdown_smp():
+    """Stop the helper processes and return the search to a private transposition table."""
+    global _smp_state
+    if _smp_state is None:
+        return
+    pool, table, _ = _smp_state
+    _smp_state = None
+    pool.shutdown()
+    search.transposition_table = TranspositionTable(search.TT_SIZE_MB)
+    table.close()
+    table.unlink()
+
+
+def _root_move_worker(fen, depth, alpha, deadline):
+    """
+    Null-window search of one root move in a worker process.
+    fen is the position after the root move. Raises SearchTimeout after deadline.
+
+    Returns:
+        (score, nodes, pid) tuple, score from the root side's perspective
+    """
+    board = Board(fen)
+    search.search_stats['nodes_searched'] = 0
+    search.search_deadline = deadline
+    search.follow_pv = False
+    try:
+        score, _ = search.negamax(board, depth, -alpha - 1, -alpha, ply=1)
+    finally:
+        search.search_deadline = None
+    return -score, search.search_stats['nodes_searched'], os.getpid()
+
+
+def start_root_split(workers):
+    """Start (or reuse) the root-split worker pool."""
+    global _split_state
+    if _split_state is not None:
+        if _split_state[1] == workers:
+            return _split_state[0]
+        shutdown_root_split()
+    _split_state = (ProcessPoolExecutor(max_workers=workers), workers)
+    return _split_state[0]
+
+
+def shutdown_root_split():
+    """Stop the root-split worker pool."""
+    global _split_state
+    if _split_state is not None:
+        _split_state[0].shutdown()
+        _split_state = None
+
+
+atexit.register(shutdown_smp)
+atexit.register(shutdown_root_split)
+
+
+def split_root(board, depth, alpha, beta, ply=0):
+    """
+    Root search with the same signature and result as negamax, with the
+    root moves after the first one searched in parallel.
+    Per-worker node counts are accumulated in search_stats['worker_nodes'].
+    """
+    if depth <= 1:
+        return search.negamax(board, depth, alpha, beta, ply=ply)
+
+    pool = _split_state[0] if _split_state is not None else start_root_split(max(ROOT_SPLIT_WORKERS, 2))
+    stats = search.search_stats
+    stats['nodes_searched'] += 1
+    search.pv_length[ply] = ply
+    alpha_orig = alpha
+    entry = search.transposition_table.probe(board.hash)
+    tt_move = entry[3] if entry is not None else None
+    if search.follow_pv and search.principal_variation:
+        tt_move = search.principal_variation[ply]
+    killers = tuple(search.killer_moves[ply]) if search.ENABLE_KILLER_MOVES else ()
+    history = search.history_table if search.ENABLE_HISTORY_HEURISTIC else None
+    moves = list(search.MovePicker(board, tt_move, killers, history))
+    if not moves:
+        return search.negamax(board, depth, alpha, beta, ply=ply)
+
+    # PV move: searched serially with the full window to establish alpha
+    best_move = moves[0]
+    undo = board.make_move(best_move)
+    score, _ = search.negamax(board, depth - 1, -beta, -alpha, ply=ply + 1)
+    board.unmake_move(undo)
+    best_score = -score
+    alpha = max(alpha, best_score)
+    search.root_best[0], search.root_best[1] = best_move, best_score
+    search.update_pv(ply, best_move)
+    search.follow_pv = False
+
+    if alpha < beta:
+        # Remaining moves: null-window searches against the PV score in the pool
+        jobs = []
+        for move in moves[1:]:
+            undo = board.make_move(move)
+            jobs.append((move, pool.submit(_root_move_worker, board.to_fen(), depth - 1, alpha,
+                                           search.search_deadline)))
+            board.unmake_move(undo)
+
+        worker_nodes = stats.setdefault('worker_nodes', {})
+        split_alpha = alpha
+        pending = [future for _, future in jobs]
+        try:
+            for move, future in jobs:
+                score, nodes, pid = future.result()
+                pending.remove(future)
+                worker_nodes[pid] = worker_nodes.get(pid, 0) + nodes
+                if score <= split_alpha:
+                    continue  # Fails low against the split alpha
+                # Fail high: re-search with the current window
+                undo = board.make_move(move)
+                score, _ = search.negamax(board, depth - 1, -beta, -alpha, ply=ply + 1)
+                board.unmake_move(undo)
+                if -score > best_score:
+                    best_score, best_move = -score, move
+                    alpha = max(alpha, best_score)
+                    search.root_best[0], search.root_best[1] = best_move, best_score
+                    search.update_pv(ply, best_move)
+                if alpha >= beta:
+                    break  # Cutoff: the remaining moves are not needed
+        finally:
+            # Drop queued jobs after a cutoff or a timeout without waiting for running ones;
+            # only jobs that already finished add their node counts
+            for future in pending:
+                if not future.cancel() and future.done() and future.exception() is None:
+                    _, nodes, pid = future.result()
+                    worker_nodes[pid] = worker_nodes.get(pid, 0) + nodes
+        if alpha >= beta:
+            stats['beta_cutoffs'] += 1
+
+    if alpha >= beta:
+        flag = search.LOWER
+    elif best_score > alpha_orig:
+        flag = search.EXACT
+    else:
+        flag = search.UPPER
+    search.transposition_table.store(board.hash, depth, best_score, flag, best_move)
+    stats['tt_stores'] += 1
+    return best_score, best_move
+
+
+def root_split_search(board, depth, time_limit, workers=None, soft_limit=None):
+    """
+    Find the best move with iterative deepening where each depth uses split_root.
+    Node counts of the pool workers are reported per process id in search_stats['worker_nodes'].
+    """
+    workers = workers or ROOT_SPLIT_WORKERS
+    if workers <= 1:
+        return search.find_best_move(board, depth, time_limit, soft_limit)
+    start_root_split(workers)
+    search.search_stats['worker_nodes'] = {}
+    search.transposition_table.new_search()
+    best_move, best_score, _ = search.iterative_deepening(board, depth, time_limit, root_search=split_root,
+                                                          soft_limit=soft_limit)
+    search.print_search_result(best_score)
+    return best_move
+
+
+def lazy_smp_search(board, depth, time_limit, workers=None, soft_limit=None):
+    """
+    Find the best move with Lazy SMP: the main process and workers - 1 helpers
+    search the same position, and the deepest completed result is returned.
+    With a single worker this is the normal find_best_move.
+    """
+    workers = workers or SMP_WORKERS
+    if workers <= 1:
+        return search.find_best_move(board, depth, time_limit, soft_limit)
+
+    pool, table, _ = start_smp(workers)
+    table.new_search()
+    fen = board.to_fen()
+    futures = [pool.submit(_smp_worker, fen, depth, time_limit, worker_id, table.generation, soft_limit)
+               for worker_id in range(1, workers)]
+
+    search.search_stats['nodes_searched'] = 0
+    move, score, completed = search.iterative_deepening(board, depth, time_limit, soft_limit=soft_limit)
+    results = [(completed, score, move, search.search_stats['nodes_searched'])]
+    results += [future.result() for future in futures]
+
+    # Deepest completed search wins; on ties the main process result comes first
+    best_depth, best_score, best_move, _ = max(results, key=lambda r: r[0] if r[2] is not None else -1)
+    search.search_stats['reached_depth'] = best_depth
+    if not search.principal_variation or search.principal_variation[0] != best_move:
+        # A helper's result was chosen: rebuild its line from the shared TT
+        search.principal_variation = search.collect_pv(board, best_move)
+    search.search_stats['smp_nodes'] = sum(r[3] for r in results)
+    search.print_search_result(best_score)
+    return best_move
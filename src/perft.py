@@ -0,0 +1,260 @@
+"""
+Perft: count leaf nodes of the legal move tree to a fixed depth.
+Used to verify move generation against known reference counts
+and to measure generate_legal_moves + make_move throughput.
+Fast mode counts the last ply without playing it and caches subtree counts.
+With --jobs, root move subtrees are counted in parallel worker processes.
+With --bitboard, positions use the bitboard backend (bitboard.BitBoard) instead of board.Board.
+
+Usage:
+    python src/perft.py                          # run the reference suite
+    python src/perft.py --fen "<fen>" --depth 4 --divide
+    python src/perft.py --depth 5 --fast --hash 64
+    python src/perft.py --depth 5 --fast --jobs 8
+    python src/perft.py --depth 4 --bitboard
+"""
+
+import argparse
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from board import Board, START_FEN, move_to_uci
+from bitboard import BitBoard, generate_legal_moves as generate_bitboard_moves
+from moves import generate_legal_moves
+
+# Board backend for the positions perft sets up: bitboard.BitBoard or the 10x12 mailbox board.Board
+ENABLE_BITBOARD = False
+
+# Reference positions with expected node counts for depth 1, 2, 3, ...
+PERFT_POSITIONS = [
+    ("startpos", START_FEN,
+     [20, 400, 8902, 197281, 4865609]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862, 4085603]),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238, 674624]),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467, 422333]),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379, 2103487]),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890, 3894594]),
+]
+
+
+def new_board(fen: str):
+    """Set up fen on the backend selected by ENABLE_BITBOARD."""
+    return BitBoard(fen) if ENABLE_BITBOARD else Board(fen)
+
+
+def legal_moves(board):
+    """Legal moves from the generator of the board's backend."""
+    if type(board) is BitBoard:
+        return generate_bitboard_moves(board)
+    return generate_legal_moves(board)
+
+
+def perft(board, depth: int) -> int:
+    """Count leaf nodes reachable in exactly depth plies."""
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in legal_moves(board):
+        undo = board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+
+class PerftCache:
+    """
+    Fixed-size cache of subtree counts keyed by zobrist hash and depth.
+    Each slot stores the full hash and (count << 8 | depth); colliding entries are overwritten.
+    """
+
+    def __init__(self, size_mb=16):
+        slots = 1
+        while slots * 2 * 16 <= size_mb * 1024 * 1024:
+            slots *= 2
+        self.mask = slots - 1
+        self.keys = array('Q', bytes(8 * slots))
+        self.data = array('Q', bytes(8 * slots))
+
+    def _index(self, key, depth):
+        return (key ^ (depth * 0x9E3779B97F4A7C15)) & self.mask
+
+    def get(self, key, depth):
+        """Return the cached count, or None."""
+        index = self._index(key, depth)
+        data = self.data[index]
+        if data and self.keys[index] == key and data & 0xFF == depth:
+            return data >> 8
+        return None
+
+    def put(self, key, depth, count):
+        index = self._index(key, depth)
+        self.keys[index] = key
+        self.data[index] = (count << 8) | depth
+
+
+def fast_perft(board, depth: int, cache=None) -> int:
+    """
+    Perft with bulk counting: at depth 1 the legal moves are counted, not played.
+    With a PerftCache, counts of transposed subtrees are reused.
+    """
+    if depth == 0:
+        return 1
+    moves = legal_moves(board)
+    if depth == 1:
+        return len(moves)
+    if depth == 2:
+        cache = None  # Cheaper to recount than to look up
+    elif cache is not None:
+        nodes = cache.get(board.hash, depth)
+        if nodes is not None:
+            return nodes
+    nodes = 0
+    for move in moves:
+        undo = board.make_move(move)
+        nodes += fast_perft(board, depth - 1, cache)
+        board.unmake_move(undo)
+    if cache is not None:
+        cache.put(board.hash, depth, nodes)
+    return nodes
+
+
+def divide(board, depth: int, cache=None, fast: bool = False) -> dict:
+    """Perft split by root move: {uci_move: leaf count}. depth must be at least 1."""
+    if depth < 1:
+        raise ValueError(f"divide needs depth >= 1, got {depth}")
+    counts = {}
+    for move in legal_moves(board):
+        undo = board.make_move(move)
+        if depth == 1:
+            counts[move_to_uci(move)] = 1
+        elif fast:
+            counts[move_to_uci(move)] = fast_perft(board, depth - 1, cache)
+        else:
+            counts[move_to_uci(move)] = perft(board, depth - 1)
+        board.unmake_move(undo)
+    return counts
+
+
+# Per-process perft cache of pool workers, created by _init_worker
+_worker_cache = None
+
+
+def _init_worker(fast: bool, hash_mb: int, bitboard: bool = False):
+    global _worker_cache, ENABLE_BITBOARD
+    _worker_cache = PerftCache(hash_mb) if fast and hash_mb else None
+    ENABLE_BITBOARD = bitboard
+
+
+def _perft_worker(fen: str, depth: int, fast: bool) -> int:
+    """Count one subtree in a worker process. The position is passed as FEN."""
+    board = new_board(fen)
+    return fast_perft(board, depth, _worker_cache) if fast else perft(board, depth)
+
+
+def parallel_divide(board, depth: int, jobs: int, fast: bool = False, hash_mb: int = 16) -> dict:
+    """
+    Divide with the root move subtrees counted in a pool of jobs processes.
+    Each worker keeps its own perft cache across the subtrees it is given.
+    depth must be at least 1; this is checked before any worker is started.
+    """
+    if depth < 1:
+        raise ValueError(f"parallel_divide needs depth >= 1, got {depth}")
+    if depth == 1:
+        return divide(board, depth)
+    root = []
+    for move in legal_moves(board):
+        undo = board.make_move(move)
+        root.append((move_to_uci(move), board.to_fen()))
+        board.unmake_move(undo)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(fast, hash_mb, type(board) is BitBoard)) as pool:
+        futures = [pool.submit(_perft_worker, fen, depth - 1, fast) for _, fen in root]
+        return {uci: future.result() for (uci, _), future in zip(root, futures)}
+
+
+def run_perft(fen: str, depth: int, show_divide: bool = False, fast: bool = False, hash_mb: int = 16,
+              jobs: int = 1):
+    """
+    Run perft on a position and print the result with nodes per second.
+    In fast mode nodes/sec counts leaves, not positions actually visited.
+
+    Returns:
+        (nodes, seconds) tuple
+    """
+    board = new_board(fen)
+    cache = PerftCache(hash_mb) if fast and hash_mb and jobs <= 1 else None
+    start = time.perf_counter()
+    if jobs > 1:
+        counts = parallel_divide(board, depth, jobs, fast, hash_mb)
+        elapsed = time.perf_counter() - start
+        if show_divide:
+            for uci in sorted(counts):
+                print(f"{uci}: {counts[uci]}")
+            print(f"\nMoves: {len(counts)}")
+        nodes = sum(counts.values())
+    elif show_divide:
+        counts = divide(board, depth, cache, fast)
+        elapsed = time.perf_counter() - start
+        for uci in sorted(counts):
+            print(f"{uci}: {counts[uci]}")
+        nodes = sum(counts.values())
+        print(f"\nMoves: {len(counts)}")
+    else:
+        nodes = fast_perft(board, depth, cache) if fast else perft(board, depth)
+        elapsed = time.perf_counter() - start
+    nps = nodes / elapsed if elapsed > 0 else 0
+    print(f"Depth {depth}: {nodes} nodes in {elapsed:.2f}s ({nps:.0f} nodes/sec)")
+    return nodes, elapsed
+
+
+def run_suite(max_depth: int = 3, fast: bool = False, hash_mb: int = 16, jobs: int = 1) -> bool:
+    """Run perft on all reference positions up to max_depth and report mismatches."""
+    all_ok = True
+    total_nodes = 0
+    total_time = 0.0
+    for name, fen, expected in PERFT_POSITIONS:
+        cache = PerftCache(hash_mb) if fast and hash_mb else None
+        for depth, expected_nodes in enumerate(expected[:max_depth], start=1):
+            board = new_board(fen)
+            start = time.perf_counter()
+            if jobs > 1:
+                nodes = sum(parallel_divide(board, depth, jobs, fast, hash_mb).values())
+            else:
+                nodes = fast_perft(board, depth, cache) if fast else perft(board, depth)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+            status = "OK" if nodes == expected_nodes else f"FAIL (expected {expected_nodes})"
+            all_ok = all_ok and nodes == expected_nodes
+            print(f"{name:10} depth {depth}: {nodes:9} {elapsed:7.2f}s  {status}")
+    nps = total_nodes / total_time if total_time > 0 else 0
+    print(f"Total: {total_nodes} nodes in {total_time:.2f}s ({nps:.0f} nodes/sec)")
+    return all_ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft move generation test and benchmark")
+    parser.add_argument("--fen", help="position to test (default: run the reference suite)")
+    parser.add_argument("--depth", type=int, default=3, help="search depth (default: 3)")
+    parser.add_argument("--divide", action="store_true", help="print node counts per root move")
+    parser.add_argument("--fast", action="store_true", help="bulk-count the last ply and cache subtree counts")
+    parser.add_argument("--hash", type=int, default=16, help="perft cache size in MB for --fast, 0 disables")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes for root move subtrees")
+    parser.add_argument("--bitboard", action="store_true", help="use the bitboard backend instead of the mailbox")
+    args = parser.parse_args(argv)
+
+    global ENABLE_BITBOARD
+    ENABLE_BITBOARD = args.bitboard
+
+    if args.fen:
+        run_perft(args.fen, args.depth, args.divide, args.fast, args.hash, args.jobs)
+        return 0
+    return 0 if run_suite(args.depth, args.fast, args.hash, args.jobs) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
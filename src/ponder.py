@@ -0,0 +1,97 @@
+"""
+Pondering: search on the opponent's time.
+After our move, the expected reply (second move of the principal variation,
+or else the transposition table move) is predicted and the position after it
+is searched in a background thread while the engine waits for the opponent.
+The search shares the transposition table, so on a ponder hit the following
+search starts with the table already filled.
+On a miss the ponder search is aborted and its entries simply age out.
+"""
+
+import threading
+import search
+from moves import generate_legal_moves, is_legal_move
+
+# Maximum depth of the ponder search; it normally runs until stopped
+PONDER_DEPTH = 64
+
+# Running ponder search: (thread, predicted_move)
+_ponder_state = None
+
+ponder_stats = {
+    'hits': 0,
+    'misses': 0
+}
+
+
+def predict_reply(board, pv_reply=None):
+    """
+    Expected opponent reply: pv_reply (the PV move after ours) if legal,
+    otherwise the best move stored for the position after our move.
+
+    Returns:
+        Packed move, or None if there is no legal prediction
+    """
+    if pv_reply is not None and is_legal_move(board, pv_reply):
+        return pv_reply
+    entry = search.transposition_table.probe(board.hash)
+    if entry is None or entry[3] is None or not is_legal_move(board, entry[3]):
+        return None
+    return entry[3]
+
+
+def _ponder(board):
+    search.iterative_deepening(board, PONDER_DEPTH, None)
+
+
+def start_pondering(board, pv_reply=None):
+    """
+    Start searching the position after the predicted reply in the background.
+    board is the position after our move, with the opponent to move.
+    pv_reply is the opponent's move in the principal variation, if known.
+
+    Returns:
+        The predicted reply, or None if nothing is pondered
+    """
+    global _ponder_state
+    stop_pondering()
+    predicted = predict_reply(board, pv_reply)
+    if predicted is None:
+        return None
+    ponder_board = board.copy()
+    ponder_board.make_move(predicted)
+    if not generate_legal_moves(ponder_board):
+        return None  # Predicted reply ends the game
+    search.stop_requested = False
+    thread = threading.Thread(target=_ponder, args=(ponder_board,), daemon=True)
+    _ponder_state = (thread, predicted)
+    thread.start()
+    return predicted
+
+
+def stop_pondering(opponent_move=None):
+    """
+    Abort the ponder search and wait for the thread to finish.
+    With the opponent's actual move, ponder hits and misses are counted.
+
+    Returns:
+        True on a ponder hit, otherwise False
+    """
+    global _ponder_state
+    if _ponder_state is None:
+        return False
+    thread, predicted = _ponder_state
+    _ponder_state = None
+    search.stop_requested = True
+    thread.join()
+    search.stop_requested = False
+    if opponent_move is None:
+        return False
+    hit = opponent_move == predicted
+    ponder_stats['hits' if hit else 'misses'] += 1
+    return hit
+
+
+def is_pondering() -> bool:
+    """Check if a ponder search is running."""
+    return _ponder_state is not None and _ponder_state[0].is_alive()
@@ -1,5 +1,5 @@
 """Profile search performance."""
-from board import Board
+from board import Board, move_to_uci
 from search import negamax, find_best_move, clear_transposition_table, print_search_stats
 import search
 import time
@@ -23,42 +23,117 @@ def profile_optimization_combinations():
             "QS": False,
             "History": False,
             "Killers": False,
-            "NWS": False,
+            "Aspiration": False,
+            "NullMove": False,
+            "PVS_LMR": False,
+            "CheckExt": False,
+            "SEE": False,
+            "Delta": False,
+            "Futility": False,
         },
         {
             "name": "Quiescence only",
             "QS": True,
             "History": False,
             "Killers": False,
-            "NWS": False,
+            "Aspiration": False,
+            "NullMove": False,
+            "PVS_LMR": False,
+            "CheckExt": False,
+            "SEE": False,
+            "Delta": False,
+            "Futility": False,
         },
         {
             "name": "Quiescence + Killer Moves",
             "QS": True,
             "History": False,
             "Killers": True,
-            "NWS": False,
+            "Aspiration": False,
+            "NullMove": False,
+            "PVS_LMR": False,
+            "CheckExt": False,
+            "SEE": False,
+            "Delta": False,
+            "Futility": False,
         },
         {
             "name": "Quiescence + History",
             "QS": True,
             "History": True,
             "Killers": False,
-            "NWS": False,
+            "Aspiration": False,
+            "NullMove": False,
+            "PVS_LMR": False,
+            "CheckExt": False,
+            "SEE": False,
+            "Delta": False,
+            "Futility": False,
         },
         {
             "name": "All Optimizations (QS + History + Killers)",
             "QS": True,
             "History": True,
             "Killers": True,
-            "NWS": False,
+            "Aspiration": False,
+            "NullMove": False,
+            "PVS_LMR": False,
+            "CheckExt": False,
+            "SEE": False,
+            "Delta": False,
+            "Futility": False,
         },
         {
-            "name": "All Optimizations + Null-Window Search",
+            "name": "All Optimizations + Aspiration Windows",
             "QS": True,
             "History": True,
             "Killers": True,
-            "NWS": True,
+            "Aspiration": True,
+            "NullMove": False,
+            "PVS_LMR": False,
+            "CheckExt": False,
+            "SEE": False,
+            "Delta": False,
+            "Futility": False,
+        },
+        {
+            "name": "All Optimizations + Null-Move Pruning",
+            "QS": True,
+            "History": True,
+            "Killers": True,
+            "Aspiration": True,
+            "NullMove": True,
+            "PVS_LMR": False,
+            "CheckExt": False,
+            "SEE": False,
+            "Delta": False,
+            "Futility": False,
+        },
+        {
+            "name": "All Optimizations + Null-Move + PVS/LMR",
+            "QS": True,
+            "History": True,
+            "Killers": True,
+            "Aspiration": True,
+            "NullMove": True,
+            "PVS_LMR": True,
+            "CheckExt": False,
+            "SEE": False,
+            "Delta": False,
+            "Futility": False,
+        },
+        {
+            "name": "All + Check Ext. + SEE/Delta + Futility",
+            "QS": True,
+            "History": True,
+            "Killers": True,
+            "Aspiration": True,
+            "NullMove": True,
+            "PVS_LMR": True,
+            "CheckExt": True,
+            "SEE": True,
+            "Delta": True,
+            "Futility": True,
         },
     ]
 
@@ -75,7 +150,13 @@ def profile_optimization_combinations():
         search.ENABLE_QUIESCENCE = scenario["QS"]
         search.ENABLE_HISTORY_HEURISTIC = scenario["History"]
         search.ENABLE_KILLER_MOVES = scenario["Killers"]
-        search.ENABLE_NULL_WINDOW = scenario["NWS"]
+        search.ENABLE_ASPIRATION_WINDOWS = scenario["Aspiration"]
+        search.ENABLE_NULL_MOVE = scenario["NullMove"]
+        search.ENABLE_PVS = search.ENABLE_LMR = scenario["PVS_LMR"]
+        search.ENABLE_CHECK_EXTENSIONS = scenario["CheckExt"]
+        search.ENABLE_SEE = scenario["SEE"]
+        search.ENABLE_DELTA_PRUNING = scenario["Delta"]
+        search.ENABLE_FUTILITY_PRUNING = search.ENABLE_REVERSE_FUTILITY = scenario["Futility"]
 
         print(f"\n{scenario['name']}:")
         print("-" * 70)
@@ -97,14 +178,20 @@ def profile_optimization_combinations():
 
         print_search_stats()
         print(f"Time: {elapsed:.3f}s")
-        print(f"Best move: {move}")
+        print(f"Best move: {move_to_uci(move)}")
         print(f"Score: {score}")
 
     # Restore defaults
     search.ENABLE_QUIESCENCE = True
     search.ENABLE_HISTORY_HEURISTIC = True
     search.ENABLE_KILLER_MOVES = True
-    search.ENABLE_NULL_WINDOW = True
+    search.ENABLE_ASPIRATION_WINDOWS = True
+    search.ENABLE_NULL_MOVE = True
+    search.ENABLE_PVS = search.ENABLE_LMR = True
+    search.ENABLE_CHECK_EXTENSIONS = True
+    search.ENABLE_SEE = True
+    search.ENABLE_DELTA_PRUNING = True
+    search.ENABLE_FUTILITY_PRUNING = search.ENABLE_REVERSE_FUTILITY = True
 
     # Print comparison table
     print("\n" + "="*70)
@@ -148,7 +235,7 @@ def profile_search():
 
         print(f"\nDepth {depth}:")
         print_search_stats()
-        print(f"Best move: {move}\n")
+        print(f"Best move: {move_to_uci(move)}\n")
         print(f"Score: {score}")
 
 def profile_iterative_deepening():
@@ -174,7 +261,7 @@ def profile_iterative_deepening():
     print(f"\nMax depth 5 (no time limit):")
     print(f"Time: {elapsed:.3f}s")
     print_search_stats()
-    print(f"Best move: {move}")
+    print(f"Best move: {move_to_uci(move)}")
 
     # Test 2: Time limit tests
     for time_limit in [0.1, 0.5, 1, 2, 5]:
@@ -194,7 +281,7 @@ def profile_iterative_deepening():
         print(f"\nTime limit: {time_limit}s")
         print(f"Actual time: {elapsed:.3f}s")
         print_search_stats()
-        print(f"Best move: {move}")
+        print(f"Best move: {move_to_uci(move)}")
 
 
 def detailed_profile():
@@ -226,7 +313,7 @@ def detailed_profile():
     ps.print_stats(20)  # Top 20 functions
 
     print(s.getvalue())
-    print(f"\nBest move: {move}")
+    print(f"\nBest move: {move_to_uci(move)}")
     print(f"Score: {score}")
     print_search_stats()
 
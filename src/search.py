@@ -2,19 +2,32 @@
 Chess AI search algorithms.
 Negamax with alpha-beta pruning and transposition table.
 Includes quiescence search to avoid horizon effect.
-Includes move ordering: history heuristic and MVV-LVA for captures.
+Includes staged move ordering: TT move, MVV-LVA captures, killers, history.
 """
 
 import time
-from evaluation import evaluate_from_perspective
-from moves import generate_legal_moves, is_stalemate, is_checkmate
-from board import coord_to_sq
+from math import log
+from evaluation import evaluate_from_perspective, PIECE_TYPES
+from evaluation import PIECE_VALUES as CENTIPAWN_VALUES
+from moves import generate_captures, generate_quiets, is_legal_move, is_in_check, square_attackers
+from board import FLAG_CAPTURE, FLAG_EN_PASSANT, PROMO_SHIFT, move_to_uci
+from board import EMPTY, PAWN, KING, WHITE, BLACK, SQ64_TO_120, PIECE_CODES
+from transposition import TranspositionTable
+from time_manager import soft_limit_scale
 
 # Feature flags for optimization testing
 ENABLE_QUIESCENCE = True
-ENABLE_NULL_WINDOW = True
+ENABLE_ASPIRATION_WINDOWS = True
 ENABLE_HISTORY_HEURISTIC = True
 ENABLE_KILLER_MOVES = True
+ENABLE_NULL_MOVE = True
+ENABLE_PVS = True
+ENABLE_LMR = True
+ENABLE_CHECK_EXTENSIONS = True
+ENABLE_SEE = True
+ENABLE_DELTA_PRUNING = True
+ENABLE_FUTILITY_PRUNING = True
+ENABLE_REVERSE_FUTILITY = True
 
 search_stats = {
     'nodes_searched': 0,
@@ -22,65 +35,296 @@ search_stats = {
     'tt_stores': 0,
     'beta_cutoffs': 0,
     'reached_depth': 0,
-    'quiescence_nodes': 0
+    'quiescence_nodes': 0,
+    'smp_nodes': 0,
+    'aspiration_fail_lows': 0,
+    'aspiration_fail_highs': 0,
+    'null_move_cutoffs': 0,
+    'lmr_reductions': 0,
+    'lmr_researches': 0,
+    'pvs_researches': 0,
+    'check_extensions': 0,
+    'see_pruned': 0,
+    'delta_pruned': 0,
+    'futility_pruned': 0,
+    'reverse_futility_pruned': 0
 }
 
 # Transposition table flags
 EXACT, LOWER, UPPER = 0, 1, 2
 
-# Transposition table: {zobrist_hash: (depth, score, flag, best_move)}
-transposition_table = {}
+# Score of being mated at the root; mate in n plies scores MATE_SCORE - n
+MATE_SCORE = 100000
+
+# Aspiration windows: each iteration starts with previous score +- ASPIRATION_WINDOW,
+# the failing side is widened by doubling and opened fully past ASPIRATION_MAX_WINDOW
+ASPIRATION_WINDOW = 25
+ASPIRATION_MAX_WINDOW = 400
+
+# Null-move pruning: depth reduction R (plus one more from NULL_MOVE_DEEP_DEPTH on), and
+# from NULL_MOVE_VERIFY_DEPTH on a fail-high is confirmed by a reduced search without null moves.
+# Zugzwang is likely in pawn endings and with at most a minor piece on the board (both sides),
+# so null moves need the side to move to have a piece and more than NULL_MOVE_MIN_MATERIAL in total
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_DEEP_DEPTH = 7
+ENABLE_NULL_MOVE_VERIFICATION = True
+NULL_MOVE_VERIFY_DEPTH = 6
+NULL_MOVE_MIN_MATERIAL = CENTIPAWN_VALUES['b']
+
+# Late move reductions: quiet moves that do not give check, from the LMR_MIN_MOVES-th move on, at depth >= LMR_MIN_DEPTH,
+# are reduced by lmr_table[depth][moves_searched] = LMR_BASE + ln(depth) * ln(moves) / LMR_DIVISOR
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 3
+LMR_BASE = 0.75
+LMR_DIVISOR = 2.25
+LMR_TABLE_SIZE = 64
+
+
+def build_lmr_table(base=LMR_BASE, divisor=LMR_DIVISOR):
+    """Rebuild lmr_table from the reduction formula, e.g. after tuning base/divisor."""
+    global lmr_table
+    lmr_table = [[0] * LMR_TABLE_SIZE] + [
+        [0] + [max(0, int(base + log(depth) * log(moves) / divisor)) for moves in range(1, LMR_TABLE_SIZE)]
+        for depth in range(1, LMR_TABLE_SIZE)]
+
+
+lmr_table = []
+build_lmr_table()
+
+# Check extensions: a node in check is searched one ply deeper, at most this many times per path
+MAX_CHECK_EXTENSIONS = 4
+
+# Delta pruning: quiescence skips captures that cannot raise the score to alpha even with
+# DELTA_MARGIN extra, unless non-pawn material (both sides) is below DELTA_MIN_MATERIAL
+DELTA_MARGIN = 200
+DELTA_MIN_MATERIAL = 1300
+
+# Reverse futility: up to this depth a node whose static eval beats beta by
+# REVERSE_FUTILITY_MARGIN per ply of depth fails high without searching
+REVERSE_FUTILITY_MAX_DEPTH = 3
+REVERSE_FUTILITY_MARGIN = 120
+
+# Futility: at depth d < len(FUTILITY_MARGINS), quiet moves are skipped once
+# static eval + FUTILITY_MARGINS[d] cannot reach alpha
+FUTILITY_MARGINS = (0, 200, 350)
+
+# Hard deadline: the clock is read every CLOCK_CHECK_INTERVAL nodes (power of two)
+# and the search aborts with SearchTimeout once search_deadline has passed.
+CLOCK_CHECK_INTERVAL = 256
+TIME_SAFETY_MARGIN = 0.02  # Seconds kept back from time_limit for returning the move
+search_deadline = None
+
+# Set from another thread to abort the running search at the next clock check (e.g. pondering)
+stop_requested = False
+
+# Best (move, score) found so far at the root of the current iteration
+root_best = [None, None]
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when search_deadline has passed or a stop was requested."""
+
+# Transposition table size in megabytes
+TT_SIZE_MB = 16
+
+# Transposition table: fixed-size buckets keyed by zobrist hash
+transposition_table = TranspositionTable(TT_SIZE_MB)
 
 # Killer moves: store best refutation moves per depth
 # killer_moves[depth] = [move1, move2]
 MAX_DEPTH = 100
 killer_moves = [[None, None] for _ in range(MAX_DEPTH)]
 
-# History heuristic: tracks good moves by source-destination
+# History heuristic: tracks good moves by source-destination (move & 0xFFF)
 history_table = {}
 
+# Triangular PV table: pv_table[ply][ply:pv_length[ply]] is the best line found from ply
+pv_table = [[None] * MAX_DEPTH for _ in range(MAX_DEPTH)]
+pv_length = [0] * (MAX_DEPTH + 1)
+
+# Principal variation of the last completed iteration (packed moves, root move first)
+principal_variation = []
+
+# While follow_pv is set, negamax is on the previous iteration's PV and tries its move first
+follow_pv = False
+
 # Piece values for MVV-LVA (Most Valuable Victim - Least Valuable Attacker)
 PIECE_VALUES = {
     'p': 1, 'n': 3, 'b': 3, 'r': 5, 'q': 9, 'k': 100,
     'P': 1, 'N': 3, 'B': 3, 'R': 5, 'Q': 9, 'K': 100
 }
+# The same values by board piece code, for reading the mailbox
+MVV_LVA_VALUES = [0] * 16
+for _piece, _value in PIECE_VALUES.items():
+    MVV_LVA_VALUES[PIECE_CODES[_piece]] = _value
+
+# Centipawn piece values by board piece code, for static exchange evaluation
+SEE_VALUES = [0] * 16
+for _code in range(PAWN, KING + 1):
+    SEE_VALUES[_code] = SEE_VALUES[BLACK | _code] = CENTIPAWN_VALUES[PIECE_TYPES[_code]]
+
 
 def clear_transposition_table():
     """Clear the transposition table and history heuristic between games."""
-    global transposition_table, killer_moves, history_table
-    transposition_table = {}
+    global killer_moves, history_table
+    transposition_table.clear()
     killer_moves = [[None, None] for _ in range(MAX_DEPTH)]
     history_table = {}
 
 
-def is_capture(board, move: str) -> bool:
-    """Check if move is a capture."""
-    to_sq = move[2:4]
-    tr, tc = coord_to_sq(to_sq)
-    return board.grid[tr][tc] != '.'
+def update_pv(ply, move):
+    """Make move followed by the child's PV the PV of this ply."""
+    row = pv_table[ply]
+    row[ply] = move
+    child_length = max(pv_length[ply + 1], ply + 1)
+    row[ply + 1:child_length] = pv_table[ply + 1][ply + 1:child_length]
+    pv_length[ply] = child_length
+
+
+def is_capture(move: int) -> bool:
+    """Check if move is a capture (including en passant)."""
+    return move & FLAG_CAPTURE != 0
 
 
-def mvv_lva_score(board, move: str) -> tuple:
+def mvv_lva_score(board, move: int) -> tuple:
     """
     Most Valuable Victim - Least Valuable Attacker.
     Returns (victim_value, -attacker_value) for sorting captures.
     Higher values are better (captures valuable pieces with cheap pieces).
     """
-    from_sq = move[:2]
-    to_sq = move[2:4]
-    fr, fc = coord_to_sq(from_sq)
-    tr, tc = coord_to_sq(to_sq)
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
 
-    victim = board.grid[tr][tc]
-    attacker = board.grid[fr][fc]
-
-    victim_value = PIECE_VALUES.get(victim, 0)
-    attacker_value = PIECE_VALUES.get(attacker, 0)
+    if move & FLAG_EN_PASSANT:
+        victim_value = PIECE_VALUES['p']
+    else:
+        victim_value = MVV_LVA_VALUES[board.squares[SQ64_TO_120[to_sq]]]
+    attacker_value = MVV_LVA_VALUES[board.squares[SQ64_TO_120[from_sq]]]
 
     # Return tuple: higher victim value first, then lower attacker value
     return (victim_value, -attacker_value)
 
 
+def see(board, move: int) -> int:
+    """
+    Static exchange evaluation: material (centipawns) won by a capture when both
+    sides keep recapturing on the target square with their least valuable attacker
+    and may stop whenever continuing would lose. Pins are ignored.
+    Capturers are lifted off the mailbox in turn, uncovering x-ray attackers behind them.
+    """
+    squares = board.squares
+    from_120 = SQ64_TO_120[move & 63]
+    to_120 = SQ64_TO_120[(move >> 6) & 63]
+    piece = squares[from_120]
+    side = piece & BLACK
+    removed = [(from_120, piece)]
+    if move & FLAG_EN_PASSANT:
+        captured_120 = to_120 + (10 if side == WHITE else -10)
+        removed.append((captured_120, squares[captured_120]))
+        gain = [SEE_VALUES[PAWN]]
+    else:
+        gain = [SEE_VALUES[squares[to_120]]]
+    on_square = SEE_VALUES[piece]
+    promo = (move >> PROMO_SHIFT) & 7
+    if promo:
+        on_square = SEE_VALUES[promo + 1]  # Promotion index n, b, r, q -> piece code
+        gain[0] += on_square - SEE_VALUES[PAWN]
+    for sq, _ in removed:
+        squares[sq] = EMPTY
+
+    # gain[i]: material of the side making capture i, if the exchange stops after it
+    side ^= BLACK
+    while True:
+        attackers = square_attackers(squares, to_120, side)
+        if not attackers:
+            break
+        sq = min(attackers, key=lambda a: SEE_VALUES[squares[a]])
+        code = squares[sq]
+        if code & 7 == KING and square_attackers(squares, to_120, side ^ BLACK):
+            break  # The king may not recapture onto a defended square
+        gain.append(on_square - gain[-1])
+        on_square = SEE_VALUES[code]
+        removed.append((sq, code))
+        squares[sq] = EMPTY
+        side ^= BLACK
+
+    for sq, code in reversed(removed):
+        squares[sq] = code
+    # Each side only continues the exchange if that is better than stopping
+    for i in range(len(gain) - 1, 0, -1):
+        gain[i - 1] = -max(-gain[i - 1], gain[i])
+    return gain[0]
+
+
+def is_bad_capture(board, move: int) -> bool:
+    """Check if a capture loses material by SEE. Taking an equal or bigger piece is never bad."""
+    victim, attacker = mvv_lva_score(board, move)
+    return victim < -attacker and see(board, move) < 0
+
+
+# Move picker stages
+STAGE_TT, STAGE_CAPTURES, STAGE_KILLERS, STAGE_QUIETS, STAGE_BAD_CAPTURES = 0, 1, 2, 3, 4
+
+
+class MovePicker:
+    """
+    Staged move ordering for negamax: TT move, captures by MVV-LVA,
+    killer moves, quiet moves by history score, then captures losing
+    material by SEE (with ENABLE_SEE; otherwise they stay with the captures).
+    Each stage generates its own moves (TT move and killers are only checked
+    for legality), so a cutoff in an early stage skips the later generation.
+    The stage of the most recently yielded move is kept in self.stage.
+    """
+
+    def __init__(self, board, tt_move=None, killers=(), history=None):
+        self.board = board
+        self.tt_move = tt_move
+        self.killers = killers
+        self.history = history
+        self.stage = STAGE_TT
+
+    def __iter__(self):
+        board = self.board
+        tt_move = self.tt_move
+        if tt_move is not None:
+            if is_legal_move(board, tt_move):
+                yield tt_move
+            else:
+                tt_move = None
+
+        # Captures and promotions are generated only after the TT move failed to cut off
+        captures = [m for m in generate_captures(board) if m != tt_move]
+        captures.sort(key=lambda m: mvv_lva_score(board, m), reverse=True)
+        bad_captures = []
+        if ENABLE_SEE:
+            good_captures = []
+            for m in captures:
+                (bad_captures if is_bad_capture(board, m) else good_captures).append(m)
+            captures = good_captures
+        self.stage = STAGE_CAPTURES
+        yield from captures
+
+        # Killers are checked for legality on their own, without generating quiet moves
+        self.stage = STAGE_KILLERS
+        played = {tt_move}
+        for killer in self.killers:
+            if (killer is not None and killer not in played and not (killer >> PROMO_SHIFT) & 7
+                    and is_legal_move(board, killer)):
+                played.add(killer)
+                yield killer
+
+        quiets = [m for m in generate_quiets(board) if m not in played]
+        if self.history is not None:
+            history = self.history
+            quiets.sort(key=lambda m: history.get(m & 0xFFF, 0), reverse=True)
+        self.stage = STAGE_QUIETS
+        yield from quiets
+
+        self.stage = STAGE_BAD_CAPTURES
+        yield from bad_captures
+
+
 def quiescence(board, alpha, beta, ply=0):
     """
     Quiescence search: search only captures until position is quiet.
@@ -97,6 +341,9 @@ def quiescence(board, alpha, beta, ply=0):
     """
     global search_stats
     search_stats['quiescence_nodes'] += 1
+    if not search_stats['quiescence_nodes'] & (CLOCK_CHECK_INTERVAL - 1) and (
+            stop_requested or search_deadline is not None and time.time() > search_deadline):
+        raise SearchTimeout
 
     # Stand pat: evaluate current position
     # If position is already good enough, we don't need to search further
@@ -107,9 +354,8 @@ def quiescence(board, alpha, beta, ply=0):
 
     alpha = max(alpha, stand_pat)
 
-    # Generate all legal moves and filter to only captures
-    all_moves = generate_legal_moves(board)
-    interesting_moves = [m for m in all_moves if is_capture(board, m)]
+    # Generate only captures and promotions
+    interesting_moves = generate_captures(board)
 
     # Sort captures by MVV-LVA (Most Valuable Victim first)
     interesting_moves.sort(key=lambda m: mvv_lva_score(board, m), reverse=True)
@@ -118,12 +364,24 @@ def quiescence(board, alpha, beta, ply=0):
     if not interesting_moves:
         return stand_pat
 
+    delta_pruning = ENABLE_DELTA_PRUNING and board.non_pawn_material >= DELTA_MIN_MATERIAL
     for move in interesting_moves:
-        temp = board.copy()
-        temp.make_move(move)
+        if not (move >> PROMO_SHIFT) & 7:
+            # Delta pruning: even winning the victim for free would not reach alpha
+            if delta_pruning:
+                victim = PAWN if move & FLAG_EN_PASSANT else board.squares[SQ64_TO_120[(move >> 6) & 63]]
+                if stand_pat + SEE_VALUES[victim] + DELTA_MARGIN <= alpha:
+                    search_stats['delta_pruned'] += 1
+                    continue
+            # Captures that lose material in the exchange
+            if ENABLE_SEE and is_bad_capture(board, move):
+                search_stats['see_pruned'] += 1
+                continue
+        undo = board.make_move(move)
 
         # Recursive quiescence call
-        score = -quiescence(temp, -beta, -alpha, ply + 1)
+        score = -quiescence(board, -beta, -alpha, ply + 1)
+        board.unmake_move(undo)
 
         if score >= beta:
             return beta
@@ -133,7 +391,7 @@ def quiescence(board, alpha, beta, ply=0):
     return alpha
 
 
-def negamax(board, depth, alpha, beta, _color=1, tt_move=None, ply=0):
+def negamax(board, depth, alpha, beta, _color=1, tt_move=None, ply=0, allow_null=True, extensions=0):
     """
     Negamax search with alpha-beta pruning and transposition table.
     Uses history heuristic and killer moves for move ordering.
@@ -146,31 +404,44 @@ def negamax(board, depth, alpha, beta, _color=1, tt_move=None, ply=0):
         beta: Beta bound
         color: Not used in negamax formulation
         ply: Current ply from root (for killer moves)
+        allow_null: False right after a null move and in verification searches
+        extensions: Check extensions already made on the path from the root
     
     Returns:
         (score, best_move) tuple
     """
-    global search_stats
+    global search_stats, follow_pv
     search_stats['nodes_searched'] += 1
+    if not search_stats['nodes_searched'] & (CLOCK_CHECK_INTERVAL - 1) and (
+            stop_requested or search_deadline is not None and time.time() > search_deadline):
+        raise SearchTimeout
+    if ply < MAX_DEPTH:
+        pv_length[ply] = ply
+
+    # Check extension: searching the evasions one ply deeper finds mates and avoids horizon effects
+    in_check = is_in_check(board)
+    if in_check and ENABLE_CHECK_EXTENSIONS and extensions < MAX_CHECK_EXTENSIONS:
+        depth += 1
+        extensions += 1
+        search_stats['check_extensions'] += 1
 
     board_hash = board.hash  # Use incremental hash
     alpha_orig = alpha
 
     # Transposition table lookup
-    if board_hash in transposition_table:
-        entry = transposition_table[board_hash]
-        entry_depth, entry_score, entry_flag = entry['depth'], entry['score'], entry['flag']
-        tt_move = entry.get('move')
+    entry = transposition_table.probe(board_hash)
+    if entry is not None:
+        entry_depth, entry_score, entry_flag, tt_move = entry
         if entry_depth >= depth:
             search_stats['tt_hits'] += 1
             if entry_flag == EXACT:
-                return entry_score, entry.get('move')
+                return entry_score, tt_move
             elif entry_flag == LOWER:
                 alpha = max(alpha, entry_score)
             elif entry_flag == UPPER:
                 beta = min(beta, entry_score)
             if alpha >= beta:
-                return entry_score, entry.get('move')
+                return entry_score, tt_move
 
     # Base case: depth 0
     if depth == 0:
@@ -179,52 +450,98 @@ def negamax(board, depth, alpha, beta, _color=1, tt_move=None, ply=0):
         else:
             return evaluate_from_perspective(board), None
 
-    moves = generate_legal_moves(board)
-    if not moves:
-        # Checkmate or stalemate
-        if is_stalemate(board):
-            return 0, None
-        if is_checkmate(board):
-            return -100000 + ply, None
-        return 0, None
+    # Forward pruning below is skipped at the root, on the PV and in check.
+    # The static eval is computed once here and shared by all of it
+    static_eval = None
+    if ply and not follow_pv and not in_check:
+        static_eval = evaluate_from_perspective(board)
+
+        # Reverse futility: far enough above beta that a shallow search will not fall below it
+        if (ENABLE_REVERSE_FUTILITY and depth <= REVERSE_FUTILITY_MAX_DEPTH and abs(beta) < MATE_SCORE - MAX_DEPTH
+                and static_eval - REVERSE_FUTILITY_MARGIN * depth >= beta):
+            search_stats['reverse_futility_pruned'] += 1
+            return beta, None
+
+    # Null-move pruning: if passing still fails high, a real move will too.
+    # Skipped near mate scores, without pieces and in low-material endgames (zugzwang)
+    if (ENABLE_NULL_MOVE and allow_null and static_eval is not None and static_eval >= beta
+            and depth >= NULL_MOVE_MIN_DEPTH and abs(beta) < MATE_SCORE - MAX_DEPTH
+            and board.non_pawn_material > NULL_MOVE_MIN_MATERIAL and board.has_non_pawn_material(board.turn)):
+        reduction = NULL_MOVE_REDUCTION + (depth >= NULL_MOVE_DEEP_DEPTH)
+        null_undo = board.make_null_move()
+        null_score = -negamax(board, max(0, depth - 1 - reduction), -beta, -beta + 1,
+                              ply=ply+1, allow_null=False, extensions=extensions)[0]
+        board.unmake_null_move(null_undo)
+        if null_score >= beta and ENABLE_NULL_MOVE_VERIFICATION and depth >= NULL_MOVE_VERIFY_DEPTH:
+            null_score = negamax(board, depth - reduction, beta - 1, beta, ply=ply, allow_null=False,
+                                 extensions=extensions)[0]
+        if null_score >= beta:
+            search_stats['null_move_cutoffs'] += 1
+            return beta, None
+
+    # Previous iteration's PV move goes first while still on the PV
+    if follow_pv:
+        if ply < len(principal_variation):
+            tt_move = principal_variation[ply]
+        else:
+            follow_pv = False
 
-    # Move ordering: TT move first, then killer moves, then history heuristic
-    ordered_moves = []
-
-    # 1. TT move (best move from previous search)
-    if tt_move and tt_move in moves:
-        ordered_moves.append(tt_move)
-        moves.remove(tt_move)
-
-    # 2. Killer moves (good cutoff moves from same depth)
-    if ENABLE_KILLER_MOVES and ply < MAX_DEPTH:
-        for killer in killer_moves[ply]:
-            if killer and killer in moves:
-                ordered_moves.append(killer)
-                moves.remove(killer)
-
-    # 3. Remaining moves sorted by history heuristic
-    if ENABLE_HISTORY_HEURISTIC:
-        remaining_with_history = [(m, history_table.get(m[:4], 0)) for m in moves]
-        remaining_with_history.sort(key=lambda x: x[1], reverse=True)
-        ordered_moves.extend([m for m, _ in remaining_with_history])
-    else:
-        ordered_moves.extend(moves)
+    # Move ordering: TT move first, then captures, killer moves and history heuristic
+    killers = tuple(killer_moves[ply]) if ENABLE_KILLER_MOVES and ply < MAX_DEPTH else ()
+    history = history_table if ENABLE_HISTORY_HEURISTIC else None
+    picker = MovePicker(board, tt_move, killers, history)
 
     best_move = None
     best_score = float('-inf')
-
-    for move in ordered_moves:
-        temp = board.copy()
-        _ = temp.make_move(move)
+    moves_searched = 0
+    # Futility: quiet moves cannot lift this frontier node to alpha
+    futile = (ENABLE_FUTILITY_PRUNING and static_eval is not None and depth < len(FUTILITY_MARGINS)
+              and abs(alpha) < MATE_SCORE - MAX_DEPTH and static_eval + FUTILITY_MARGINS[depth] <= alpha)
+
+    for move in picker:
+        if follow_pv and move != tt_move:
+            follow_pv = False
+        undo = board.make_move(move)
+
+        # Skip futile quiet moves once one move has been searched; checks and promotions are kept
+        if (futile and moves_searched and (picker.stage == STAGE_QUIETS or picker.stage == STAGE_KILLERS)
+                and not (move >> PROMO_SHIFT) & 7 and not is_in_check(board)):
+            board.unmake_move(undo)
+            search_stats['futility_pruned'] += 1
+            continue
 
         # Recursive negamax call (negate score and swap alpha/beta)
-        score, _ = negamax(temp, depth - 1, -beta, -alpha, ply=ply+1)
-        score = -score
+        if not moves_searched:
+            score = -negamax(board, depth - 1, -beta, -alpha, ply=ply+1, extensions=extensions)[0]
+        else:
+            # Late quiet moves are searched to a reduced depth first, unless they give check
+            reduction = 0
+            if (ENABLE_LMR and moves_searched >= LMR_MIN_MOVES and depth >= LMR_MIN_DEPTH and not in_check
+                    and picker.stage == STAGE_QUIETS and not (move >> PROMO_SHIFT) & 7 and not is_in_check(board)):
+                reduction = min(lmr_table[min(depth, LMR_TABLE_SIZE - 1)][min(moves_searched, LMR_TABLE_SIZE - 1)],
+                                depth - 2)
+            # PVS: later moves only have to prove they cannot beat alpha
+            window_alpha = -alpha - 1 if ENABLE_PVS else -beta
+            score = -negamax(board, depth - 1 - reduction, window_alpha, -alpha, ply=ply+1, extensions=extensions)[0]
+            if reduction:
+                search_stats['lmr_reductions'] += 1
+                if score > alpha:
+                    search_stats['lmr_researches'] += 1
+                    score = -negamax(board, depth - 1, window_alpha, -alpha, ply=ply+1, extensions=extensions)[0]
+            if ENABLE_PVS and alpha < score < beta:
+                search_stats['pvs_researches'] += 1
+                score = -negamax(board, depth - 1, -beta, -alpha, ply=ply+1, extensions=extensions)[0]
+        board.unmake_move(undo)
+        follow_pv = False
+        moves_searched += 1
 
         if score > best_score:
             best_score = score
             best_move = move
+            if ply == 0:
+                root_best[0], root_best[1] = move, score
+        if score > alpha and ply < MAX_DEPTH - 1:
+            update_pv(ply, move)
 
         # Alpha-beta pruning
         alpha = max(alpha, score)
@@ -233,18 +550,24 @@ def negamax(board, depth, alpha, beta, _color=1, tt_move=None, ply=0):
             search_stats['beta_cutoffs'] += 1
 
             # Update history heuristic (quiet moves that cause cutoffs)
-            if ENABLE_HISTORY_HEURISTIC and not is_capture(board, move):
-                move_key = move[:4]
+            if ENABLE_HISTORY_HEURISTIC and not move & FLAG_CAPTURE:
+                move_key = move & 0xFFF
                 history_table[move_key] = history_table.get(move_key, 0) + depth * depth
 
-            # Update killer moves
-            if ENABLE_KILLER_MOVES and ply < MAX_DEPTH:
+            # Update killer moves (quiet moves only, captures are ordered by MVV-LVA)
+            if ENABLE_KILLER_MOVES and ply < MAX_DEPTH and not move & FLAG_CAPTURE:
                 if killer_moves[ply][0] != move:
                     killer_moves[ply][1] = killer_moves[ply][0]
                     killer_moves[ply][0] = move
 
             break
 
+    if best_move is None:
+        # No legal moves: checkmate or stalemate
+        if in_check:
+            return -MATE_SCORE + ply, None
+        return 0, None
+
     if alpha >= beta:
         flag = LOWER
     elif best_score > alpha_orig:
@@ -253,74 +576,156 @@ def negamax(board, depth, alpha, beta, _color=1, tt_move=None, ply=0):
         flag = UPPER
 
     # Store in transposition table
-    transposition_table[board_hash] = {
-        'depth': depth,
-        'score': best_score,
-        'flag': flag,
-        'move': best_move
-    }
+    transposition_table.store(board_hash, depth, best_score, flag, best_move)
     search_stats['tt_stores'] += 1
     return best_score, best_move
 
-def find_best_move(board, depth, time_limit):
+def find_best_move(board, depth, time_limit, soft_limit=None):
     """
     Find the best move using iterative deepening with negamax search and transposition table.
-    Optionally uses null-window search for faster move evaluation.
+    Each iteration uses an aspiration window around the previous score.
+    The full line is left in principal_variation.
+    time_limit is the hard limit; with soft_limit (see time_manager.allocate_time)
+    no new iteration is started once the stability-scaled soft limit has passed.
     """
-    global search_stats
-    best_move = None
-    best_score = None
-    start_time = time.time()
+    transposition_table.new_search()
+    best_move, best_score, _ = iterative_deepening(board, depth, time_limit, soft_limit=soft_limit)
+    print_search_result(best_score)
+    return best_move
 
-    # Iterative deepening: search depth 1, 2, 3... up to max_depth
-    for current_depth in range(1, depth + 1):
-        search_stats['reached_depth'] = current_depth  # Track current depth
-        elapsed = time.time() - start_time
 
-        # Smart time management: don't start new iteration if unlikely to finish
-        if time_limit:
-            if elapsed > time_limit:
-                # Soft limit: time expired, use best move from previous iteration
-                break
+def print_search_result(best_score):
+    """Print the score and principal variation of the last search."""
+    print(f"score: {best_score}") # Force printing score for profiling and playtesting purposes
+    print(f"pv: {' '.join(move_to_uci(m) for m in principal_variation)}")
 
-            # Predict if we have enough time for next iteration
-            # Next depth typically takes ~3-5x longer than previous
-            # Don't start if we've used more than 40% of time budget
-            if current_depth > 1 and elapsed > 0.4 * time_limit: # pragma: no cover
-                break
 
-        # Try null-window search first if enabled
-        if ENABLE_NULL_WINDOW and best_score is not None:
-            # Null-window search: search with narrow window to quickly verify if move is good
-            null_score, move = negamax(board, current_depth, best_score, best_score + 1, ply=0)
-
-            if null_score >= best_score + 1:
-                # Re-search with full window
-                score, move = negamax(board, current_depth, float('-inf'), float('inf'), ply=0)
-                if move:
-                    best_move = move
-                    best_score = score
+def collect_pv(board, best_move):
+    """
+    Principal variation from the root of board starting with best_move.
+    Takes the triangular PV collected at the root (just best_move if it starts elsewhere).
+    A line cut short by a TT cutoff is extended with the best moves stored in the TT,
+    stopping at an illegal or missing move, a repetition or MAX_DEPTH.
+    """
+    line = pv_table[0][:pv_length[0]]
+    if not line or line[0] != best_move:
+        line = [best_move]
+    board = board.copy()
+    seen = {board.hash}
+    for move in line:
+        board.make_move(move)
+        seen.add(board.hash)
+    while len(line) < MAX_DEPTH:
+        entry = transposition_table.probe(board.hash)
+        move = entry[3] if entry is not None else None
+        if move is None or not is_legal_move(board, move):
+            break
+        board.make_move(move)
+        line.append(move)
+        if board.hash in seen:
+            break
+        seen.add(board.hash)
+    return line
+
+
+def iterative_deepening(board, depth, time_limit, start_depth=1, root_search=None, soft_limit=None):
+    """
+    Search depths start_depth..depth until the time limit, keeping the result of the last completed depth.
+    The time limit is a hard deadline: an iteration still running when it passes is aborted.
+    Each depth is searched with an aspiration window around the previous score, widened on a fail-low/high.
+    The aborted iteration's best move is used if a root move scored inside the current window.
+    root_search replaces negamax for the root node (same signature), e.g. a parallel root split.
+    soft_limit stops starting new iterations; it is stretched when the best move changes or the
+    score drops and shortened when the best move has been stable.
+
+    Returns:
+        (best_move, best_score, completed_depth) tuple
+    """
+    global search_stats, search_deadline, principal_variation, follow_pv
+    principal_variation = []
+    best_move = None
+    best_score = None
+    completed_depth = 0
+    start_time = time.time()
+    search_root = root_search or negamax
+    # An aborted search leaves moves on the board, so search a copy
+    root = board.copy()
+    deadline = start_time + max(0.0, time_limit - TIME_SAFETY_MARGIN) if time_limit is not None else None
+    soft_scale = 1.0
+    stable_iterations = 0
+    window_alpha = float('-inf')
+
+    try:
+        # Iterative deepening: search depth 1, 2, 3... up to max_depth
+        for current_depth in range(start_depth, depth + 1):
+            # The first iteration always completes so there is a move to return
+            if deadline is not None and best_move is not None:
+                if time.time() > deadline:
+                    break
+                search_deadline = deadline
+            if soft_limit is not None and best_move is not None and time.time() - start_time > soft_limit * soft_scale:
+                break
+            previous_move, previous_score = best_move, best_score
+            search_stats['reached_depth'] = current_depth  # Track current depth
+            # Aspiration window around the previous score; mate scores get the full window
+            if ENABLE_ASPIRATION_WINDOWS and best_score is not None and abs(best_score) < MATE_SCORE - MAX_DEPTH:
+                delta = ASPIRATION_WINDOW
+                alpha, beta = best_score - delta, best_score + delta
             else:
-                # Fail-low: keep previous best from earlier completed depth.
-                # Do not trust null-window move/score as exact.
-                # In KRK cituation, null-window always lead to stalemate.
-                pass
-        else:
-            # No best_score yet or null-window disabled, do full search
-            score, move = negamax(board, current_depth, float('-inf'), float('inf'), ply=0)
+                delta = ASPIRATION_MAX_WINDOW
+                alpha, beta = float('-inf'), float('inf')
+            while True:
+                root_best[0] = root_best[1] = None
+                window_alpha = alpha
+                follow_pv = True
+                score, move = search_root(root, current_depth, alpha, beta, ply=0)
+                if score <= alpha:
+                    search_stats['aspiration_fail_lows'] += 1
+                elif score >= beta:
+                    search_stats['aspiration_fail_highs'] += 1
+                else:
+                    break
+                # Widen the failing side; the other side keeps its bound
+                delta *= 2
+                if score <= alpha:
+                    alpha = score - delta if delta <= ASPIRATION_MAX_WINDOW else float('-inf')
+                else:
+                    beta = score + delta if delta <= ASPIRATION_MAX_WINDOW else float('inf')
 
             if move:
                 best_move = move
                 best_score = score
-    print(f"score: {best_score}") # Force printing score for profiling and playtesting purposes
-    return best_move
+                principal_variation = collect_pv(board, move)
+            completed_depth = current_depth
+
+            # Time allocation feedback for the next iteration
+            if previous_move is not None:
+                stable_iterations = stable_iterations + 1 if best_move == previous_move else 0
+                soft_scale = soft_limit_scale(stable_iterations, previous_score - best_score)
+    except SearchTimeout:
+        # Partial iteration: its best root move has been searched to the new depth inside the window
+        if root_best[0] is not None and root_best[1] > window_alpha:
+            best_move, best_score = root_best[0], root_best[1]
+            principal_variation = collect_pv(board, best_move)
+    finally:
+        search_deadline = None
+    return best_move, best_score, completed_depth
 
 def print_search_stats(): # pragma: no cover
     print(f"Nodes searched: {search_stats['nodes_searched']}")
     print(f"Quiescence nodes: {search_stats['quiescence_nodes']}")
     print(f"TT hits: {search_stats['tt_hits']} ({100*search_stats['tt_hits']/search_stats['nodes_searched']:.1f}%)")
     print(f"TT stores: {search_stats['tt_stores']}")
+    print(f"TT usage: {transposition_table.hashfull() / 10:.1f}%")
     print(f"Beta cutoffs: {search_stats['beta_cutoffs']}")
+    print(f"Null-move cutoffs: {search_stats['null_move_cutoffs']}")
+    print(f"LMR: {search_stats['lmr_reductions']} reductions, {search_stats['lmr_researches']} re-searches")
+    print(f"PVS re-searches: {search_stats['pvs_researches']}")
+    print(f"Futility pruning: {search_stats['futility_pruned']} moves, "
+          f"{search_stats['reverse_futility_pruned']} nodes by reverse futility")
+    print(f"Quiescence pruning: {search_stats['see_pruned']} by SEE, {search_stats['delta_pruned']} by delta")
+    print(f"Aspiration re-searches: {search_stats['aspiration_fail_lows']} fail-low, "
+          f"{search_stats['aspiration_fail_highs']} fail-high")
     print(f"History entries: {len(history_table)}")
     if search_stats.get('reached_depth', 0) > 0:
         print(f"Reached depth: {search_stats['reached_depth']}")
@@ -1,6 +1,14 @@
-from board import Board
+import time
+from board import Board, move_to_uci, uci_to_move
 from moves import generate_legal_moves, is_checkmate, is_stalemate, is_draw_by_fifty_moves
-from search import find_best_move, clear_transposition_table
+import search
+from search import clear_transposition_table
+import parallel_search
+from time_manager import allocate_time
+from ponder import start_pondering, stop_pondering
+
+# Search on the opponent's time while waiting for their move
+ENABLE_PONDER = False
 
 
 def set_board(board: Board, board_position: str):
@@ -9,13 +17,30 @@ def set_board(board: Board, board_position: str):
     board.set_fen(board_position)
 
 
-def make_move(board: Board, search_depth, time_limit):
+def set_clock(clock_message: str):
+    """
+    Parse a clock message "<remaining> <increment> [moves_to_go]" (seconds).
+
+    Returns:
+        [remaining, increment, moves_to_go] list, moves_to_go is None for sudden death
+    """
+    parts = clock_message.split()
+    remaining = float(parts[0])
+    increment = float(parts[1]) if len(parts) > 1 else 0.0
+    moves_to_go = int(parts[2]) if len(parts) > 2 else None
+    print(f"Clock set to {remaining}s + {increment}s" + (f" for {moves_to_go} moves" if moves_to_go else ""))
+    return [remaining, increment, moves_to_go]
+
+
+def make_move(board: Board, search_depth, time_limit, soft_limit=None):
     """
     Select and play the best move using negamax search.
     
     Args:
         board: Current board state
         search_depth: Search depth (default 4)
+        time_limit: Hard time limit in seconds
+        soft_limit: Optional target time in seconds (see time_manager)
     
     Returns:
         Chosen move in UCI format
@@ -33,38 +58,61 @@ def make_move(board: Board, search_depth, time_limit):
         print("Draw by fifty-move rule!")
 
     print(f"Searching with depth {search_depth} and time limit {time_limit}s...")
-    choice = find_best_move(board, depth=search_depth, time_limit=time_limit)
+    choice = parallel_search.find_best_move(board, depth=search_depth, time_limit=time_limit, soft_limit=soft_limit)
 
     board.make_move(choice)
-    return choice
+    return move_to_uci(choice)
 
 
 def main():
     """Main loop: receive commands and play moves."""
     board = Board()
     search_depth = 100
-    time_limit = 10
+    time_limit = 10  # Flat time per move when no clock has been set
+    clock = None  # [remaining, increment, moves_to_go] from CLOCK:
 
     while True:
         opponent_move = input()
 
+        if not opponent_move.startswith(("MOVE:", "CLOCK:")):
+            stop_pondering()
+
         if opponent_move.startswith("BOARD:"):
             set_board(board, opponent_move.removeprefix("BOARD:"))
         elif opponent_move.startswith("RESET:"):
             board = Board()
             clear_transposition_table()
             print("Board reset!")
+        elif opponent_move.startswith("CLOCK:"):
+            clock = set_clock(opponent_move.removeprefix("CLOCK:"))
         elif opponent_move.startswith("PLAY:"):
             try:
-                choice = make_move(board, search_depth=search_depth, time_limit=time_limit)
+                if clock:
+                    soft_limit, hard_limit = allocate_time(*clock)
+                    start = time.time()
+                    choice = make_move(board, search_depth=search_depth, time_limit=hard_limit,
+                                       soft_limit=soft_limit)
+                    # Keep the clock running until the next CLOCK: update
+                    clock[0] += clock[1] - (time.time() - start)
+                    if clock[2]:
+                        clock[2] = clock[2] - 1 or None
+                else:
+                    choice = make_move(board, search_depth=search_depth, time_limit=time_limit)
                 print(f"I chose {choice}!")
                 print(f"MOVE:{choice}")
+                if ENABLE_PONDER:
+                    pv = search.principal_variation
+                    pv_reply = pv[1] if len(pv) > 1 and move_to_uci(pv[0]) == choice else None
+                    start_pondering(board, pv_reply)
             except RuntimeError as e:
                 print(f"Game over: {e}")
                 break
         elif opponent_move.startswith("MOVE:"):
             move = opponent_move.removeprefix("MOVE:")
-            board.make_move(move)
+            opponent_choice = uci_to_move(board, move)
+            if stop_pondering(opponent_choice):
+                print("Ponder hit!")
+            board.make_move(opponent_choice)
             print(f"Received move: {move}")
         else:
             print(f"Unknown tag: {opponent_move}")
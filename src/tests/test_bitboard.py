@@ -0,0 +1,79 @@
+"""
+Test suite for the bitboard backend.
+"""
+
+from board import Board, coord_to_sq
+from bitboard import BitBoard, generate_legal_moves, is_attacked, rook_attacks, bishop_attacks
+import moves
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+]
+
+
+def test_fen_and_hash_match_board():
+    """Test that BitBoard round-trips FEN and hashes like Board."""
+    for fen in FENS:
+        bb = BitBoard(fen)
+        assert bb.to_fen() == fen, f"FEN roundtrip failed for {fen}"
+        assert bb.hash == Board(fen).hash, f"Hash differs from Board for {fen}"
+
+
+def test_legal_moves_match_mailbox_generator():
+    """Test that bitboard movegen produces the same moves as moves.py."""
+    for fen in FENS:
+        expected = sorted(moves.generate_legal_moves(Board(fen)))
+        assert sorted(generate_legal_moves(BitBoard(fen))) == expected, f"Moves differ in {fen}"
+
+
+def test_make_unmake_restores_position():
+    """Test that every legal move can be made and taken back exactly."""
+    bb = BitBoard(FENS[1])
+    for move in generate_legal_moves(bb):
+        undo = bb.make_move(move)
+        assert bb.hash == bb._compute_hash(), "Incremental hash should match full hash"
+        bb.unmake_move(undo)
+        assert bb.to_fen() == FENS[1], "Position should be restored"
+
+
+def test_perft_depth_two():
+    """Test node counts two plies deep in Kiwipete."""
+    bb = BitBoard(FENS[1])
+    nodes = 0
+    for move in generate_legal_moves(bb):
+        undo = bb.make_move(move)
+        nodes += len(generate_legal_moves(bb))
+        bb.unmake_move(undo)
+    assert nodes == 2039, f"Expected 2039 nodes, got {nodes}"
+
+
+def test_slider_attacks():
+    """Test hyperbola quintessence and rank lookups against known squares."""
+    # Rook on d4 (square 35) with blockers on d6 (19) and f4 (37)
+    occ = (1 << 35) | (1 << 19) | (1 << 37)
+    attacks = rook_attacks(35, occ)
+    assert attacks & (1 << 19) and not attacks & (1 << 11), "File ray should stop at the blocker"
+    assert attacks & (1 << 37) and not attacks & (1 << 38), "Rank ray should stop at the blocker"
+    assert attacks & (1 << 32) and attacks & (1 << 59), "Open rays should reach the edge"
+    # Bishop on a8 (square 0) sees the whole long diagonal on an empty board
+    assert bishop_attacks(0, 1) == sum(1 << (9 * i) for i in range(1, 8))
+
+
+def test_is_attacked_by_pawn():
+    """Test that pawn attacks are detected in both directions."""
+    bb = BitBoard("8/8/8/4p3/4P3/8/8/K6k w - - 0 1")
+    d5 = coord_to_sq("d5")[0] * 8 + coord_to_sq("d5")[1]
+    d4 = coord_to_sq("d4")[0] * 8 + coord_to_sq("d4")[1]
+    assert is_attacked(bb, d5, 0), "d5 should be attacked by the white pawn on e4"
+    assert is_attacked(bb, d4, 1), "d4 should be attacked by the black pawn on e5"
+
+
+def test_generate_legal_moves_without_king_matches_mailbox():
+    """Test that a side without a king has no moves, as with moves.generate_legal_moves."""
+    fen = "4k3/8/8/8/8/8/4P3/8 w - - 0 1"
+    assert generate_legal_moves(BitBoard(fen)) == moves.generate_legal_moves(Board(fen)) == [], \
+        "A side without a king should have no legal moves"
@@ -2,7 +2,7 @@
 Test suite for chess board representation and FEN conversion.
 """
 
-from board import Board
+from board import Board, move_to_uci, uci_to_move
 
 
 def test_to_fen_start_position():
@@ -24,7 +24,7 @@ def test_fen_roundtrip():
 def test_to_fen_after_move():
     """Test that FEN updates correctly after making a move."""
     b = Board()
-    b.make_move("e2e4")
+    b.make_move(uci_to_move(b, "e2e4"))
     fen = b.to_fen()
     # After e2e4, should have pawn on e4
     assert "P" in fen.split()[0], "Pawn should be in position string"
@@ -34,8 +34,8 @@ def test_to_fen_after_move():
 def test_to_fen_after_capture():
     """Test that FEN updates correctly after capture."""
     b = Board("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1")
-    b.make_move("d7d5")
-    b.make_move("e4d5")  # White captures
+    b.make_move(uci_to_move(b, "d7d5"))
+    b.make_move(uci_to_move(b, "e4d5"))  # White captures
     fen = b.to_fen()
     # d5 should have white pawn, d7 should be empty
     assert "P" in fen.split()[0], "Captured pawn should exist"
@@ -44,9 +44,9 @@ def test_to_fen_after_capture():
 def test_to_fen_castling_rights():
     """Test that FEN reflects correct castling rights."""
     b = Board()
-    b.make_move("e2e4")
-    b.make_move("e7e5")
-    b.make_move("g1f3")
+    b.make_move(uci_to_move(b, "e2e4"))
+    b.make_move(uci_to_move(b, "e7e5"))
+    b.make_move(uci_to_move(b, "g1f3"))
     fen = b.to_fen()
     # Both sides should still have castling rights
     assert "KQkq" in fen, "Castling rights should be preserved"
@@ -55,7 +55,7 @@ def test_to_fen_castling_rights():
 def test_to_fen_promotion():
     """Test that FEN handles pawn promotion."""
     b = Board("8/P7/8/8/8/8/8/K6k w - - 0 1")
-    b.make_move("a7a8q")
+    b.make_move(uci_to_move(b, "a7a8q"))
     fen = b.to_fen()
     # Should have queen instead of pawn
     assert "Q" in fen.split()[0], "Promoted pawn should be queen"
@@ -71,6 +71,99 @@ def test_attempt_to_move_non_existent_piece():
     """Test that moving a piece from an empty square raises an error."""
     b = Board()
     try:
-        b.make_move("e3e4")  # No piece on e3
+        b.make_move(uci_to_move(b, "e3e4"))  # No piece on e3
     except ValueError:
-        pass  # Expected
\ No newline at end of file
+        pass  # Expected
+
+def test_unmake_move_restores_position():
+    """Test that unmake_move restores FEN and hash after a quiet move."""
+    b = Board()
+    fen_before = b.to_fen()
+    hash_before = b.hash
+    undo = b.make_move(uci_to_move(b, "g1f3"))
+    b.unmake_move(undo)
+    assert b.to_fen() == fen_before, "FEN should be restored"
+    assert b.hash == hash_before, "Hash should be restored"
+
+
+def test_unmake_move_special_moves():
+    """Test that unmake_move restores castling, en passant and promotion moves."""
+    cases = [
+        ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "e1g1"),
+        ("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1", "e8c8"),
+        ("rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 1", "e5d6"),
+        ("1n6/P7/8/8/8/8/8/K6k w - - 3 40", "a7b8q"),
+    ]
+    for fen, move in cases:
+        b = Board(fen)
+        hash_before = b.hash
+        undo = b.make_move(uci_to_move(b, move))
+        assert b.hash == b._compute_hash(), f"Incremental hash wrong after {move}"
+        b.unmake_move(undo)
+        assert b.to_fen() == fen, f"FEN not restored after {move}"
+        assert b.hash == hash_before, f"Hash not restored after {move}"
+
+
+def test_uci_move_roundtrip():
+    """Test that packed moves convert back to the same UCI string."""
+    b = Board("r3k2r/P7/8/3pP3/8/8/8/R3K2R w KQkq d6 0 1")
+    for uci in ["e1g1", "e1c1", "e5d6", "a7a8q", "a7b8n", "a1a8"]:
+        assert move_to_uci(uci_to_move(b, uci)) == uci, f"Roundtrip failed for {uci}"
+
+
+def test_mailbox_follows_make_and_unmake():
+    """Test that the mailbox and piece lists stay in sync with the grid."""
+    b = Board("r3k2r/P5P1/8/3pP3/8/8/8/R3K2R w KQkq d6 0 1")
+    for uci in ["e5d6", "e8c8", "a7a8q", "g7h8n", "e1g1"]:
+        squares_before = b.squares[:]
+        lists_before = [sorted(plist) for plist in b.piece_lists]
+        undo = b.make_move(uci_to_move(b, uci))
+
+        fresh = Board(b.to_fen())
+        assert b.squares == fresh.squares, f"Mailbox out of sync after {uci}"
+        assert [sorted(plist) for plist in b.piece_lists] == [sorted(plist) for plist in fresh.piece_lists], \
+            f"Piece lists out of sync after {uci}"
+
+        b.unmake_move(undo)
+        assert b.squares == squares_before, f"Mailbox not restored after {uci}"
+        assert [sorted(plist) for plist in b.piece_lists] == lists_before, f"Piece lists not restored after {uci}"
+
+
+def test_king_squares_tracked():
+    """Test that cached king squares follow king moves, castling and unmake."""
+    b = Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    assert b.king_squares == {'w': 60, 'b': 4}, "King squares should be read from FEN"
+    undo = b.make_move(uci_to_move(b, "e1g1"))
+    assert b.king_squares['w'] == 62, "White king should be on g1 after castling"
+    assert b.copy().king_squares == b.king_squares, "Copy should keep king squares"
+    b.unmake_move(undo)
+    assert b.king_squares['w'] == 60, "White king should be back on e1"
+
+
+def test_null_move_flips_side_and_restores():
+    """Test that a null move passes the turn, clears en passant and updates the hash."""
+    fen = "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3"
+    b = Board(fen)
+    undo = b.make_null_move()
+    assert b.turn == 'b' and b.en_passant is None, "Null move should pass the turn and clear en passant"
+    assert b.hash == Board(b.to_fen()).hash, "Hash should match the position after passing"
+    b.unmake_null_move(undo)
+    assert b.to_fen() == fen and b.hash == Board(fen).hash, "Unmake should restore the position and hash"
+
+
+def test_has_non_pawn_material():
+    """Test the per-side piece check used as a zugzwang guard."""
+    b = Board("4k3/pp6/8/8/8/8/6PP/3NK3 w - - 0 1")
+    assert b.has_non_pawn_material('w'), "White has a knight"
+    assert not b.has_non_pawn_material('b'), "Black has only pawns"
+
+
+def test_grid_view_follows_mailbox():
+    """Test that the grid view is rebuilt from the mailbox after make and unmake."""
+    b = Board()
+    start_grid = [row[:] for row in b.grid]
+    undo = b.make_move(uci_to_move(b, "e2e4"))
+    assert b.grid[6][4] == '.' and b.grid[4][4] == 'P', "Grid should show the pawn on e4"
+    assert b.grid == Board(b.to_fen()).grid, "Grid should match a board set up from the FEN"
+    b.unmake_move(undo)
+    assert b.grid == start_grid, "Grid should be restored after unmake"
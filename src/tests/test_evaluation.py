@@ -3,7 +3,7 @@ Tests for evaluation helpers and endgame bonuses.
 """
 
 from board import Board
-from evaluation import _game_phase, _mop_up_bonus, evaluate
+from evaluation import _game_phase, _phase_material, _mop_up_bonus, evaluate, MAX_NON_PAWN_MATERIAL
 
 
 def test_game_phase_start_position_is_middlegame_weight_one():
@@ -16,6 +16,26 @@ def test_game_phase_kings_only_is_zero():
     assert _game_phase(b) == 0.0
 
 
+def test_phase_material_matches_game_phase_scale():
+    """Test that the integer phase used by evaluate() is _game_phase scaled to MAX_NON_PAWN_MATERIAL."""
+    for fen in ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+                "r3k3/pppp4/8/8/8/8/PPP5/4K2R w - - 0 1",
+                "8/8/8/8/8/8/8/K6k w - - 0 1"):
+        b = Board(fen)
+        assert _phase_material(b) == _game_phase(b) * MAX_NON_PAWN_MATERIAL, f"Phase scales differ in {fen}"
+
+
+def test_evaluate_blends_by_game_phase():
+    """Test that evaluate() gives the middlegame score with all pieces and the endgame score with none."""
+    # The black kings stand where the middlegame and endgame tables disagree
+    full = Board("rnbq1bnr/ppppkppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQ - 2 3")
+    assert full.mg_score != full.eg_score and evaluate(full) == full.mg_score, \
+        "Full material should give the middlegame score"
+    pawns = Board("8/pppp4/8/3k4/8/8/PPP5/K7 w - - 0 1")
+    assert pawns.mg_score != pawns.eg_score and evaluate(pawns) == pawns.eg_score, \
+        "Kings and pawns should give the endgame score"
+
+
 def test_mop_up_bonus_applies_with_lone_king_defender():
     # White has mating material (rook), black has lone king.
     b = Board("8/8/8/8/8/8/8/K5Rk w - - 0 1")
@@ -32,3 +52,26 @@ def test_evaluate_is_numeric_in_simple_endgame():
     b = Board("8/8/8/8/8/8/8/K5Rk w - - 0 1")
     score = evaluate(b)
     assert isinstance(score, int)
+
+
+def test_evaluate_symmetric_start_position_is_zero():
+    assert evaluate(Board()) == 0
+
+
+def test_evaluate_black_piece_square_bonus_favors_black():
+    # Same material; black's knight is centralized, white's is on the rim.
+    b = Board("4k3/8/8/3n4/8/8/8/N3K3 w - - 0 1")
+    assert evaluate(b) < 0
+
+
+def test_incremental_scores_follow_make_and_unmake():
+    from moves import generate_legal_moves
+    b = Board("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1")
+    before = (b.mg_score, b.eg_score, b.non_pawn_material)
+    for move in generate_legal_moves(b):
+        undo = b.make_move(move)
+        fresh = Board(b.to_fen())
+        assert (b.mg_score, b.eg_score, b.non_pawn_material) == \
+            (fresh.mg_score, fresh.eg_score, fresh.non_pawn_material)
+        b.unmake_move(undo)
+    assert (b.mg_score, b.eg_score, b.non_pawn_material) == before
@@ -2,10 +2,15 @@
 Test suite for chess engine core functionality.
 """
 
-from board import Board
+from board import Board, move_to_uci
 from moves import generate_legal_moves, is_checkmate, is_stalemate, is_draw_by_fifty_moves
 
 
+def legal_uci(b):
+    """Legal moves of the position as UCI strings."""
+    return [move_to_uci(m) for m in generate_legal_moves(b)]
+
+
 def test_start_position():
     """Test that start position has exactly 20 legal moves."""
     b = Board()
@@ -16,7 +21,7 @@ def test_start_position():
 def test_promotion():
     """Test pawn promotion generation."""
     b = Board("8/P7/8/8/8/8/8/K6k w - - 0 1")
-    moves = generate_legal_moves(b)
+    moves = legal_uci(b)
     assert 'a7a8q' in moves, "Missing queen promotion"
     assert 'a7a8r' in moves, "Missing rook promotion"
     assert 'a7a8b' in moves, "Missing bishop promotion"
@@ -26,7 +31,7 @@ def test_promotion():
 def test_castling():
     """Test castling move generation."""
     b = Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
-    moves = generate_legal_moves(b)
+    moves = legal_uci(b)
     assert 'e1g1' in moves, "Missing kingside castling"
     assert 'e1c1' in moves, "Missing queenside castling"
 
@@ -34,7 +39,7 @@ def test_castling():
 def test_en_passant():
     """Test en passant capture generation."""
     b = Board("rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 1")
-    moves = generate_legal_moves(b)
+    moves = legal_uci(b)
     assert 'e5d6' in moves, "Missing en passant capture"
 
 def test_checkmate():
@@ -76,14 +81,14 @@ def test_50_move_rule_is_draw_over_100():
 def test_castling_black():
     """Test castling for black pieces."""
     b = Board("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1")
-    moves = generate_legal_moves(b)
+    moves = legal_uci(b)
     assert 'e8g8' in moves, "Missing black kingside castling"
     assert 'e8c8' in moves, "Missing black queenside castling"
 
 def test_black_pawn_moves():
     """Test black pawn move generation."""
     b = Board("8/pp6/8/8/8/8/8/K6k b - - 0 1")
-    moves = generate_legal_moves(b)
+    moves = legal_uci(b)
     assert 'a7a6' in moves or 'a7a5' in moves, "Missing black pawn moves"
     assert 'b7b6' in moves or 'b7b5' in moves, "Missing black pawn moves"
 
@@ -118,4 +123,131 @@ def test_black_king_attacks():
 
     grid = b.grid
     assert is_attacked(3, 3, 'b', grid), "d5 should be attacked by black king"
-    assert is_attacked(5, 5, 'b', grid), "f3 should be attacked by black king"
\ No newline at end of file
+    assert is_attacked(5, 5, 'b', grid), "f3 should be attacked by black king"
+def test_mailbox_and_grid_generators_agree():
+    """Test that the mailbox and grid move generators produce the same moves."""
+    import moves
+    fens = [
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 1",
+    ]
+    for fen in fens:
+        b = Board(fen)
+        moves.ENABLE_MAILBOX_MOVEGEN = True
+        mailbox_moves = sorted(generate_legal_moves(b))
+        moves.ENABLE_MAILBOX_MOVEGEN = False
+        grid_moves = sorted(generate_legal_moves(b))
+        moves.ENABLE_MAILBOX_MOVEGEN = True
+        assert mailbox_moves == grid_moves, f"Generators disagree in {fen}"
+
+def test_pinned_piece_moves_only_along_pin():
+    """Test that a pinned rook may only move along the pin ray."""
+    b = Board("4r2k/8/8/8/8/8/4R3/4K3 w - - 0 1")
+    rook_moves = [m for m in legal_uci(b) if m.startswith('e2')]
+    assert sorted(rook_moves) == ['e2e3', 'e2e4', 'e2e5', 'e2e6', 'e2e7', 'e2e8'], \
+        f"Pinned rook should stay on the e-file, got {rook_moves}"
+
+def test_double_check_allows_only_king_moves():
+    """Test that only the king may move in double check."""
+    b = Board("4k3/8/8/8/7b/8/4r3/R3K3 w - - 0 1")
+    moves = legal_uci(b)
+    assert moves and all(m.startswith('e1') for m in moves), f"Only king moves expected, got {moves}"
+
+def test_en_passant_discovered_rank_check():
+    """Test that en passant is illegal when it exposes the king along the rank."""
+    b = Board("8/8/8/K2pP2r/8/8/8/7k w - d6 0 1")
+    assert 'e5d6' not in legal_uci(b), "En passant would expose the king to the rook"
+
+def test_is_in_check():
+    """Test check detection using the cached king square."""
+    from moves import is_in_check
+    assert is_in_check(Board("rk6/8/8/8/8/8/8/Kqr5 w - - 0 1")), "White king should be in check"
+    assert not is_in_check(Board()), "No check in start position"
+
+def test_is_legal_move_matches_generator():
+    """Test that is_legal_move accepts exactly the generated legal moves."""
+    from moves import is_legal_move
+    from board import uci_to_move
+    b = Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    for m in generate_legal_moves(b):
+        assert is_legal_move(b, m), f"{move_to_uci(m)} should be legal"
+    assert not is_legal_move(b, uci_to_move(b, 'e1e2')), "King cannot move onto own piece"
+    assert not is_legal_move(b, uci_to_move(b, 'a7a6')), "Cannot move opponent's pawn"
+
+def test_generate_captures():
+    """Test that generate_captures returns exactly the legal captures and promotions."""
+    from moves import generate_captures
+    from board import FLAG_CAPTURE, PROMO_SHIFT
+    fens = [
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 1",
+    ]
+    for fen in fens:
+        b = Board(fen)
+        expected = sorted(m for m in generate_legal_moves(b) if m & FLAG_CAPTURE or (m >> PROMO_SHIFT) & 7)
+        assert sorted(generate_captures(b)) == expected, f"Wrong tactical moves in {fen}"
+    b = Board("rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 1")
+    assert [move_to_uci(m) for m in generate_captures(b)] == ['e5d6'], "En passant should be generated"
+
+
+def test_evasions_match_full_generator():
+    """Test that legal moves in check (from the evasion generator) match the grid generator."""
+    from board import FLAG_CAPTURE, PROMO_SHIFT
+    from moves import _generate_grid_moves, generate_captures, is_in_check
+    fens = [
+        "4k3/8/8/8/1b6/8/8/RN2K2R w KQ - 0 1",  # Bishop check: knight blocks, king moves, no castling
+        "4k3/8/8/8/1b6/8/3R4/r3K3 w - - 0 1",  # Rook pinned on the first rank cannot block
+        "8/8/8/3pP3/4K3/8/8/7k w - d6 0 1",  # En passant captures the checking pawn
+        "4k3/3P4/8/8/8/8/8/4K2Q b - - 0 1",  # Pawn check answered by a king capture
+        "4k3/r7/8/8/8/8/8/4RK2 b - - 0 1",  # Rook check blocked on the file
+        "4K3/8/8/8/8/8/6p1/k6R b - - 0 1",  # Interposition by promotion or capture of the checker
+        "4k3/8/8/8/8/5n2/8/4K3 w - - 0 1",  # Knight check: king moves only
+    ]
+    for fen in fens:
+        b = Board(fen)
+        assert is_in_check(b), f"Test position should be in check: {fen}"
+        expected = sorted(_generate_grid_moves(b))
+        assert sorted(generate_legal_moves(b)) == expected, f"Legal moves differ in {fen}"
+        tactical = sorted(m for m in expected if m & FLAG_CAPTURE or (m >> PROMO_SHIFT) & 7)
+        assert sorted(generate_captures(b)) == tactical, f"Captures differ in {fen}"
+    assert "e5d6" in legal_uci(Board(fens[2])), "En passant should evade"
+
+
+def test_square_attackers_lists_every_attacker():
+    """Test that square_attackers returns all attacking pieces, but not x-rays behind them."""
+    from board import SQ64_TO_120, SQ120_TO_64, WHITE, BLACK, sq_to_coord
+    from moves import square_attackers
+    b = Board("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1")
+    e5 = SQ64_TO_120[3 * 8 + 4]
+    coords = lambda side: sorted(sq_to_coord(SQ120_TO_64[sq] >> 3, SQ120_TO_64[sq] & 7)
+                                 for sq in square_attackers(b.squares, e5, side))
+    white, black = coords(WHITE), coords(BLACK)
+    assert white == ["d3", "e2"], f"White attackers of e5: {white}"
+    assert black == ["d7", "f6"], f"Black attackers of e5: {black}"
+
+
+def test_generate_quiets_complements_captures():
+    """Test that quiet moves and captures/promotions split the legal moves without overlap."""
+    from moves import generate_captures, generate_quiets
+    for fen in ["r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+                "8/8/8/3pP3/4K3/8/8/7k w - d6 0 1"]:
+        b = Board(fen)
+        captures, quiets = generate_captures(b), generate_quiets(b)
+        assert not set(captures) & set(quiets), f"Stages should not overlap in {fen}"
+        assert sorted(captures + quiets) == sorted(generate_legal_moves(b)), f"Stages should cover all moves in {fen}"
+
+
+def test_kingless_position_has_no_moves_in_both_generators(monkeypatch):
+    """Test that both generators return no moves when the side to move has no king."""
+    import moves
+    b = Board("4k3/8/8/8/8/8/4P3/8 w - - 0 1")
+    for mailbox in (True, False):
+        monkeypatch.setattr(moves, 'ENABLE_MAILBOX_MOVEGEN', mailbox)
+        assert generate_legal_moves(b) == [], f"No king, no moves (mailbox={mailbox})"
+        assert moves.generate_captures(b) == [], f"No king, no captures (mailbox={mailbox})"
+        assert moves.generate_quiets(b) == [], f"No king, no quiets (mailbox={mailbox})"
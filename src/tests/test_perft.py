@@ -0,0 +1,100 @@
+"""
+Perft tests: move generation must match known node counts.
+"""
+
+import pytest
+from board import Board
+from perft import PERFT_POSITIONS, PerftCache, perft, fast_perft, divide, parallel_divide, main
+
+
+@pytest.mark.parametrize("name,fen,expected", PERFT_POSITIONS, ids=[p[0] for p in PERFT_POSITIONS])
+def test_perft_reference_positions(name, fen, expected):
+    """Test perft counts of the reference positions up to depth 2."""
+    b = Board(fen)
+    for depth, expected_nodes in enumerate(expected[:2], start=1):
+        assert perft(b, depth) == expected_nodes, f"{name} perft({depth}) mismatch"
+
+
+def test_perft_depth_3_tricky_positions():
+    """Test deeper counts on positions with castling, en passant and promotions."""
+    for name, fen, expected in PERFT_POSITIONS[2:5]:
+        assert perft(Board(fen), 3) == expected[2], f"{name} perft(3) mismatch"
+
+
+def test_perft_restores_board():
+    """Test that perft leaves the position unchanged."""
+    b = Board(PERFT_POSITIONS[1][1])
+    fen, board_hash = b.to_fen(), b.hash
+    perft(b, 2)
+    assert b.to_fen() == fen and b.hash == board_hash, "Perft should restore the board"
+
+
+def test_divide_sums_to_perft():
+    """Test that divide splits the perft count by root move."""
+    b = Board()
+    counts = divide(b, 2)
+    assert len(counts) == 20, "Start position has 20 root moves"
+    assert counts['e2e4'] == 20, "Each root move has 20 replies"
+    assert sum(counts.values()) == perft(b, 2), "Divide should sum to perft"
+
+
+def test_perft_cli(capsys):
+    """Test the command line interface with divide output."""
+    assert main(["--fen", PERFT_POSITIONS[0][1], "--depth", "1", "--divide"]) == 0
+    out = capsys.readouterr().out
+    assert "e2e4: 1" in out and "Depth 1: 20 nodes" in out, "CLI should print divide and totals"
+
+
+@pytest.mark.parametrize("name,fen,expected", PERFT_POSITIONS, ids=[p[0] for p in PERFT_POSITIONS])
+def test_fast_perft_reference_positions(name, fen, expected):
+    """Test bulk-counting perft with a cache against the reference counts."""
+    b = Board(fen)
+    cache = PerftCache(1)
+    for depth, expected_nodes in enumerate(expected[:3], start=1):
+        assert fast_perft(b, depth, cache) == expected_nodes, f"{name} fast perft({depth}) mismatch"
+    assert fast_perft(b, 3, cache) == expected[2], f"{name} cached perft(3) mismatch"
+
+
+def test_bitboard_backend_perft(capsys, monkeypatch):
+    """Test that perft on the bitboard backend matches the reference counts, also in worker processes."""
+    import perft as perft_module
+    from bitboard import BitBoard
+    monkeypatch.setattr(perft_module, 'ENABLE_BITBOARD', False)  # Restored after main() sets it
+    name, fen, expected = PERFT_POSITIONS[1]
+    assert perft(BitBoard(fen), 2) == expected[1], f"{name} bitboard perft(2) mismatch"
+    assert parallel_divide(BitBoard(fen), 2, jobs=2) == divide(Board(fen), 2), "Bitboard workers should match"
+    assert main(["--fen", fen, "--depth", "2", "--bitboard"]) == 0
+    assert f"Depth 2: {expected[1]} nodes" in capsys.readouterr().out, "CLI should count on the bitboard backend"
+
+
+def test_perft_cache_separates_depths():
+    """Test that cached counts are only returned for the same hash and depth."""
+    cache = PerftCache(1)
+    cache.put(12345, 3, 999)
+    assert cache.get(12345, 3) == 999, "Stored count should be returned"
+    assert cache.get(12345, 4) is None, "Different depth must miss"
+    assert cache.get(12346, 3) is None, "Different hash must miss"
+
+
+def test_parallel_divide_matches_divide():
+    """Test that root moves counted in worker processes give the same split."""
+    b = Board(PERFT_POSITIONS[1][1])
+    expected = divide(b, 2)
+    assert parallel_divide(b, 2, jobs=2) == expected, "Parallel divide should match divide"
+    assert parallel_divide(b, 2, jobs=2, fast=True, hash_mb=1) == expected, "Fast parallel divide should match"
+
+
+def test_divide_rejects_depth_below_one():
+    """Test that divide raises instead of recursing without end for depth < 1."""
+    for depth in (0, -1):
+        with pytest.raises(ValueError):
+            divide(Board(), depth)
+
+
+def test_parallel_divide_rejects_depth_below_one(monkeypatch):
+    """Test that parallel_divide raises for depth < 1 without creating a worker pool."""
+    import perft as perft_module
+    monkeypatch.setattr(perft_module, 'ProcessPoolExecutor', None)  # Any pool creation would fail differently
+    for depth in (0, -1):
+        with pytest.raises(ValueError):
+            parallel_divide(Board(), depth, jobs=2)
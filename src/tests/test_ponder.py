@@ -0,0 +1,64 @@
+"""
+Tests for pondering on the opponent's time.
+"""
+
+import time
+import search
+import ponder
+from board import Board
+from moves import generate_legal_moves
+
+
+def _position_after_our_move():
+    """Search the start position, play the best move and return the board (opponent to move)."""
+    search.clear_transposition_table()
+    b = Board()
+    move = search.find_best_move(b, depth=3, time_limit=None)
+    b.make_move(move)
+    # Fill the TT for the opponent's position like the search of our move would
+    search.negamax(b, depth=2, alpha=float('-inf'), beta=float('inf'))
+    return b
+
+
+def test_predict_reply_is_legal_tt_move():
+    """Test that the predicted reply comes from the TT and is legal."""
+    b = _position_after_our_move()
+    predicted = ponder.predict_reply(b)
+    assert predicted in generate_legal_moves(b), "Prediction should be a legal reply"
+    assert ponder.predict_reply(Board("8/8/8/8/8/8/8/K6k w - - 0 1")) is None, "Unknown position has no prediction"
+
+
+def test_predict_reply_prefers_pv_move():
+    """Test that a legal PV reply is predicted ahead of the TT move."""
+    b = _position_after_our_move()
+    pv_reply = generate_legal_moves(b)[-1]
+    assert ponder.predict_reply(b, pv_reply) == pv_reply, "Legal PV reply should be predicted"
+    assert ponder.predict_reply(b, 0) == ponder.predict_reply(b), "Illegal PV reply should fall back to the TT"
+
+
+def test_ponder_hit_keeps_filled_table():
+    """Test that pondering searches the predicted position and stops cleanly on a hit."""
+    b = _position_after_our_move()
+    fen = b.to_fen()
+    predicted = ponder.start_pondering(b)
+    assert predicted is not None and ponder.is_pondering(), "Pondering should start"
+    time.sleep(0.3)
+    hits = ponder.ponder_stats['hits']
+    assert ponder.stop_pondering(predicted) is True, "Actual move equal to prediction is a hit"
+    assert not ponder.is_pondering() and not search.stop_requested, "Ponder thread should be stopped"
+    assert ponder.ponder_stats['hits'] == hits + 1
+    assert b.to_fen() == fen, "Pondering must not change the game board"
+    b.make_move(predicted)
+    entry = search.transposition_table.probe(b.hash)
+    assert entry is not None and entry[0] >= 2, "Ponder search should have filled the TT for the new position"
+
+
+def test_ponder_miss_cancels():
+    """Test that a different opponent move is counted as a miss."""
+    b = _position_after_our_move()
+    predicted = ponder.start_pondering(b)
+    other = next(m for m in generate_legal_moves(b) if m != predicted)
+    misses = ponder.ponder_stats['misses']
+    assert ponder.stop_pondering(other) is False, "Different move is a miss"
+    assert ponder.ponder_stats['misses'] == misses + 1
+    assert not ponder.is_pondering()
@@ -6,10 +6,19 @@ import pytest
 import os
 import search
 from search import find_best_move, negamax, is_capture, quiescence, clear_transposition_table, mvv_lva_score, history_table
-from board import Board
+from board import Board, move_to_uci, uci_to_move
 from moves import generate_legal_moves
 
 
+@pytest.fixture
+def search_flags(monkeypatch):
+    """Set search feature flags for the rest of the test, e.g. search_flags(NULL_MOVE=False)."""
+    def set_flags(**flags):
+        for name, enabled in flags.items():
+            monkeypatch.setattr(search, f'ENABLE_{name}', enabled)
+    return set_flags
+
+
 def test_negamax_finds_move():
     """Test that negamax returns a valid move in the starting position."""
     clear_transposition_table()
@@ -51,7 +60,7 @@ def test_is_capture_detects_capture():
     b = Board("rnbqkbnr/pppppppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 1")
 
     # e4xd5 is a capture
-    assert is_capture(b, "e4d5") == True, "e4d5 should be a capture"
+    assert is_capture(uci_to_move(b, "e4d5")) == True, "e4d5 should be a capture"
 
 
 def test_is_capture_detects_non_capture():
@@ -59,7 +68,7 @@ def test_is_capture_detects_non_capture():
     b = Board()  # Starting position
 
     # e2e4 is not a capture (empty square)
-    assert is_capture(b, "e2e4") == False, "e2e4 should not be a capture"
+    assert is_capture(uci_to_move(b, "e2e4")) == False, "e2e4 should not be a capture"
 
 
 def test_is_capture_en_passant():
@@ -67,7 +76,7 @@ def test_is_capture_en_passant():
     b = Board("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1")
 
     # d7d5 is not a capture
-    assert is_capture(b, "d7d5") == False, "d7d5 should not be a capture"
+    assert is_capture(uci_to_move(b, "d7d5")) == False, "d7d5 should not be a capture"
 
 
 def test_quiescence_with_no_captures():
@@ -132,8 +141,8 @@ def test_mvv_lva_queen_capture_better_than_pawn():
     queen_capture = "e4d5"
     pawn_capture = "e4e5"
 
-    score_queen = mvv_lva_score(b, "e2e4")
-    score_pawn = mvv_lva_score(b, "e2e4")
+    score_queen = mvv_lva_score(b, uci_to_move(b, "e2e4"))
+    score_pawn = mvv_lva_score(b, uci_to_move(b, "e2e4"))
 
     assert isinstance(score_queen, tuple), "MVV-LVA should return tuple"
     assert len(score_queen) == 2, "MVV-LVA tuple should have 2 elements"
@@ -325,13 +334,13 @@ def test_feature_flags_combination():
         assert result['move'] is not None, f"Should find move in scenario {result['scenario']}"
 
 
-def test_null_window_search_enabled():
-    """Test that null-window search can be disabled via feature flag."""
+def test_aspiration_windows_enabled():
+    """Test that aspiration windows can be disabled via feature flag."""
     import search
     clear_transposition_table()
 
-    # Enable null-window
-    search.ENABLE_NULL_WINDOW = True
+    # Enable aspiration windows
+    search.ENABLE_ASPIRATION_WINDOWS = True
     search.search_stats['nodes_searched'] = 0
 
     b = Board()
@@ -339,9 +348,9 @@ def test_null_window_search_enabled():
 
     nodes_with_nws = search.search_stats['nodes_searched']
 
-    # Disable null-window
+    # Disable aspiration windows
     clear_transposition_table()
-    search.ENABLE_NULL_WINDOW = False
+    search.ENABLE_ASPIRATION_WINDOWS = False
     search.search_stats['nodes_searched'] = 0
 
     b = Board()
@@ -350,19 +359,19 @@ def test_null_window_search_enabled():
     nodes_without_nws = search.search_stats['nodes_searched']
 
     # Restore default
-    search.ENABLE_NULL_WINDOW = True
+    search.ENABLE_ASPIRATION_WINDOWS = True
 
     # Both should find a move
     assert move1 is not None, "Should find move with NWS enabled"
     assert move2 is not None, "Should find move with NWS disabled"
 
 
-def test_null_window_search_narrower_window():
-    """Test that null-window search uses narrower window (beta - 1)."""
+def test_aspiration_windows_find_opening_move():
+    """Test that searching with aspiration windows finds a sensible opening move."""
     import search
     clear_transposition_table()
 
-    search.ENABLE_NULL_WINDOW = True
+    search.ENABLE_ASPIRATION_WINDOWS = True
     search.ENABLE_QUIESCENCE = True
     search.ENABLE_HISTORY_HEURISTIC = True
     search.ENABLE_KILLER_MOVES = True
@@ -373,17 +382,17 @@ def test_null_window_search_narrower_window():
     move = find_best_move(b, depth=3, time_limit=None)
 
     # Should find a move without errors
-    assert move is not None, "Null-window search should find a move"
-    assert move in ["e2e4", "d2d4", "g1f3", "c2c4", "b1c3"], "Should find a reasonable opening move"
+    assert move is not None, "Aspiration window search should find a move"
+    assert move_to_uci(move) in ["e2e4", "d2d4", "g1f3", "c2c4", "b1c3"], "Should find a reasonable opening move"
 
 
-def test_null_window_with_all_optimizations():
-    """Test null-window search combined with all other optimizations."""
+def test_aspiration_windows_with_all_optimizations():
+    """Test aspiration windows combined with all other optimizations."""
     import search
     clear_transposition_table()
 
     # Enable all optimizations
-    search.ENABLE_NULL_WINDOW = True
+    search.ENABLE_ASPIRATION_WINDOWS = True
     search.ENABLE_QUIESCENCE = True
     search.ENABLE_HISTORY_HEURISTIC = True
     search.ENABLE_KILLER_MOVES = True
@@ -397,9 +406,9 @@ def test_null_window_with_all_optimizations():
     all_opts_nodes = search.search_stats['nodes_searched']
     all_opts_qnodes = search.search_stats['quiescence_nodes']
 
-    # Disable null-window
+    # Disable aspiration windows
     clear_transposition_table()
-    search.ENABLE_NULL_WINDOW = False
+    search.ENABLE_ASPIRATION_WINDOWS = False
     search.search_stats['nodes_searched'] = 0
     search.search_stats['quiescence_nodes'] = 0
 
@@ -409,7 +418,7 @@ def test_null_window_with_all_optimizations():
     without_nws_nodes = search.search_stats['nodes_searched']
 
     # Restore
-    search.ENABLE_NULL_WINDOW = True
+    search.ENABLE_ASPIRATION_WINDOWS = True
 
     # Both should complete
     assert move is not None, "Should find move with NWS"
@@ -468,26 +477,480 @@ def test_negamax_checkmate_returns_large_negative_score():
     assert score <= -99990
 
 
-def test_null_window_fail_low_keeps_previous_best_move(monkeypatch):
-    """Fail-low null-window result should not overwrite previous best move."""
+def test_aspiration_fail_low_widens_window(monkeypatch):
+    """A fail-low must be re-searched with a lower alpha instead of returning the failed move."""
     clear_transposition_table()
+    first_move = uci_to_move(Board(), "a2a3")
+    other_move = uci_to_move(Board(), "h2h3")
+    windows = []
 
-    original_negamax = search.negamax
+    def fake_negamax(board, depth, alpha, beta, ply=0):
+        windows.append((depth, alpha, beta))
+        if depth == 1:
+            return 10, first_move
+        # Depth 2 scores -100: fails low until the window reaches it
+        return (alpha if alpha >= -100 else -100), other_move
+
+    monkeypatch.setattr(search, "negamax", fake_negamax)
+    search.search_stats['aspiration_fail_lows'] = 0
+    move, score, completed = search.iterative_deepening(Board(), 2, None)
 
-    def fake_negamax(board, depth, alpha, beta, _color=1, tt_move=None, ply=0):
-        # Depth 1 full-search returns an initial best move and score.
-        if depth == 1 and alpha == float('-inf') and beta == float('inf'):
-            return 10, "a2a3"
-        # Depth >=2 null-window call always fail-low with an unrelated move.
-        if depth >= 2 and beta == alpha + 1:
-            return alpha, "h2h3"
-        # Should not be reached in this test path, but keep safe fallback.
-        return original_negamax(board, depth, alpha, beta, _color=_color, tt_move=tt_move, ply=ply)
+    assert (move, score, completed) == (other_move, -100, 2), "Widened search should give the real depth 2 result"
+    assert windows[1] == (2, 10 - search.ASPIRATION_WINDOW, 10 + search.ASPIRATION_WINDOW), \
+        "Depth 2 should start with a window around the depth 1 score"
+    assert windows[-1][1] < -100 < windows[-1][2], "Last window should contain the score"
+    assert windows[-1][2] == windows[1][2], "Fail-low should keep beta"
+    assert search.search_stats['aspiration_fail_lows'] == len(windows) - 2, "Each fail-low should be counted"
+
+
+def test_aspiration_fail_high_opens_to_infinity(monkeypatch):
+    """Repeated fail-highs should end with a full upper window."""
+    clear_transposition_table()
+    move = uci_to_move(Board(), "e2e4")
+    windows = []
+
+    def fake_negamax(board, depth, alpha, beta, ply=0):
+        windows.append((alpha, beta))
+        return (0 if depth == 1 else max(beta, 5000) if beta != float('inf') else 5000), move
 
     monkeypatch.setattr(search, "negamax", fake_negamax)
+    search.search_stats['aspiration_fail_highs'] = 0
+    _, score, _ = search.iterative_deepening(Board(), 2, None)
+
+    assert score == 5000, "Score should come from the open window search"
+    assert windows[-1][1] == float('inf'), "Window should be opened fully past ASPIRATION_MAX_WINDOW"
+    assert search.search_stats['aspiration_fail_highs'] == len(windows) - 2, "Each fail-high should be counted"
+
+def test_move_picker_stages():
+    """Test that MovePicker yields the TT move first, then winning captures, quiet moves and losing captures."""
+    from search import MovePicker, is_bad_capture
+    b = Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    tt_move = uci_to_move(b, 'e1g1')
+    picked = list(MovePicker(b, tt_move))
+    assert picked[0] == tt_move, "TT move should be tried first"
+    assert sorted(picked) == sorted(generate_legal_moves(b)), "Picker should yield every legal move once"
+    bad = [m for m in picked if is_capture(m) and is_bad_capture(b, m)]
+    assert bad and picked[-len(bad):] == bad, "Captures losing material by SEE should come last"
+    flags = [is_capture(m) for m in picked[1:-len(bad)]]
+    assert flags == sorted(flags, reverse=True), "Other captures should come before quiet moves"
+
+
+def test_move_picker_generates_stages_lazily(monkeypatch):
+    """Test that captures and quiet moves are only generated when their stage is reached."""
+    from search import MovePicker
+    calls = []
+    for name in ('generate_captures', 'generate_quiets'):
+        original = getattr(search, name)
+        monkeypatch.setattr(search, name, lambda b, name=name, original=original: calls.append(name) or original(b))
+    b = Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    picker = iter(MovePicker(b, uci_to_move(b, 'e1g1')))
+    next(picker)
+    assert calls == [], "A TT move cutoff should not generate any moves"
+    next(picker)
+    assert calls == ['generate_captures'], "Captures should be generated without quiet moves"
+    list(picker)
+    assert calls == ['generate_captures', 'generate_quiets'], "Quiet moves are generated once, last"
+
+
+def test_move_picker_killers_checked_for_legality():
+    """Test that killers are yielded only when legal here and never twice."""
+    from search import MovePicker, STAGE_KILLERS
+    b = Board()
+    killer, illegal = uci_to_move(b, 'g1f3'), uci_to_move(Board("4k3/8/8/8/8/8/8/R3K3 w - - 0 1"), 'a1a8')
+    picker = MovePicker(b, killer, (killer, illegal))
+    picked = []
+    for move in picker:
+        picked.append((move, picker.stage))
+    moves = [m for m, _ in picked]
+    assert sorted(moves) == sorted(generate_legal_moves(b)), "Every legal move once, TT move/killer not repeated"
+    assert (illegal, STAGE_KILLERS) not in picked, "Illegal killer must be skipped"
+
+    picker = MovePicker(b, None, (killer,))
+    stages = {m: picker.stage for m in picker}
+    assert stages[killer] == STAGE_KILLERS, "Legal killer should come from the killer stage"
+
+
+def test_move_picker_skips_illegal_tt_move():
+    """Test that a stale TT move from another position is not played."""
+    from search import MovePicker
+    b = Board()
+    stale = uci_to_move(Board("4k3/8/8/8/8/8/8/R3K3 w - - 0 1"), 'a1a8')
+    assert stale not in list(MovePicker(b, stale)), "Illegal TT move must be rejected"
+
+
+def _printed_pv(capsys):
+    """The moves of the last 'pv:' line printed by a search."""
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith('pv:')]
+    assert lines, "Search should print a pv line"
+    return lines[-1].split()[1:]
+
+
+def test_lazy_smp_search_returns_legal_move(capsys):
+    """Test that Lazy SMP with helper processes returns a legal move and restores the private TT."""
+    import parallel_search
+    clear_transposition_table()
+    b = Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    try:
+        move = parallel_search.lazy_smp_search(b, 2, None, workers=2)
+        assert move in generate_legal_moves(b), "Lazy SMP should return a legal move"
+        assert _printed_pv(capsys)[0] == move_to_uci(move), "Printed PV should start with the returned move"
+        assert search.transposition_table.shm is not None, "Search should use the shared table"
+        assert search.transposition_table.probe(b.hash) is not None, "Root should be stored in the shared table"
+    finally:
+        parallel_search.shutdown_smp()
+    assert search.transposition_table.shm is None, "Shutdown should restore a private table"
+
+
+def test_root_split_search_matches_serial_score():
+    """Test that root-split search finds the serial best score and reports worker nodes."""
+    import parallel_search
+    fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    clear_transposition_table()
+    serial_score, _ = negamax(Board(fen), depth=3, alpha=float('-inf'), beta=float('inf'))
+    clear_transposition_table()
+    b = Board(fen)
+    try:
+        parallel_search.start_root_split(2)
+        score, move = parallel_search.split_root(b, 3, float('-inf'), float('inf'))
+        assert score == serial_score, "Root split should give the serial minimax score"
+        assert move in generate_legal_moves(b), "Root split should return a legal move"
+        assert sum(search.search_stats['worker_nodes'].values()) > 0, "Worker nodes should be reported"
+        assert b.to_fen() == fen, "Board should be restored"
+    finally:
+        parallel_search.shutdown_root_split()
+
+
+def test_split_root_cutoff_cancels_remaining_jobs(monkeypatch):
+    """Test that a root cutoff stops waiting for jobs and counts nodes only from finished ones."""
+    import parallel_search
+    from concurrent.futures import Future
+
+    class PendingJob(Future):
+        def result(self, timeout=None):
+            raise AssertionError("split_root should not wait for jobs after a cutoff")
+
+    class FakePool:
+        def __init__(self):
+            self.futures = []
+
+        def submit(self, fn, *args):
+            future = Future() if len(self.futures) < 2 else PendingJob()
+            if len(self.futures) == 0:
+                future.set_result((search.MATE_SCORE, 10, 1))  # Fails high: re-searched in the main process
+            elif len(self.futures) == 1:
+                future.set_result((-search.MATE_SCORE, 5, 2))  # Finished, but never needed
+            self.futures.append(future)
+            return future
+
+    fen = "rnb1kbnr/pppp1ppp/8/4p3/4P2q/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+    b = Board(fen)
+    pool = FakePool()
+    monkeypatch.setattr(parallel_search, '_split_state', (pool, 2))
+    # a2a3 first leaves the queen on h4; Nxh4, the first parallel job, then cuts off
+    monkeypatch.setattr(search, 'principal_variation', [uci_to_move(b, 'a2a3')])
+    monkeypatch.setattr(search, 'follow_pv', True)
+    search.search_stats['worker_nodes'] = {}
+    clear_transposition_table()
+    score, move = parallel_search.split_root(b, 3, 0, 300)
+    assert move_to_uci(move) == "f3h4" and score >= 300, "Winning the queen should cut off"
+    assert all(future.cancelled() for future in pool.futures[2:]), "Queued jobs should be cancelled"
+    assert search.search_stats['worker_nodes'] == {1: 10, 2: 5}, "Only finished jobs should count nodes"
+
+
+def test_root_split_search_prints_pv(capsys):
+    """Test that root-split search prints the PV like find_best_move."""
+    import parallel_search
+    clear_transposition_table()
+    b = Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    try:
+        move = parallel_search.root_split_search(b, 2, None, workers=2)
+    finally:
+        parallel_search.shutdown_root_split()
+    pv = _printed_pv(capsys)
+    assert pv[0] == move_to_uci(move), "Printed PV should start with the returned move"
+    assert pv == [move_to_uci(m) for m in search.principal_variation], "Printed PV should match principal_variation"
+
+
+def test_hard_deadline_stops_search_in_time():
+    """Test that an iteration running past the time limit is aborted and the board is left intact."""
+    import time
+    clear_transposition_table()
+    fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    b = Board(fen)
+    limit = 0.3
+    start = time.time()
+    move = find_best_move(b, depth=50, time_limit=limit)
+    elapsed = time.time() - start
+    assert move in generate_legal_moves(b), "Aborted search should still return a legal move"
+    # Depth 50 would run for hours; the slack only absorbs GC pauses and a loaded CI runner
+    assert elapsed < limit + 0.5, f"Search should stop at the deadline, took {elapsed:.2f}s"
+    assert b.to_fen() == fen, "Aborted search must not change the board"
+    assert search.search_deadline is None, "Deadline should be cleared after the search"
+
+
+def test_search_timeout_raised_after_deadline():
+    """Test that negamax raises SearchTimeout on a periodic clock check past the deadline."""
+    import time
+    clear_transposition_table()
+    search.search_deadline = time.time() - 1
+    try:
+        with pytest.raises(search.SearchTimeout):
+            negamax(Board(), depth=4, alpha=float('-inf'), beta=float('inf'))
+    finally:
+        search.search_deadline = None
 
+
+def test_principal_variation_is_legal_line():
+    """Test that the PV starts with the chosen move and plays out as a legal line."""
+    clear_transposition_table()
+    fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    b = Board(fen)
+    move = find_best_move(b, depth=4, time_limit=None)
+    pv = search.principal_variation
+    assert pv and pv[0] == move, "PV should start with the returned move"
+    assert len(pv) > 1, "PV should extend past the root move at depth 4"
+    for pv_move in pv:
+        assert pv_move in generate_legal_moves(b), f"PV move {move_to_uci(pv_move)} should be legal"
+        b.make_move(pv_move)
+
+
+def test_collect_pv_extends_line_from_tt():
+    """Test that a root line cut short by a TT cutoff is extended with the TT best moves."""
+    clear_transposition_table()
     b = Board()
-    move = search.find_best_move(b, depth=3, time_limit=None)
+    e2e4 = uci_to_move(b, 'e2e4')
+    search.pv_table[0][0], search.pv_length[0] = e2e4, 1
+    undo = b.make_move(e2e4)
+    e7e5 = uci_to_move(b, 'e7e5')
+    search.transposition_table.store(b.hash, 3, 0, search.EXACT, e7e5)
+    b.unmake_move(undo)
+    assert search.collect_pv(b, e2e4) == [e2e4, e7e5], "PV should continue with the stored TT move"
+    assert b.to_fen() == Board().to_fen(), "Collecting the PV must not change the board"
+
+
+def test_update_pv_copies_child_line():
+    """Test that update_pv prepends the move to the child's line."""
+    search.pv_length[2] = 2
+    search.pv_table[1][1], search.pv_length[1] = 11, 2
+    search.update_pv(0, 7)
+    assert search.pv_table[0][:search.pv_length[0]] == [7, 11], "Root line should be move + child PV"
+
+
+def test_null_move_cuts_off_far_above_beta(search_flags):
+    """Test that a node whose static eval is far above beta fails high on the null move."""
+    search_flags(REVERSE_FUTILITY=False)
+    clear_transposition_table()
+    search.search_stats['null_move_cutoffs'] = 0
+    score, move = negamax(Board("4k3/8/8/8/8/8/8/QQ2K3 w - - 0 1"), 3, -1, 0, ply=1)
+    assert (score, move) == (0, None), "Passing should already fail high, without a move"
+    assert search.search_stats['null_move_cutoffs'] == 1, "The null-move cutoff should be counted"
+
+
+def test_null_move_verification_keeps_zugzwang_move(search_flags, monkeypatch):
+    """Test that verification rejects a null-move fail-high in zugzwang and keeps the real best move."""
+    # Mutual zugzwang: the white king must leave d4, and the bishop on h1 cannot move
+    fen = "8/8/8/2Kp4/3Pk3/6p1/6P1/7B w - - 0 1"
+    monkeypatch.setattr(search, 'follow_pv', False)
+    beta = search.evaluate_from_perspective(Board(fen))
+    depth = search.NULL_MOVE_VERIFY_DEPTH
+    clear_transposition_table()
+    search.search_stats['null_move_cutoffs'] = 0
+    default = negamax(Board(fen), depth, beta - 1, beta, ply=1)
+    assert search.search_stats['null_move_cutoffs'] == 0, "A lone bishop is below NULL_MOVE_MIN_MATERIAL"
+    # Allow null moves here to exercise the verification search
+    monkeypatch.setattr(search, 'NULL_MOVE_MIN_MATERIAL', 0)
+    results = {}
+    for null_move, verification in ((False, False), (True, False), (True, True)):
+        search_flags(NULL_MOVE=null_move, NULL_MOVE_VERIFICATION=verification)
+        clear_transposition_table()
+        results[null_move, verification] = negamax(Board(fen), depth, beta - 1, beta, ply=1)
+    score, move = results[False, False]
+    assert score < beta and move_to_uci(move) == "c5b6", "Every move loses the d4 pawn, Kb6 least"
+    assert results[True, False] == (beta, None), "Unverified, the null move wrongly fails high"
+    assert results[True, True] == (score, move), "Verification should keep the move and score of the full search"
+    assert default == (score, move), "Without null moves the default search should match too"
+
+
+def test_null_move_skipped_without_pieces():
+    """Test that pawn-only positions (zugzwang danger) never use null-move pruning."""
+    clear_transposition_table()
+    search.search_stats['null_move_cutoffs'] = 0
+    b = Board("8/8/p1p5/1p5p/1P5p/8/PPP2K1k/8 w - - 0 1")
+    find_best_move(b, depth=5, time_limit=None)
+    assert search.search_stats['null_move_cutoffs'] == 0, "No null moves without pieces"
+
+
+def test_lmr_table_values():
+    """Test lmr_table entries against the formula and its rebuild from the parameters."""
+    table = search.lmr_table
+    # int(0.75 + ln(depth) * ln(moves) / 2.25)
+    assert (table[3][3], table[6][6], table[10][10], table[20][30]) == (1, 2, 3, 5), "Reductions from the formula"
+    assert table[1][20] == table[20][1] == 0, "Depth 1 or the first move should not be reduced"
+    try:
+        search.build_lmr_table(base=0, divisor=1000)
+        assert not any(any(row) for row in search.lmr_table), "Tiny factors should give no reductions"
+    finally:
+        search.build_lmr_table()
+
+
+def test_pvs_keeps_full_window_result(search_flags, monkeypatch):
+    """Test that PVS null-window searches with re-searches return the full-window score and move."""
+    fen = "rnbqkbnr/ppp2ppp/8/3pp3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 3"
+    monkeypatch.setattr(search, 'follow_pv', False)
+    search_flags(LMR=False)
+    results = {}
+    for enabled in (False, True):
+        search_flags(PVS=enabled)
+        clear_transposition_table()
+        search.search_stats['pvs_researches'] = 0
+        results[enabled] = negamax(Board(fen), 4, float('-inf'), float('inf'))
+        assert (search.search_stats['pvs_researches'] > 0) == enabled, "Re-searches should only happen with PVS"
+    assert results[True] == results[False], "PVS should not change the search result"
+
+
+def test_lmr_skips_captures_and_checks(monkeypatch):
+    """Test that LMR reduces late quiet moves at the root but never captures or moves giving check."""
+    from moves import is_in_check
+    fen = "rnbqkbnr/ppp2ppp/8/3pp3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 3"
+    depth = 4
+    child_depths = {}
+    original = search.negamax
+
+    def recording_negamax(board, depth, alpha, beta, *args, ply=0, **kwargs):
+        if ply == 1:
+            child_depths.setdefault(board.hash, []).append(depth)
+        return original(board, depth, alpha, beta, *args, ply=ply, **kwargs)
+
+    monkeypatch.setattr(search, 'negamax', recording_negamax)
+    monkeypatch.setattr(search, 'follow_pv', False)
+    clear_transposition_table()
+    b = Board(fen)
+    original(b, depth, float('-inf'), float('inf'))
+    reduced, not_reducible = set(), set()
+    for move in generate_legal_moves(b):
+        undo = b.make_move(move)
+        if min(child_depths[b.hash]) < depth - 1:
+            reduced.add(move_to_uci(move))
+        if move & search.FLAG_CAPTURE or is_in_check(b):
+            not_reducible.add(move_to_uci(move))
+        b.unmake_move(undo)
+    assert {"e4d5", "f1b5"} <= not_reducible, "exd5 is a capture and Bb5+ a check"
+    assert reduced, "Late quiet moves should be reduced"
+    assert not reduced & not_reducible, f"Captures and checks should not be reduced: {reduced & not_reducible}"
+
+
+def test_check_extension_finds_mate_at_lower_depth(search_flags):
+    """Test that check extensions find the demo mate-in-2 with a depth 2 search."""
+    fen = "r1bq2r1/b4pk1/p1pp1p2/1p2pP2/1P2P1PB/3P4/1PPQ2P1/R3K2R w KQkq - 0 1"
+    scores = {}
+    for enabled in (False, True):
+        search_flags(CHECK_EXTENSIONS=enabled)
+        clear_transposition_table()
+        search.search_stats['check_extensions'] = 0
+        move, scores[enabled], _ = search.iterative_deepening(Board(fen), 2, None)
+        extensions = search.search_stats['check_extensions']
+        assert (extensions > 0) == enabled, "Extensions should only be counted with the flag on"
+    assert move_to_uci(move) == "d2h6", "Qxh6+ starts the mate"
+    assert scores[True] >= search.MATE_SCORE - 10 > scores[False], "Only the extended search should see the mate"
+
+
+def test_check_extensions_capped_per_path(monkeypatch):
+    """Test that no path gets more than MAX_CHECK_EXTENSIONS extensions."""
+    monkeypatch.setattr(search, 'MAX_CHECK_EXTENSIONS', 1)
+    deepest = []
+    original = search.negamax
+
+    def recording_negamax(board, depth, alpha, beta, *args, extensions=0, **kwargs):
+        deepest.append(extensions)
+        return original(board, depth, alpha, beta, *args, extensions=extensions, **kwargs)
 
-    # On fail-low, find_best_move should retain previous completed depth move.
-    assert move == "a2a3"
\ No newline at end of file
+    monkeypatch.setattr(search, 'negamax', recording_negamax)
+    clear_transposition_table()
+    search.negamax(Board("r5rk/5p1p/5R2/4B3/8/8/7P/7K w - - 0 1"), 3, float('-inf'), float('inf'))
+    assert max(deepest) <= 1, "Extensions on a path should stop at the cap"
+    assert 1 in deepest, "Checks in the line should have been extended"
+
+
+def test_see_exchanges():
+    """Test static exchange evaluation on defended, undefended and x-ray exchanges."""
+    cases = [
+        ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", 100),  # Free pawn
+        ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5", -220),  # X-rays on both sides
+        ("4k3/8/2p5/3p4/4Q3/8/8/4K3 w - - 0 1", "e4d5", -800),  # Queen takes a defended pawn
+        ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", 100),  # En passant
+    ]
+    for fen, uci, expected in cases:
+        b = Board(fen)
+        assert search.see(b, uci_to_move(b, uci)) == expected, f"SEE of {uci} in {fen}"
+        assert b.to_fen() == fen, "SEE must leave the board unchanged"
+
+
+def test_quiescence_see_pruning_keeps_score(search_flags):
+    """Test that SEE skips losing captures in quiescence without changing the result."""
+    fen = "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
+    search_flags(DELTA_PRUNING=False)
+    results = {}
+    for enabled in (False, True):
+        search_flags(SEE=enabled)
+        search.search_stats['quiescence_nodes'] = search.search_stats['see_pruned'] = 0
+        score = quiescence(Board(fen), float('-inf'), float('inf'))
+        results[enabled] = (score, dict(search.search_stats))
+    assert results[True][0] == results[False][0], "Pruned captures should not change the quiescence score"
+    assert results[True][1]['see_pruned'] > 0, "Losing captures should be pruned by SEE"
+    assert results[True][1]['quiescence_nodes'] < results[False][1]['quiescence_nodes'], "Fewer nodes with pruning"
+
+
+def test_delta_pruning_skips_only_hopeless_captures(search_flags):
+    """Test that delta pruning skips captures that cannot reach alpha and keeps the quiescence score."""
+    search_flags(SEE=False)
+    # (fen, captures pruned, capture clears alpha)
+    cases = [
+        # The only capture, exd5, falls a pawn plus DELTA_MARGIN short of alpha
+        ("rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2", 1, False),
+        # Nxe5 is pruned the same way, but Nxh4 wins the queen and clears alpha
+        ("rnb1kbnr/pppp1ppp/8/4p3/4P2q/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3", 1, True),
+    ]
+    for fen, pruned, clears_alpha in cases:
+        b = Board(fen)
+        alpha = search.evaluate_from_perspective(b) + search.SEE_VALUES[search.PAWN] + search.DELTA_MARGIN
+        scores = {}
+        for enabled in (False, True):
+            search_flags(DELTA_PRUNING=enabled)
+            search.search_stats['delta_pruned'] = 0
+            scores[enabled] = quiescence(b, alpha, alpha + 1000)
+        assert scores[True] == scores[False], f"Delta pruning should not change the score in {fen}"
+        assert search.search_stats['delta_pruned'] == pruned, f"{pruned} capture(s) should be delta pruned in {fen}"
+        assert (scores[True] > alpha) == clears_alpha, "Only winning the queen should raise the score above alpha"
+
+
+def test_futility_pruning_features_cut_nodes(search_flags):
+    """Test that futility and reverse futility pruning each cut nodes, keep the move and count prunes."""
+    fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    for flag, counter in (('FUTILITY_PRUNING', 'futility_pruned'),
+                          ('REVERSE_FUTILITY', 'reverse_futility_pruned')):
+        results = {}
+        for enabled in (False, True):
+            search_flags(**{flag: enabled})
+            clear_transposition_table()
+            search.search_stats['nodes_searched'] = search.search_stats[counter] = 0
+            move = find_best_move(Board(fen), depth=5, time_limit=None)
+            results[enabled] = (move, search.search_stats['nodes_searched'], search.search_stats[counter])
+        search_flags(**{flag: True})
+        assert results[True][0] == results[False][0], f"{flag} should keep the best move"
+        assert results[True][2] > 0 and results[False][2] == 0, f"{counter} should only count with {flag} on"
+        assert results[True][1] < results[False][1], f"{flag} should search fewer nodes"
+
+
+def test_reverse_futility_skipped_in_check():
+    """Test that a node far above beta fails high by reverse futility, but not when in check."""
+    clear_transposition_table()
+    search.search_stats['reverse_futility_pruned'] = 0
+    ahead = Board("4k3/8/8/8/8/8/8/QQ2K3 w - - 0 1")
+    score, move = negamax(ahead, 2, -1, 0, ply=1)
+    assert (score, move) == (0, None), "Static eval far above beta should fail high without a move"
+    assert search.search_stats['reverse_futility_pruned'] == 1, "Reverse futility prune should be counted"
+
+    clear_transposition_table()
+    in_check = Board("4k3/8/8/8/8/8/8/QQ2K2r w - - 0 1")
+    _, move = negamax(in_check, 2, -1, 0, ply=1)
+    assert move is not None, "A node in check should be searched, not pruned by reverse futility"
@@ -0,0 +1,66 @@
+"""
+Tests for game clock time allocation.
+"""
+
+from time_manager import allocate_time, soft_limit_scale, DEFAULT_MOVES_TO_GO, MOVE_OVERHEAD, MIN_MOVE_TIME
+
+
+def test_allocate_time_sudden_death():
+    """Test that without moves-to-go the clock is split over the default number of moves."""
+    soft, hard = allocate_time(60.0)
+    assert abs(soft - (60.0 - MOVE_OVERHEAD) / DEFAULT_MOVES_TO_GO) < 1e-9
+    assert soft < hard < 60.0 * 0.5, "Hard limit should exceed soft limit but stay well below the clock"
+
+
+def test_allocate_time_uses_increment_and_moves_to_go():
+    """Test that increment adds time and fewer moves to go give more time per move."""
+    base_soft, _ = allocate_time(60.0)
+    inc_soft, _ = allocate_time(60.0, increment=2.0)
+    mtg_soft, _ = allocate_time(60.0, moves_to_go=10)
+    assert inc_soft > base_soft, "Increment should add time"
+    assert mtg_soft > base_soft, "Fewer moves to go should give more time"
+
+
+def test_allocate_time_last_move_before_control():
+    """Test that with one move to go the hard limit may use nearly the whole clock."""
+    soft, hard = allocate_time(5.0, moves_to_go=1)
+    assert soft == hard and hard <= 5.0 - MOVE_OVERHEAD + 1e-9
+
+
+def test_allocate_time_low_clock():
+    """Test that an almost empty or overdrawn clock still gives small positive limits."""
+    for remaining in (0.01, 0.0, -1.0):
+        soft, hard = allocate_time(remaining, 2.0 if remaining < 0 else 0.0)
+        assert soft == hard == MIN_MOVE_TIME, f"Limits should be floored for remaining={remaining}"
+
+
+def test_nearly_flagged_clock_search_stops():
+    """Test that the floored limits of a nearly flagged clock stop the search after depth 1."""
+    import time
+    from board import Board
+    from search import find_best_move
+    soft, hard = allocate_time(0.04, 2.0)
+    start = time.time()
+    move = find_best_move(Board(), 100, hard, soft_limit=soft)
+    assert move is not None, "A move should still be returned"
+    assert time.time() - start < 1.0, "Search must not run without a deadline"
+
+
+def test_soft_limit_scale():
+    """Test stretching on instability and score drops, shrinking on stability."""
+    assert soft_limit_scale(0, 0) > 1.0, "Best move change should extend the search"
+    assert soft_limit_scale(5, 0) < 1.0, "Stable best move should shorten the search"
+    assert soft_limit_scale(1, 100) > soft_limit_scale(1, 0), "Score drop should extend the search"
+
+
+def test_find_best_move_stops_at_soft_limit():
+    """Test that no new iteration starts after the soft limit even with hard time left."""
+    import time
+    import search
+    from board import Board
+    search.clear_transposition_table()
+    start = time.time()
+    move = search.find_best_move(Board(), depth=50, time_limit=10.0, soft_limit=0.2)
+    elapsed = time.time() - start
+    assert move is not None
+    assert elapsed < 3.0, f"Soft limit should end the search long before the hard limit, took {elapsed:.2f}s"
@@ -4,6 +4,7 @@ Test suite for transposition table functionality.
 
 from board import Board
 import search
+from transposition import TranspositionTable
 
 
 def test_zobrist_hash_consistent():
@@ -39,7 +40,7 @@ def test_transposition_table_stores_result():
     # Check if result was stored
     board_hash = Board._compute_hash(b)
     assert board_hash in search.transposition_table, "Result should be stored in TT"
-    assert search.transposition_table[board_hash]['move'] == move1
+    assert search.transposition_table.probe(board_hash)[3] == move1
 
 
 def test_transposition_table_exact_flag():
@@ -50,10 +51,10 @@ def test_transposition_table_exact_flag():
     score, move = search.negamax(b, depth=2, alpha=float('-inf'), beta=float('inf'))
 
     board_hash = Board._compute_hash(b)
-    entry = search.transposition_table[board_hash]
+    _, _, flag, _ = search.transposition_table.probe(board_hash)
 
     # With full window (-inf, +inf), should store EXACT
-    assert entry['flag'] == search.EXACT, "Full window should result in EXACT flag"
+    assert flag == search.EXACT, "Full window should result in EXACT flag"
 
 
 def test_transposition_table_upper_bound():
@@ -65,10 +66,10 @@ def test_transposition_table_upper_bound():
     score, move = search.negamax(b, depth=2, alpha=-50, beta=50)
 
     board_hash = Board._compute_hash(b)
-    entry = search.transposition_table[board_hash]
+    _, _, flag, _ = search.transposition_table.probe(board_hash)
 
     # Result should be stored with appropriate flag
-    assert entry['flag'] in [search.EXACT, search.UPPER, search.LOWER], \
+    assert flag in [search.EXACT, search.UPPER, search.LOWER], \
         "Flag should be one of EXACT, UPPER, or LOWER"
 
 
@@ -121,12 +122,80 @@ def test_transposition_table_depth_cutoff():
     score_d2, move_d2 = search.negamax(b, depth=2, alpha=float('-inf'), beta=float('inf'))
 
     board_hash = Board._compute_hash(b)
-    entry_after_d2 = search.transposition_table[board_hash]
+    depth_after_d2 = search.transposition_table.probe(board_hash)[0]
 
-    assert entry_after_d2['depth'] == 2, "Should store depth 2 result"
+    assert depth_after_d2 == 2, "Should store depth 2 result"
 
     # Search at depth 3 (deeper)
     score_d3, move_d3 = search.negamax(b, depth=3, alpha=float('-inf'), beta=float('inf'))
-    entry_after_d3 = search.transposition_table[board_hash]
-
-    assert entry_after_d3['depth'] == 3, "Should update to depth 3 result"
+    depth_after_d3 = search.transposition_table.probe(board_hash)[0]
+
+    assert depth_after_d3 == 3, "Should update to depth 3 result"
+
+
+def test_tt_entry_roundtrip():
+    """Test that packed entries keep depth, negative scores, flag and move."""
+    tt = TranspositionTable(1)
+    key = (1 << 63) + 12345
+    tt.store(key, 7, -99990, search.LOWER, 0x2C34)
+    assert tt.probe(key) == (7, -99990, search.LOWER, 0x2C34), "Entry should round-trip"
+    tt.store(key + 1, 1, 0, search.EXACT, None)
+    assert tt.probe(key + 1)[3] is None, "Missing move should round-trip as None"
+    assert tt.probe(key + 2) is None, "Unknown key should miss"
+
+
+def test_tt_is_bounded():
+    """Test that the table never grows beyond its preallocated size."""
+    tt = TranspositionTable(1)
+    slots = len(tt.keys)
+    assert slots * 16 <= 1024 * 1024, "Table should fit in the requested size"
+    for key in range(1, 4 * slots):
+        tt.store(key * 0x9E3779B97F4A7C15 & (2**64 - 1), 1, key, search.EXACT, None)
+    assert len(tt.keys) == slots, "Table must not grow"
+
+
+def test_tt_depth_preferred_replacement():
+    """Test that a deep entry survives a shallower colliding store in the same search."""
+    tt = TranspositionTable(1)
+    deep, other, third = 5, 5 + (tt.mask + 1), 5 + 2 * (tt.mask + 1)
+    tt.store(deep, 8, 10, search.EXACT, None)
+    tt.store(other, 2, 20, search.EXACT, None)
+    assert tt.probe(deep)[0] == 8, "Deep entry should stay in the depth-preferred slot"
+    assert tt.probe(other)[1] == 20, "Shallow entry should go to the always-replace slot"
+    tt.store(third, 1, 30, search.EXACT, None)
+    assert tt.probe(other) is None, "Always-replace slot should be overwritten"
+    tt.new_search()
+    tt.store(other, 1, 40, search.EXACT, None)
+    assert tt.probe(deep) is None, "Entries from an older search should be replaced first"
+
+
+def _store_in_shared_table(name):
+    """Worker process helper: write one entry into a shared table."""
+    tt = TranspositionTable.attach(name, 1)
+    tt.store(424242, 5, -321, search.UPPER, 0x1234)
+    tt.close()
+
+
+def test_shared_table_visible_across_processes():
+    """Test that an entry stored by another process can be probed."""
+    from concurrent.futures import ProcessPoolExecutor
+    tt = TranspositionTable.create_shared(1)
+    try:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pool.submit(_store_in_shared_table, tt.shm.name).result()
+        assert tt.probe(424242) == (5, -321, search.UPPER, 0x1234), "Entry should be shared"
+        tt.clear()
+        assert tt.probe(424242) is None, "Clear should empty the shared table"
+    finally:
+        tt.close()
+        tt.unlink()
+
+
+def test_torn_entry_is_rejected():
+    """Test that a slot whose data does not match its check word is ignored."""
+    tt = TranspositionTable(1)
+    key = 987654321
+    tt.store(key, 3, 50, search.EXACT, 0x0ABC)
+    index = (key & tt.mask) << 1
+    tt.data[index] ^= 1 << 40  # Simulate a concurrent write to the data half only
+    assert tt.probe(key) is None, "Corrupted entry must fail XOR verification"
@@ -0,0 +1,69 @@
+"""
+Time allocation for timed games.
+Splits the remaining clock into a soft limit (target time for the move,
+checked between iterations) and a hard limit (search is aborted),
+and scales the soft limit by how settled the search looks.
+"""
+
+# Moves assumed to remain when the clock has no moves-to-go
+DEFAULT_MOVES_TO_GO = 30
+
+# Seconds kept back per move for communication and move output
+MOVE_OVERHEAD = 0.05
+
+# Share of the increment spent on top of the per-move share of the clock
+INCREMENT_SHARE = 0.75
+
+# Floor for both limits: even a flagged clock must produce a finite search
+MIN_MOVE_TIME = 0.01
+
+# Hard limit: multiple of the soft limit, capped to a share of the remaining time
+HARD_LIMIT_FACTOR = 4.0
+MAX_CLOCK_SHARE = 0.4
+
+# Soft limit scaling from best move stability and score drops
+BEST_MOVE_CHANGE_SCALE = 1.5
+STABLE_ITERATIONS = 3
+STABLE_SCALE = 0.7
+SCORE_DROP_THRESHOLD = 30
+SCORE_DROP_SCALE = 1.5
+
+
+def allocate_time(remaining: float, increment: float = 0.0, moves_to_go: int = None) -> tuple:
+    """
+    Compute time limits for one move from the game clock.
+
+    Args:
+        remaining: Seconds left on our clock
+        increment: Seconds added after each move
+        moves_to_go: Moves until the next time control, or None for sudden death
+
+    Returns:
+        (soft_limit, hard_limit) tuple in seconds, both at least MIN_MOVE_TIME
+    """
+    available = max(0.0, remaining - MOVE_OVERHEAD)
+    moves = moves_to_go if moves_to_go else DEFAULT_MOVES_TO_GO
+    soft = available / moves + increment * INCREMENT_SHARE
+    # With one move to go the whole clock may be used; otherwise never stake a large share on one move
+    max_share = 1.0 if moves == 1 else MAX_CLOCK_SHARE
+    hard = max(MIN_MOVE_TIME, min(soft * HARD_LIMIT_FACTOR, available * max_share))
+    soft = max(MIN_MOVE_TIME, min(soft, hard))
+    return soft, hard
+
+
+def soft_limit_scale(stable_iterations: int, score_drop: float) -> float:
+    """
+    Scale factor for the soft limit after a completed iteration.
+
+    Args:
+        stable_iterations: Consecutive iterations the best move has not changed (0 = just changed)
+        score_drop: Score of the previous iteration minus the latest one (positive = got worse)
+    """
+    scale = 1.0
+    if stable_iterations == 0:
+        scale *= BEST_MOVE_CHANGE_SCALE
+    elif stable_iterations >= STABLE_ITERATIONS:
+        scale *= STABLE_SCALE
+    if score_drop >= SCORE_DROP_THRESHOLD:
+        scale *= SCORE_DROP_SCALE
+    return scale
@@ -0,0 +1,166 @@
+"""
+Fixed-size transposition table backed by preallocated arrays.
+Each bucket holds two entries: a depth-preferred slot and an always-replace slot.
+Entries are packed into one 64-bit integer stored next to key ^ data, so a slot
+torn by a concurrent writer fails verification instead of returning bad data.
+The table can live in multiprocessing shared memory for parallel search.
+"""
+
+from array import array
+from multiprocessing import shared_memory
+
+# Default table size in megabytes
+DEFAULT_TT_SIZE_MB = 16
+
+# Bytes per entry: 64-bit check word + 64-bit packed data
+ENTRY_BYTES = 16
+
+# Packed entry layout
+#   bits 0-19   best move (packed move, 0 = none)
+#   bits 20-21  bound flag (EXACT, LOWER, UPPER)
+#   bits 22-29  depth
+#   bits 30-37  generation (age)
+#   bits 38-63  score + SCORE_OFFSET
+MOVE_MASK = (1 << 20) - 1
+FLAG_SHIFT = 20
+DEPTH_SHIFT = 22
+AGE_SHIFT = 30
+SCORE_SHIFT = 38
+SCORE_OFFSET = 1 << 25
+
+
+def _bucket_count(size_mb) -> int:
+    """Largest power-of-two bucket count that fits in size_mb."""
+    buckets = 1
+    while buckets * 4 * ENTRY_BYTES <= size_mb * 1024 * 1024:
+        buckets *= 2
+    return buckets
+
+
+class TranspositionTable:
+    """
+    Bounded transposition table indexed by hash & mask.
+    The generation is advanced once per search so entries from earlier
+    searches are replaced before deeper entries of the current one.
+    """
+
+    def __init__(self, size_mb=DEFAULT_TT_SIZE_MB, shm=None):
+        """
+        Args:
+            size_mb: Table size in megabytes
+            shm: Optional SharedMemory block to keep the table in (see create_shared / attach)
+        """
+        self.shm = None
+        self._view = None
+        self.generation = 0
+        if shm is not None:
+            self._use_shared(size_mb, shm)
+        else:
+            self.resize(size_mb)
+
+    @classmethod
+    def create_shared(cls, size_mb=DEFAULT_TT_SIZE_MB):
+        """Create a zeroed table in a new shared memory block. The creator must unlink() it."""
+        shm = shared_memory.SharedMemory(create=True, size=_bucket_count(size_mb) * 2 * ENTRY_BYTES)
+        return cls(size_mb, shm)
+
+    @classmethod
+    def attach(cls, name, size_mb=DEFAULT_TT_SIZE_MB):
+        """Open a table created by create_shared() in another process."""
+        return cls(size_mb, shared_memory.SharedMemory(name=name))
+
+    def _use_shared(self, size_mb, shm):
+        buckets = _bucket_count(size_mb)
+        self.mask = buckets - 1
+        self.shm = shm
+        self._view = shm.buf[:buckets * 2 * ENTRY_BYTES].cast('Q')
+        self.keys = self._view[:2 * buckets]
+        self.data = self._view[2 * buckets:]
+
+    def resize(self, size_mb):
+        """Allocate the largest power-of-two bucket count that fits in size_mb."""
+        if self.shm is not None:
+            raise ValueError("Cannot resize a shared transposition table")
+        buckets = _bucket_count(size_mb)
+        self.mask = buckets - 1
+        self.keys = array('Q', bytes(16 * buckets))
+        self.data = array('Q', bytes(16 * buckets))
+        self.generation = 0
+
+    def clear(self):
+        """Empty every slot."""
+        if self.shm is not None:
+            size = len(self._view) * 8
+            self.shm.buf[:size] = bytes(size)
+        else:
+            size = len(self.keys)
+            self.keys = array('Q', bytes(8 * size))
+            self.data = array('Q', bytes(8 * size))
+        self.generation = 0
+
+    def close(self):
+        """Detach from shared memory (no-op for a private table)."""
+        if self.shm is not None:
+            self.keys.release()
+            self.data.release()
+            self._view.release()
+            self.shm.close()
+
+    def unlink(self):
+        """Free the shared memory block. Call once, from the creating process, after close()."""
+        if self.shm is not None:
+            self.shm.unlink()
+
+    def new_search(self):
+        """Advance the generation so entries from previous searches age out."""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def probe(self, key):
+        """
+        Look up a position.
+
+        Returns:
+            (depth, score, flag, move) tuple, or None if the position is not stored.
+            move is None when no best move was recorded.
+        """
+        index = (key & self.mask) << 1
+        keys = self.keys
+        data = self.data
+        entry = data[index]
+        if keys[index] ^ entry != key or not entry:
+            entry = data[index + 1]
+            if keys[index + 1] ^ entry != key or not entry:
+                return None
+        move = entry & MOVE_MASK
+        return ((entry >> DEPTH_SHIFT) & 0xFF, (entry >> SCORE_SHIFT) - SCORE_OFFSET,
+                (entry >> FLAG_SHIFT) & 3, move or None)
+
+    def store(self, key, depth, score, flag, move):
+        """
+        Store a search result.
+        The first slot keeps the deepest entry of the current generation,
+        everything else goes to the always-replace slot.
+        """
+        index = (key & self.mask) << 1
+        data = self.data
+        current = data[index]
+        if (self.keys[index] ^ current == key or not current
+                or (current >> AGE_SHIFT) & 0xFF != self.generation
+                or depth >= (current >> DEPTH_SHIFT) & 0xFF):
+            slot = index
+        else:
+            slot = index + 1
+        entry = ((move or 0) | (flag << FLAG_SHIFT) | (min(depth, 0xFF) << DEPTH_SHIFT)
+                 | (self.generation << AGE_SHIFT) | ((int(score) + SCORE_OFFSET) << SCORE_SHIFT))
+        data[slot] = entry
+        self.keys[slot] = key ^ entry
+
+    def __contains__(self, key):
+        return self.probe(key) is not None
+
+    def hashfull(self):
+        """Permille of the first 1000 slots used by the current generation."""
+        sample = min(1000, len(self.data))
+        generation = self.generation
+        used = sum(1 for d in self.data[:sample] if d and (d >> AGE_SHIFT) & 0xFF == generation)
+        return used * 1000 // sample